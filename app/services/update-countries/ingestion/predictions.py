@@ -0,0 +1,92 @@
+"""
+  The columnar store of the time shift predictions. The
+  forecasts of all the fitted days are kept in one contiguous
+  :code:`(n_days, 3, horizon)` array, with the fitted days as
+  offsets of the reference date, and the long-format table,
+  with one row per fitted day and predicted date, is built
+  directly from the arrays, without per-row Python objects.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# The compartments of each forecast, in order
+COMPARTMENTS = ["S", "I", "R"]
+
+
+class PredictionStore:
+  """
+    The store of the forecasts of a country, one for each
+    fitted day, all over the same prediction horizon.
+  """
+
+  def __init__(self, country, start_date, pred_t, n_days):
+    """
+      :param string country: The country Alpha-2 ISO3166 code.
+      :param datetime start_date: The reference date of the day offsets.
+      :param array pred_t: The predicted day offsets, the forecast horizon.
+      :param int n_days: The number of fitted days to be stored.
+    """
+    self.country = country
+    self.start_date = np.datetime64(pd.Timestamp(start_date).tz_localize(None), "ns")
+    self.pred_t = np.asarray(pred_t, dtype=np.int64)
+    self.values = np.empty((n_days, len(COMPARTMENTS), len(self.pred_t)), dtype=np.float64)
+    self.days = np.empty(n_days, dtype=np.int64)
+    self.size = 0
+
+  def add(self, day, prediction):
+    """
+      The method that stores the forecast of a fitted day.
+
+      :param int day: The fitted day, as an offset of the reference date.
+      :param tuple prediction: The suceptible, infected and recovered forecasts.
+    """
+    self.values[self.size] = prediction
+    self.days[self.size] = day
+    self.size += 1
+
+  @property
+  def infected(self):
+    """
+      The infected forecasts with shape :code:`(n_days, horizon)`.
+    """
+    return self.values[:self.size, 1, :]
+
+  def dates(self, offsets):
+    """
+      The method that converts day offsets into dates.
+
+      :param array offsets: The day offsets of the reference date.
+
+      :return: The dates of the offsets.
+      :rtype: array
+    """
+    return self.start_date + np.asarray(offsets).astype("timedelta64[D]")
+
+  def frame(self):
+    """
+      The method that builds the long-format table of the
+      forecasts, with the :code:`S`, :code:`I`, :code:`R`,
+      :code:`date`, :code:`at_date` and :code:`country`
+      columns, in the order they were uploaded before.
+
+      :return: One row for each fitted day and predicted date.
+      :rtype: DataFrame
+    """
+    n, horizon = self.size, len(self.pred_t)
+    columns = {c: self.values[:n, k, :].ravel() for k, c in enumerate(COMPARTMENTS)}
+    columns["date"] = np.tile(self.dates(self.pred_t), n)
+    columns["at_date"] = np.repeat(self.dates(self.days[:n]), horizon)
+    columns["country"] = pd.Categorical.from_codes(
+      np.zeros(n * horizon, dtype=np.int8), [self.country])
+    return pd.DataFrame(columns)
+
+  def to_parquet(self, path):
+    """
+      The method that writes the long-format table of the
+      forecasts into a Parquet file.
+
+      :param string path: The Parquet file path.
+    """
+    self.frame().to_parquet(path, index=False)
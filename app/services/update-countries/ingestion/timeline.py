@@ -0,0 +1,88 @@
+"""
+  The normalization of the corona-api timelines. It turns the
+  raw timeline records into a daily dataframe, with the dates
+  parsed at once, the missing days inserted by a single
+  reindex, and the gaps of every numeric column interpolated
+  together.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# The timeline columns that are not used by the models
+DROP_COLUMNS = ["index", "updated_at", "is_in_progress"]
+
+# The days before the watermark normalized again,
+# so the gaps right after it can be interpolated
+OVERLAP_DAYS = 7
+
+
+def normalize(timeline, naive=False):
+  """
+    The function that normalizes a corona-api timeline into
+    one row per day. The days run from the first date up to,
+    but excluding, the last one, and the gaps are linearly
+    interpolated. The days that can not be interpolated, as
+    the ones before the first measure, are dropped.
+
+    :param list timeline: The timeline records, or a dataframe of them.
+    :param bool naive: If the timezone of the dates must be removed. Default is :code:`False`.
+
+    :return: The daily timeline, with the :code:`date` column first.
+    :rtype: DataFrame
+  """
+  df = pd.DataFrame(timeline)
+  dates = pd.to_datetime(df["date"])
+  if naive and dates.dt.tz is not None:
+    dates = dates.dt.tz_localize(None)
+  df = df.drop(columns=[c for c in DROP_COLUMNS if c in df.columns])
+  df["date"] = dates
+  # Keep the last record of each date
+  df = df.sort_values("date", kind="stable")
+  df = df.drop_duplicates(subset="date", keep="last").set_index("date")
+  # Insert the missing days in one shot
+  first_date, last_date = df.index[0], df.index[-1]
+  days = pd.date_range(first_date, periods=(last_date - first_date).days, freq="D")
+  df = df.reindex(days)
+  # Interpolate all the numeric columns together,
+  # only inside the measured interval
+  numeric = df.select_dtypes(include="number").columns
+  df[numeric] = df[numeric].astype(np.float64).interpolate(
+    method="linear", limit_area="inside")
+  df = df.dropna()
+  return df.rename_axis("date").reset_index()
+
+
+def normalize_since(timeline, watermark, overlap=OVERLAP_DAYS, naive=False):
+  """
+    The function that normalizes only the tail of a timeline,
+    after the last ingested date. The records from a few days
+    before the watermark are normalized with the new ones, so
+    the interpolation of the new days sees the same neighbours
+    it would see on the whole timeline.
+
+    :param list timeline: The timeline records.
+    :param Timestamp watermark: The last ingested date, or :code:`None` to normalize the whole timeline.
+    :param int overlap: The days before the watermark normalized again. Default is :code:`OVERLAP_DAYS`.
+    :param bool naive: If the timezone of the dates must be removed. Default is :code:`False`.
+
+    :return: The daily timeline after the watermark, with the :code:`date` column first.
+    :rtype: DataFrame
+  """
+  if watermark is None:
+    return normalize(timeline, naive=naive)
+  watermark = pd.Timestamp(watermark)
+  # The ISO dates compare as strings, so the old
+  # records are skipped without being parsed
+  start = (watermark - pd.Timedelta(days=overlap)).strftime("%Y-%m-%d")
+  records = [record for record in timeline if record["date"] >= start]
+  if len(records) == 0:
+    return pd.DataFrame(columns=["date"])
+  df = normalize(records, naive=naive)
+  dates = df["date"]
+  if dates.dt.tz is not None and watermark.tzinfo is None:
+    watermark = watermark.tz_localize("UTC")
+  elif dates.dt.tz is None and watermark.tzinfo is not None:
+    watermark = watermark.tz_convert("UTC").tz_localize(None)
+  return df[dates > watermark].reset_index(drop=True)
@@ -0,0 +1,106 @@
+import os
+import math
+import time as clock
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+
+# Default scheduler configurations
+MAX_WORKERS = os.cpu_count() or 1
+JOB_TIMEOUT = 20 * 60 # Seconds of fitting each job may start new days
+JOB_GRACE   = 10 * 60 # Seconds a job may take to finish its last day
+CHUNK_DAYS  = 30      # Days fitted by each job
+
+
+def split_days(days, chunk_days=CHUNK_DAYS):
+  """
+    The function that splits the days to be fitted into
+    contiguous chunks, one for each job.
+
+    :param range days: The days to be fitted.
+    :param int chunk_days: The maximum number of days of each chunk.
+
+    :return: The contiguous chunks of days, in order.
+    :rtype: list
+  """
+  return [days[k:k+chunk_days] for k in range(0, len(days), chunk_days)]
+
+
+def _run_job(function, args, timeout):
+  """
+    The function that runs a job in the worker process, with
+    the deadline counted from the moment the job starts.
+  """
+  deadline = None if timeout is None else clock.time() + timeout
+  try:
+    return function(*args, deadline=deadline)
+  except Exception:
+    traceback.print_exc()
+    return None
+
+
+def _terminate(pool):
+  """
+    The function that stops a process pool without waiting for
+    its running jobs, terminating the hung worker processes.
+  """
+  pool.shutdown(wait=False, cancel_futures=True)
+  terminate = getattr(pool, "terminate_workers", None)
+  if terminate is not None:
+    terminate()
+    return
+  for process in list((pool._processes or {}).values()):
+    process.terminate()
+
+
+def run(jobs, max_workers=MAX_WORKERS, timeout=JOB_TIMEOUT, grace=JOB_GRACE):
+  """
+    The function that runs the jobs across a process pool, with
+    at most :code:`max_workers` jobs running at the same time.
+    Each job function receives a :code:`deadline` keyword, after
+    which it must not start new work, and returns its partial
+    results. A job that raises returns :code:`None`. The deadline
+    is only checked between the units of work, so a hung job, as
+    a network stall or a search that never converges, is bounded
+    by the run deadline, of :code:`timeout + grace` seconds for
+    each round of :code:`max_workers` jobs. Once it expires the
+    unfinished jobs return :code:`None`, as failed, and the pool
+    workers are terminated.
+
+    :param list jobs: The jobs as :code:`(key, function, args)` tuples.
+    :param int max_workers: The maximum number of concurrent jobs.
+    :param float timeout: The seconds each job may start new work. Default is :code:`JOB_TIMEOUT`.
+    :param float grace: The seconds each job may take to finish its last unit of work. Default is :code:`JOB_GRACE`.
+
+    :return: The result of each job, in the same order of the jobs.
+    :rtype: list
+  """
+  if max_workers <= 1:
+    return [_run_job(function, args, timeout) for _, function, args in jobs]
+  deadline = None
+  if timeout is not None:
+    rounds = math.ceil(len(jobs) / max_workers)
+    deadline = clock.time() + rounds * (timeout + grace)
+  pool = ProcessPoolExecutor(max_workers=max_workers)
+  futures = [
+    pool.submit(_run_job, function, args, timeout)
+    for _, function, args in jobs]
+  results, expired = [], False
+  for (key, _, _), future in zip(jobs, futures):
+    try:
+      remaining = None if deadline is None else max(deadline - clock.time(), 0)
+      results.append(future.result(timeout=remaining))
+    except FutureTimeout:
+      print("\t\tJob {} timed out".format(key))
+      results.append(None)
+      expired = True
+    except Exception as e:
+      print("\t\tJob {} failed due to {}".format(key, e))
+      results.append(None)
+  if expired:
+    _terminate(pool)
+  else:
+    pool.shutdown()
+  return results
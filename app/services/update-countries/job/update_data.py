@@ -8,24 +8,28 @@ from google.oauth2 import service_account
 import pandas as pd
 import numpy as np
 
-import pandas_gbq
-
-import requests
 import pickle
 import os
 
+from ingestion import client as ic
+from ingestion import timeline as tl
+from ingestion import warehouse as wh
+
 # Defualt variables
 COUNTRY_LIST = ["BR", "IT", "CN", "DE"]
 
 PROJECT_ID   = "epidemicapp-280600"
 TABLE_ID     = "countries.real_data"
 TABLE_LOG_ID = "countries.data_log"
-LOG_QUERY    = "SELECT * FROM countries.data_log"
 
-CREDENTIALS  = service_account.Credentials.from_service_account_file('./keys/epidemicapp-62d0d471b86f.json')
-pandas_gbq.context.credentials = CREDENTIALS
+# The warehouse, e.g. sqlite://data.db to run offline
+WAREHOUSE_URL = os.environ.get("WAREHOUSE_URL", "bigquery://" + PROJECT_ID)
+
+CREDENTIALS = None
+if WAREHOUSE_URL.startswith("bigquery://"):
+  CREDENTIALS = service_account.Credentials.from_service_account_file('./keys/epidemicapp-62d0d471b86f.json')
 
-DEFAULT_LOG  = dict(country=list(), items=list())
+DEFAULT_LOG  = dict(country=list(), items=list(), watermark=list())
 
 
 class real_data_trigger(Resource):
@@ -36,63 +40,89 @@ class real_data_trigger(Resource):
     update_all_countries_pipe()
 
 
-def update_all_countries_pipe():
+def read_data_log(writer):
   """
-  
+    The function that reads the data log, with the number of
+    days collected and the last ingested date of each country.
+    Log tables written before the watermark have no last date,
+    and those countries are sliced by the days collected.
+
+    :param Writer writer: The warehouse writer.
+
+    :return: The countries, the days collected and the watermarks.
+    :rtype: dict
   """
-  # Check if logging file exists
-  # if does not, create the logging
-  # as default file
-  
   try:
     # Reading the log table...
-    log_df = pandas_gbq.read_gbq(LOG_QUERY, project_id=PROJECT_ID)
+    log_df = writer.read(TABLE_LOG_ID)
     country_list = log_df["country"].to_list()
     start_p_list = log_df["days_collected"].to_list()
-    log_data = dict(country=country_list, items=start_p_list)
+    if "last_date" in log_df.columns:
+      watermarks = [None if pd.isna(w) else w for w in log_df["last_date"]]
+    else:
+      watermarks = [None] * len(country_list)
+    return dict(country=country_list, items=start_p_list, watermark=watermarks)
   except:
     print("Country log table does not yet, exist...")
-    log_data = DEFAULT_LOG
+    return {key: list() for key in DEFAULT_LOG}
+
+
+def update_all_countries_pipe(incremental=True):
+  """
+    The pipeline that uploads the new days of every country.
+    In the incremental mode, only the timeline after the last
+    ingested date of the country, plus a small overlap for the
+    interpolation, is normalized, so each run costs time
+    proportional to the new data.
+
+    The new days of all the countries are uploaded together
+    at the end, followed by a single commit of the log.
+
+    :param bool incremental: If the watermark of each country must be used. Default is :code:`True`.
+  """
+  writer = wh.Writer(wh.connect(WAREHOUSE_URL, CREDENTIALS))
+  log_data = read_data_log(writer)
 
-  # Get the data for each country
-  covid_api = 'https://corona-api.com/countries/'
+  # Request the data of every country 
+  # concurrently, before the uploads
+  countries_json = ic.countries(COUNTRY_LIST)
   for country in COUNTRY_LIST:
-    # Request the country data
-    data_json =  requests.get(covid_api + country).json()
-    # Get the population info
-    N = data_json['data']['population']
-    # Get the timeline data
-    tm_data = data_json['data']['timeline']
-    
-    # Create a dataframe with the timeline data
-    df = pd.DataFrame(tm_data)
-    df = df.sort_values('date').reset_index()
-    # Create the time vector
-    df['date'] = [datetime.fromisoformat(f) for f in df['date']]
-    df = df.drop_duplicates(subset='date', keep = 'last')
-    # Preparing the dataframe...
-    first_date = df['date'].iloc[0]
-    size_days = (df['date'].iloc[-1] - df['date'].iloc[0]).days
-    date_vec = [first_date + timedelta(days=k) for k in range(size_days)]
-    new_df = pd.DataFrame(date_vec, columns=['date'])
-    new_df = pd.merge(new_df, df, how='left', on='date')
-    new_df = new_df.drop(columns= ['index', 'updated_at', 'is_in_progress'])
-    # Interpolating the dataframe columns
-    for col in new_df.columns[1:]:
-      new_df[col] = new_df[col].interpolate(method='polynomial', order=1)
-    df = new_df.dropna()
-
-    # Check if it is Brazil and correct 
-    # some of the last data values
-    if country == "BR":
-      df.iloc[135,:] = [df.iloc[135, 0]] + [None]*7
-      df = df.interpolate(method ='linear', limit_direction ='forward')
-      df = df.where(df.active != 0.0).dropna()
-
-    # Create the upload dictionary
-    upload_data = dict()
-    for item in ["active", "recovered", "deaths", "confirmed"]:
-      upload_data[item] = df[item].values
+    # The failed countries keep their
+    # data and log until the next update
+    if country not in countries_json:
+      continue
+    data_json = countries_json[country]
+    timeline = data_json['data']['timeline']
+    # Find the country log track
+    index, watermark = None, None
+    if country in log_data["country"]:
+      index = log_data["country"].index(country)
+      if incremental:
+        watermark = log_data["watermark"][index]
+
+    if watermark is not None:
+      # Normalize only the days after
+      # the last ingested one
+      df = tl.normalize_since(timeline, watermark)
+    else:
+      # Normalize the timeline data into
+      # one interpolated row per day
+      df = tl.normalize(timeline)
+
+      # Check if it is Brazil and correct 
+      # some of the last data values
+      if country == "BR":
+        df.iloc[135,:] = [df.iloc[135, 0]] + [None]*7
+        df = df.interpolate(method ='linear', limit_direction ='forward')
+        df = df.where(df.active != 0.0).dropna()
+
+      # Remove the already existing data
+      if index is not None:
+        df = df.iloc[log_data["items"][index]:]
+
+    if df.shape[0] == 0:
+      print(" NOTHING NEW ON COUNTRY {}...".format(country))
+      continue
     
     # Ensure all numeric columns have
     # the same data type
@@ -103,27 +133,20 @@ def update_all_countries_pipe():
     # Creating the country column
     df["country"] = country
     
-    # Upload the data to the cloud
-    # Create the table id
-    if country in log_data["country"]:  
-      # Remove the already existing data
-      index = log_data["country"].index(country)
-      items_size = log_data["items"][index]
-      df = df.iloc[items_size:]
+    # Buffer the data to the cloud
+    # upload of all countries
+    if index is not None:
       # Print the uploaded content info
       print(" UPDATING COUNTRY {}...".format(country))
       print(" Uploading datatable of {}".format(country))
-      print("    The item size: {}".format(items_size))
+      print("    The item size: {}".format(log_data["items"][index]))
+      print("    The watermark: {}".format(watermark))
       print("    Table shape: {}".format(df.shape))
       print("    Table contents: {}".format(df.columns.to_list()))
       print("    Table ct types: {}".format(df.dtypes.to_list()))
-      try:
-        # Update the logging index track
-        log_data["items"][index] += df.shape[0]
-        pandas_gbq.to_gbq(df, TABLE_ID, project_id=PROJECT_ID, credentials=CREDENTIALS, if_exists='append')
-        print("Uploaded!")
-      except Exception as e:
-        print("Error on uploading {}...".format(e))
+      # Update the logging index track
+      log_data["items"][index] += df.shape[0]
+      log_data["watermark"][index] = df["date"].iloc[-1]
     else:
       # Print the uploaded content info
       print(" NEW COUNTRY {}!!".format(country))
@@ -131,21 +154,23 @@ def update_all_countries_pipe():
       print("    Table shape: {}".format(df.shape))
       print("    Table contents: {}".format(df.columns.to_list()))
       print("    Table ct types: {}".format(df.dtypes.to_list()))
-      try:
-        # Create the loggin index track
-        log_data["country"].append(country)
-        log_data["items"].append(df.shape[0])
-        pandas_gbq.to_gbq(df, TABLE_ID, project_id=PROJECT_ID, credentials=CREDENTIALS, if_exists='append')
-        print("Uploaded!")
-      except Exception as e:
-        print("Error on uploading {}...".format(e))
-    # Save the log file into the log table server
-    try:
-      log_df = pd.DataFrame({"country": log_data["country"], "days_collected": log_data["items"]})
-      pandas_gbq.to_gbq(log_df, TABLE_LOG_ID, project_id=PROJECT_ID, credentials=CREDENTIALS, if_exists="replace")
-      print("Log saved into {}!".format(TABLE_LOG_ID))
-    except Exception as e:
-      print("Not able to save the logging, due to {}".format(e))
+      # Create the loggin index track
+      log_data["country"].append(country)
+      log_data["items"].append(df.shape[0])
+      log_data["watermark"].append(df["date"].iloc[-1])
+    writer.append(TABLE_ID, df)
+
+  # Upload the data of every country, and only
+  # then save the log file into the log table
+  log_df = pd.DataFrame({
+    "country": log_data["country"], 
+    "days_collected": log_data["items"],
+    "last_date": pd.to_datetime(log_data["watermark"], utc=True)})
+  writer.replace(TABLE_LOG_ID, log_df)
+  try:
+    writer.flush()
+    print("Uploaded! Log saved into {}!".format(TABLE_LOG_ID))
+  except Exception as e:
+    print("Error on uploading {}...".format(e))
     
   print("DONE! -> Process from: {}".format(datetime.now()))
-
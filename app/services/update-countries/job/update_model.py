@@ -4,8 +4,7 @@ from flask_request_params import bind_request_params
 
 import os
 import pickle
-import requests
-import pandas_gbq
+import time as clock
 
 import pandas as pd
 import numpy  as np
@@ -15,6 +14,12 @@ from datetime      import datetime, timedelta
 from google.oauth2 import service_account
 
 from models import *
+from ingestion import client as ic
+from ingestion import timeline as tl
+from ingestion import warehouse as wh
+from ingestion import predictions as ps
+
+from . import scheduler
 
 # Defualt variables
 PROJECT_ID    = "epidemicapp-280600"
@@ -22,10 +27,13 @@ PRED_TABLE_ID = "countries.predictions"
 PAR_TABLE_ID  = "countries.parameters"
 
 TABLE_LOG_ID  = "countries.model_log"
-LOG_QUERY     = "SELECT * FROM countries.model_log"
 
-CREDENTIALS   = service_account.Credentials.from_service_account_file('./keys/epidemicapp-62d0d471b86f.json')
-pandas_gbq.context.credentials = CREDENTIALS
+# The warehouse, e.g. sqlite://data.db to run offline
+WAREHOUSE_URL = os.environ.get("WAREHOUSE_URL", "bigquery://" + PROJECT_ID)
+
+CREDENTIALS   = None
+if WAREHOUSE_URL.startswith("bigquery://"):
+  CREDENTIALS = service_account.Credentials.from_service_account_file('./keys/epidemicapp-62d0d471b86f.json')
 
 # Configuration variables
 COUNTRY_LIST = ["DE", "CN", "IT", "BR"]
@@ -60,45 +68,99 @@ class train_all_trigger(Resource):
 
 def train_all_countries_pipe():
   """
+    The pipeline that trains the models of all the countries,
+    spreading the (country, days) fit jobs across a process pool
+    and uploading the results of each country in order.
   """
+  writer = wh.Writer(wh.connect(WAREHOUSE_URL, CREDENTIALS))
+  print("\t(2) Reading the model log...")
+  log_data = read_model_log(writer)
+  # Request the data of every country concurrently,
+  # then build its (country, days) fit jobs
+  countries_json = ic.countries(COUNTRY_LIST)
+  country_data, jobs = dict(), []
   for country in COUNTRY_LIST:
-    train_country_pipe(country=country)
+    print("Running update on : {} ...".format(country))
+    data = load_country_data(country, log_data, countries_json[country])
+    country_data[country] = data
+    for days in scheduler.split_days(data["days"]):
+      jobs.append(((country, days), fit_country_days, (data, days)))
 
+  print("\t(4) Running {} time shift learning jobs...".format(len(jobs)))
+  results = scheduler.run(jobs)
+  # Merge the jobs results back in day order, 
+  # up to the first day not fitted, so the 
+  # next run restarts from that day
+  merged = {country: [] for country in COUNTRY_LIST}
+  complete = {country: True for country in COUNTRY_LIST}
+  for ((country, days), _, _), result in zip(jobs, results):
+    if not complete[country]:
+      continue
+    merged[country] += result or []
+    if result is None or len(result) < len(days):
+      print("\t\tJob of {} stopped before day {}...".format(country, days[-1]))
+      complete[country] = False
 
-def train_country_pipe(country=None):
+  for country in COUNTRY_LIST:
+    if len(merged[country]) > 0:
+      print("Uploading update of : {} ...".format(country))
+      upload_country_results(country_data[country], merged[country], log_data, writer)
+    else:
+      print("\t߷ Nothing to update on {}...".format(country))
+  commit_results(writer, log_data)
+
+  print("DONE! -> Model Update - Process from: {}".format(datetime.now()))
+
+
+def read_model_log(writer):
   """
+    The function that reads the model log, with the first day
+    still to be trained for each country.
+
+    :param Writer writer: The warehouse writer.
+
+    :return: The next start day of each country.
+    :rtype: dict
+  """
+  # If the model log does not exist, we create a model log 
+  # with a particular structure -> dictionary
+  try:
+    # Reading the log table...
+    log_df = writer.read(TABLE_LOG_ID)
+    country_list = log_df["country"].to_list()
+    start_p_list = log_df["start_point"].to_list()
+    log_data = dict(zip(country_list, start_p_list))
+  except:
+    log_data = dict()
+    print("\t\tCountry log table does not yet, exist...")
+  return log_data
+
+
+def load_country_data(country, log_data, data_json=None):
+  """
+    The function that downloads and organizes the SIR data of
+    a country, with the days still to be trained.
+
+    :param string country: The country Alpha-2 ISO3166 code.
+    :param dict log_data: The next start day of each country.
+    :param dict data_json: The already fetched corona-api data of the country. Default is :code:`None`.
+
+    :return: The country SIR data, time references and the days to train.
+    :rtype: dict
   """
-  
   # Setting some control variables
   START_SIZE = SETUP_COUNTRY[country]["start_size"]
   PEAK_EXISTS = SETUP_COUNTRY[country]["peak_exist"]
 
-  print("Running update on : {} ...".format(country))
-
   # Get the model data
-  covid_api = 'https://corona-api.com/countries/'
-  rest_countries = 'https://restcountries.eu/rest/v2/alpha/'
-  data_json =  requests.get(covid_api + country).json()
-  # country = requests.get(covid_api + country).json()
+  if data_json is None:
+    data_json = ic.country(country)
   N = data_json['data']['population']
 
   print("\t(1) Organizing the data...")
   
-  # Creating the dataframe with the data
-  df = pd.DataFrame(data_json['data']['timeline'])
-  df = df.sort_values('date').reset_index()
-  df['date'] = [datetime.fromisoformat(f) for f in df['date']]
-  df = df.drop_duplicates(subset='date', keep = 'last')
-  # Criando o vetor de tempo
-  first_date = df['date'].iloc[0]
-  size_days = (df['date'].iloc[-1] - df['date'].iloc[0]).days
-  date_vec = [first_date + timedelta(days=k) for k in range(size_days)]
-  new_df = pd.DataFrame(date_vec, columns=['date'])
-  new_df = pd.merge(new_df, df, how='left', on='date')
-  new_df = new_df.drop(columns= ['index',  'updated_at', 'is_in_progress'])
-  for col in new_df.columns[1:]:
-    new_df[col] = new_df[col].interpolate(method='polynomial', order=1)
-  df = new_df.dropna()
+  # Creating the daily dataframe with the data
+  df = tl.normalize(data_json['data']['timeline'])
   
   # Solve particular problems
   # 
@@ -115,38 +177,15 @@ def train_country_pipe(country=None):
   ts = (datetime_64 - np.datetime64('1970-01-01T00:00:00Z')) / np.timedelta64(1, 's')
   time = [datetime.utcfromtimestamp(t) for t in ts]
 
-  print("\t(2) Reading the model log...")
-  # If the model log does not exist, we create a model log 
-  # with a particular structure -> dictionary
-  
-  try:
-    # Reading the log table...
-    log_df = pandas_gbq.read_gbq(LOG_QUERY, project_id=PROJECT_ID)
-    country_list = log_df["country"].to_list()
-    start_p_list = log_df["start_point"].to_list()
-    log_data = dict(zip(country_list, start_p_list))
-  except:
-    log_data = dict()
-    print("\t\tCountry log table does not yet, exist...")
-    
-
   print("\t(3) Creating SIR data...")
   # Create the SIR model structure, for the model trainning
   start_moment = np.argmax(df["active"].to_numpy() >= START_SIZE)
   time_ref = time[start_moment:]
   I = df['active'].to_numpy()[start_moment:]
   R = df['recovered'].to_numpy()[start_moment:]
-  M = df['deaths'].to_numpy()[start_moment:]
   S = N - R - I
   # Creating the time vector
   t = np.linspace(0, len(I)-1, len(I))
-  # Create the trainning variables
-  Sd, Id, Md, Rd, td = S, I, M, R, t
-
-  print("\t(4) Running the time shift learning...")
-  # Create the structures to save the time shift results
-  saved_param = {'Ro':[], 'D':[], 'pop':[], "date":[]}
-  saved_prediction = {"S":[], "I":[], "R":[], "date":[], "at_date":[]}
 
   # Check if the country exists in the logging
   # if does not, create the logging structure
@@ -156,114 +195,162 @@ def train_country_pipe(country=None):
   if country in log_data.keys():
     start_day = log_data[country]
 
-  # If start_day on the logging is less than 
-  # the size of the data, there is room for 
-  # running windowed shifting learning
-  if start_day < len(I):
-    # If peak does not exists, predict 
-    # 120 days ahead to find the peak
-    if PEAK_EXISTS:
-      pred_t = range(int(td[-1]))
-    else:
-      pred_t = range(int(td[-1])+120)
-    # Compute the time vector
-    time_vector = [time_ref[0] + timedelta(days=i) for i in pred_t]
-    pred_t = np.array(pred_t)
-    for i in range(start_day, len(I)):    
-      # Compute this day data...
-      current_date = time_ref[0] + timedelta(days=i)
-      current_date_vector = [current_date]*len(pred_t)
-      # Get a partial window of the dataset
-      dataset = dict(S=Sd[:i], I=Id[:i], R=Rd[:i])
-      # Create the model
-      sir_model = ss.SIR(pop=N, focus=["S", "I", "R"], verbose=False)
-      # Adjust the parameters
-      sir_model.fit(dataset, td[:i],
+  # If peak does not exists, predict 
+  # 120 days ahead to find the peak
+  if PEAK_EXISTS:
+    pred_t = np.arange(int(t[-1]))
+  else:
+    pred_t = np.arange(int(t[-1])+120)
+
+  return dict(country=country, N=N, S=S, I=I, R=R, t=t,
+    time=time, time_ref=time_ref, pred_t=pred_t,
+    days=range(start_day, len(I)))
+
+
+def fit_country_days(data, days, deadline=None):
+  """
+    The function that runs the time shift learning over the 
+    provided days, each day warm started by the previous one.
+
+    :param dict data: The country SIR data, from :code:`load_country_data`.
+    :param range days: The days to be fitted, in increasing order.
+    :param float deadline: The :code:`time.time()` after which no new day is started. Default is :code:`None`.
+
+    :return: The estimated parameters and prediction of each fitted day, in order.
+    :rtype: list
+  """
+  N, S, I, R, t = data["N"], data["S"], data["I"], data["R"], data["t"]
+  # Each day search starts from the 
+  # previous day optimum and spread
+  previous_result = None
+  results = []
+  for i in days:
+    # Stop starting new days if the
+    # job time budget is over
+    if deadline is not None and clock.time() > deadline:
+      break
+    # Get a partial window of the dataset
+    dataset = dict(S=S[:i], I=I[:i], R=R[:i])
+    # Create the model
+    sir_model = ss.SIR(pop=N, focus=["S", "I", "R"], verbose=False)
+    # Adjust the parameters
+    sir_model.refit(dataset, t[:i],
+                    warm_start=previous_result,
                     search_pop=True,
                     pop_sens=[0.001, 0.05],
                     Ro_sens=[0.8, 15.0], 
                     D_sens=[5.0, 40.0])
-      # Save the estimated parameters
-      saved_param['Ro'].append(sir_model.parameters[0])
-      saved_param['D'].append(sir_model.parameters[1])
-      saved_param['pop'].append(sir_model.parameters[2])
-      saved_param['date'].append(current_date)
-      # Save the model prediction
-      result = sir_model.predict((Sd[0], Id[0], Rd[0]), pred_t)
-      saved_prediction["S"].append(result[0])
-      saved_prediction["I"].append(result[1])
-      saved_prediction["R"].append(result[2])
-      saved_prediction["date"] += time_vector
-      saved_prediction["at_date"] += current_date_vector
-      # Print the progress...
-      print("\t\t߷ Run {} of {}".format(i-start_day+1, len(I)-start_day))
-    
-    print("\t(5) Determining the peak...")
-    if PEAK_EXISTS:
-      # Compute the derivative of the smoothed 
-      # active infected time series
-      dI = np.gradient(pyasl.smooth(I, 13, "hamming"))
-      t = np.linspace(0, len(dI), len(dI))
-      # Find the derivative bigger then zero
-      signal = np.array([di >= 0 for di in dI[::-1]])
-      # Find the first point where the derivative
-      # change signal
-      peak_pos = int(len(Id) - np.argmax(signal))
-      peak_date = [time[0] + timedelta(days=peak_pos)] * len(saved_param["D"])
-    else:
-      estimated_peaks = []
-      for data in saved_prediction["I"]:
-        # Computing the prediction derivative
-        dI = np.gradient(data)
-        # Computing the derivative signal
-        signal_pred = np.array([di >= 0 for di in dI[::-1]])
-        # Computing the peak estimate point
-        # print("Signal shape: ", len(data) - np.argmax(signal_pred))
-        estimated_peaks.append(len(data) - np.argmax(signal_pred))
-      # print(estimated_peaks)
-      peak_date = [time_ref[0] + timedelta(days=int(p)) for p in estimated_peaks]
-
-    print("\t(6) Transforming data to lists...")
-    # Transform all in lists
-    for item in ["S", "I", "R"]:
-      auxiliar_list = []
-      for data in saved_prediction[item]:
-        auxiliar_list += data.tolist()
-      saved_prediction[item] = auxiliar_list
-
-    print("\t(7) Uploading data to cloud...")
-    try:
-      # Build the data tables to upload
-      print("\t\tUploading the parameters...")
-      par_df = pd.DataFrame(data=saved_param)
-      par_df["country"] = country # Create the country column
-      par_df["peak_est"] = peak_date # Creating the column of peak dates
-      pandas_gbq.to_gbq(par_df, PAR_TABLE_ID, project_id=PROJECT_ID, credentials=CREDENTIALS, if_exists='append')
-      
-      print("\t\tUploading the predictions...")
-      pred_df = pd.DataFrame(data=saved_prediction)
-      pred_df["country"] = country # Create the country column
-      pandas_gbq.to_gbq(pred_df, PRED_TABLE_ID, project_id=PROJECT_ID, credentials=CREDENTIALS, if_exists='append')
-
-      # Update the logging values
-      print("\t\tUpdating the log...")
-      log_data[country] = len(I)
-    except:
-      print("\t\tCloud uploading error!")
-    
-    # Saving the log data into the cloud
-    print("\t(8) Saving log data...")
-    try:
-      log_upload = {"country":[], "start_point":[]}
-      for c in log_data.keys():
-        log_upload["country"].append(c)
-        log_upload["start_point"].append(log_data[c])
-      df_log = pd.DataFrame(log_upload)
-      pandas_gbq.to_gbq(df_log, TABLE_LOG_ID, project_id=PROJECT_ID, credentials=CREDENTIALS, if_exists="replace")
-    except Exception as e:
-      print("\t\tUnable to upload log due to {}".format(e))
+    previous_result = sir_model.result
+    # Save the estimated parameters and 
+    # the model prediction
+    results.append(dict(day=i,
+      parameters=sir_model.parameters,
+      prediction=sir_model.predict((S[0], I[0], R[0]), data["pred_t"])))
+    # Print the progress...
+    print("\t\t߷ {} run {} of {}".format(data["country"], len(results), len(days)))
+  return results
+
+
+def upload_country_results(data, results, log_data, writer):
+  """
+    The function that computes the peak estimates and buffers
+    the parameters and predictions of a country for upload,
+    updating its log entry.
+
+    :param dict data: The country SIR data, from :code:`load_country_data`.
+    :param list results: The fitted days, in order, from :code:`fit_country_days`.
+    :param dict log_data: The next start day of each country, updated in place.
+    :param Writer writer: The warehouse writer, flushed by :code:`commit_results`.
+  """
+  country = data["country"]
+  PEAK_EXISTS = SETUP_COUNTRY[country]["peak_exist"]
+  I, time, time_ref = data["I"], data["time"], data["time_ref"]
+
+  # Create the structures to save the time shift results,
+  # with the predictions in one contiguous array
+  saved_param = {'Ro':[], 'D':[], 'pop':[], "date":[]}
+  saved_prediction = ps.PredictionStore(country, time_ref[0], data["pred_t"], len(results))
+  for day in results:
+    # Compute this day data...
+    current_date = time_ref[0] + timedelta(days=day["day"])
+    # Save the estimated parameters
+    saved_param['Ro'].append(day["parameters"][0])
+    saved_param['D'].append(day["parameters"][1])
+    saved_param['pop'].append(day["parameters"][2])
+    saved_param['date'].append(current_date)
+    # Save the model prediction
+    saved_prediction.add(day["day"], day["prediction"])
+  
+  print("\t(5) Determining the peak...")
+  if PEAK_EXISTS:
+    # Find the peak of the smoothed 
+    # active infected time series
+    peak_pos = int(pk.peak_days(pyasl.smooth(I, 13, "hamming"))[0])
+    peak_date = [time[0] + timedelta(days=peak_pos)] * len(saved_param["D"])
+  else:
+    # Computing the peak estimate of every prediction
+    estimated_peaks = pk.peak_analysis(saved_prediction.infected).day
+    peak_date = [time_ref[0] + timedelta(days=int(p)) for p in estimated_peaks]
+
+  print("\t(7) Buffering data to upload...")
+  # Build the data tables to upload
+  par_df = pd.DataFrame(data=saved_param)
+  par_df["country"] = country # Create the country column
+  par_df["peak_est"] = peak_date # Creating the column of peak dates
+  writer.append(PAR_TABLE_ID, par_df)
+
+  # The long-format predictions, built from the arrays
+  writer.append(PRED_TABLE_ID, saved_prediction.frame())
+
+  # Update the logging values, the next
+  # run starts after the last fitted day
+  log_data[country] = results[-1]["day"] + 1
+
+
+def commit_results(writer, log_data):
+  """
+    The function that uploads the buffered parameters and
+    predictions of all the countries, and then saves the log,
+    so the log only advances when the upload succeeds.
+
+    :param Writer writer: The warehouse writer.
+    :param dict log_data: The next start day of each country.
+  """
+  print("\t(8) Uploading data and log to cloud...")
+  log_upload = {"country":[], "start_point":[]}
+  for c in log_data.keys():
+    log_upload["country"].append(c)
+    log_upload["start_point"].append(log_data[c])
+  writer.replace(TABLE_LOG_ID, pd.DataFrame(log_upload))
+  try:
+    writer.flush()
+  except Exception as e:
+    print("\t\tCloud uploading error due to {}".format(e))
+
+
+def train_country_pipe(country=None):
+  """
+    The pipeline that trains the model of a single country,
+    running the time shift learning day after day.
+
+    :param string country: The country Alpha-2 ISO3166 code.
+  """
+  print("Running update on : {} ...".format(country))
+
+  writer = wh.Writer(wh.connect(WAREHOUSE_URL, CREDENTIALS))
+  print("\t(2) Reading the model log...")
+  log_data = read_model_log(writer)
+  data = load_country_data(country, log_data)
+
+  # If start_day on the logging is less than 
+  # the size of the data, there is room for 
+  # running windowed shifting learning
+  if len(data["days"]) > 0:
+    print("\t(4) Running the time shift learning...")
+    results = fit_country_days(data, data["days"])
+    upload_country_results(data, results, log_data, writer)
+    commit_results(writer, log_data)
   else:
     print("\t߷ Nothing to update...")
 
   print("DONE! -> Model Update - Process from: {}".format(datetime.now()))
-
@@ -4,4 +4,6 @@
   :license: BSD-3-Clause
 """
 
-from . import stochastic_search as ss
\ No newline at end of file
+from . import stochastic_search as ss
+from . import peaks as pk
+from . import trace as tr
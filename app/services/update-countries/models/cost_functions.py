@@ -1,6 +1,5 @@
 
 import numpy as np
-from PyAstronomy import pyasl
 
 
 def cost_NSIR(self, pars, dataset, initial, t, w):
@@ -26,7 +25,7 @@ def cost_NSIR(self, pars, dataset, initial, t, w):
     self._iter_error.append(erro_acc)
   except:
     print("Except da merda")
-    erro_acc = self._iter_error[-1]
+    erro_acc = self._iter_error.last
   return erro_acc
 
 
@@ -70,7 +69,7 @@ def cost_SIR(self, pars, dataset, initial, t, w):
     self._iter_error.append(erro_acc)
   except:
     print("Except da merda")
-    erro_acc = self._iter_error[-1]
+    erro_acc = self._iter_error.last
   return erro_acc
 
 
@@ -92,6 +91,8 @@ def cost_dSIR(self, pars, dataset, initial, t, w):
   model_pars = [p for p in pars]
   model_init = [item for item in initial]
   
+  # PyAstronomy is loaded only by the smoothed cost
+  from PyAstronomy import pyasl
   S = pyasl.smooth(dataset[0], 13, "hamming")
   I = pyasl.smooth(dataset[1], 13, "hamming")
   R = pyasl.smooth(dataset[2], 13, "hamming")
@@ -118,7 +119,7 @@ def cost_dSIR(self, pars, dataset, initial, t, w):
     self._iter_error.append(erro_acc)
   except:
     print("Except da merda")
-    erro_acc = self._iter_error[-1]
+    erro_acc = self._iter_error.last
   return erro_acc
 
 
@@ -160,5 +161,5 @@ def cost_SEIR(self, pars, dataset, initial, t, w):
     self._iter_error.append(erro_acc)
   except:
     print("Except da merda")
-    erro_acc = self._iter_error[-1]
+    erro_acc = self._iter_error.last
   return erro_acc
@@ -53,20 +53,22 @@ def SIR(self, y, t, parameters, *args):
     return Sdot, Idot, Rdot
 
 
-def SEIR(self, y, t, Beta, r, sigma):
+def SEIR(self, y, t, Ro, D, sigma):
   """
     The function that computes the diferential set of 
     equations of the SEIR Epidemic Model.
     
     :param tuple y: Tuple with the suceptible and infected data.
     :param array t: The time respective to each y set of samples.
-    :param float Beta: The Beta parameter.
-    :param float r: The r parameter.
+    :param float Ro: The Ro parameter.
+    :param float D: The D parameter.
     :param float sigma: The sigma parameter.
     
     :return: The derivative of the suceptible and infected data.
     :rtype: tuple
   """
+  # The rates of the Ro and D parametrization
+  Beta, r = Ro / D, 1 / D
 
   S, E, I, R = y
   Sdot = -Beta * S * I / self.N
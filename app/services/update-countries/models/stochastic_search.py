@@ -1,27 +1,17 @@
 
 
-import os
 import numpy as np
-import scipy.signal as scs
 
-from PyAstronomy import pyasl
-from scipy import integrate, interpolate
+from scipy import integrate
 
 from scipy.optimize import differential_evolution, dual_annealing
 from scipy.optimize import shgo, leastsq, NonlinearConstraint
 
-from bokeh.models   import ColumnDataSource, RangeTool, LinearAxis, Range1d
-from bokeh.palettes import brewer, Inferno10
-from bokeh.plotting import figure, show
-from bokeh.layouts  import column
-from bokeh.io       import output_notebook, export_png
-
 from . import differential_models as dm
 from . import cost_functions as cm
 from . import constraints as ct
 from . import discrete_models as dcm
-
-output_notebook()
+from . import trace as tr
 
 # import warnings
 # warnings.filterwarnings("error")
@@ -29,11 +19,6 @@ output_notebook()
 # Estimate response structure
 GLOBAL_ERROR_CONTROLLER = 10**14
 
-# Default plot configs
-TOOLS = "pan,zoom_in,zoom_out,save"
-PLOT_WIDTH = 600
-PLOT_HEIGHT = 400
-
 
 
 class SIR:
@@ -64,7 +49,7 @@ class SIR:
     self.__search_alg = algorithm
     self.__ssearch = stochastic_search
     # Semi Local variables
-    self._iter_error = [10**14]
+    self._iter_error = tr.Trace(initial=GLOBAL_ERROR_CONTROLLER)
     self._search_pop = forced_search_pop
     # Simulation type
     self.__sim_type = simulation
@@ -198,6 +183,9 @@ class SIR:
       notified_sens=None,
       sample_ponder=None,
       optim_verbose=False,
+      warm_start=None,
+      warm_popsize=10,
+      warm_spread=0.01,
       **kwargs):
     """
       The method responsible for estimating a set of beta and r 
@@ -213,6 +201,9 @@ class SIR:
       :param list r_sens: The r parameter sensibility minimun and maximun boundaries, respectivelly. Default is :code:`[100,1000]`.
       :param bool sample_ponder: The flag to set the pondering of the non informative recovered data.
       :param bool optim_verbose: If :code:`True`, after fitting will show the optimization summary.
+      :param OptimizeResult warm_start: A previous search result, used to seed the search around its optimum. Default is :code:`None`.
+      :param int warm_popsize: The seeded population size multiplier, only if :code:`warm_start` is set. Default is :code:`10`.
+      :param float warm_spread: The minimum seeded spread, as a proportion of the bounds, only if :code:`warm_start` is set. Default is :code:`0.01`.
       :param dict **kwargs: The optimization search algorithms options.
     """
     # Create the data values including
@@ -288,6 +279,12 @@ class SIR:
     # controlled by the flag on the 
     # __init__ method.
     if self.__search_alg == "differential_evolution":
+      # A warm start seeds the population 
+      # around the previous optimum
+      init = "latinhypercube"
+      if warm_start is not None:
+        init = warmPopulation(
+          warm_start, lower, upper, warm_popsize, warm_spread)
       summary = differential_evolution(
           self.cost_wrapper, 
           list(zip(lower, upper)),
@@ -298,6 +295,7 @@ class SIR:
           tol=1e-4,
           args=(datatrain, y0, t, w),
           constraints=constraints,
+          init=init,
           # updating='deferred',
           # workers=-1,
           # disp=True
@@ -307,7 +305,8 @@ class SIR:
           self.cost_wrapper, 
           list(zip(lower, upper)),
           maxiter=10000,
-          args=(datatrain, y0, t, w)
+          args=(datatrain, y0, t, w),
+          x0=None if warm_start is None else warm_start.x
         )
     elif self.__search_alg == "shgo":
       summary = shgo(
@@ -319,12 +318,29 @@ class SIR:
         )
     # Saving the estimated parameters
     self.parameters = summary.x
+    self.result = summary
     # Printing summary
     if self.verbose:
       print("\t └─ Defined at: ", self.parameters[0], " ─ ", self.parameters[1], "\n")
     if optim_verbose:
       print(summary)
 
+  def refit(self, dataset, t, warm_start=None, **kwargs):
+    """
+      The method responsible for re-estimating the parameters when 
+      new points are added to the dataset. The search starts from a
+      population seeded around the previous optimum and its spread, 
+      instead of a cold start over the whole bounds.
+      
+      :param array dataset: list with the respective arrays of Suceptible, Infected, Recovered and Deaths.
+      :param array t: The time respective to each set of samples.
+      :param OptimizeResult warm_start: The previous search result. Default is the last result of this model, if any.
+      :param dict **kwargs: The :code:`fit` method options.
+    """
+    if warm_start is None:
+      warm_start = getattr(self, "result", None)
+    self.fit(dataset, t, warm_start=warm_start, **kwargs)
+
   def fit_multiple(self, Sd, Id, Bd, td, 
       threshold_prop=1,
       cases_before=10,
@@ -390,7 +406,10 @@ class SIR:
       y0 = int(S[0]), int(I[0])
       # Parameter weights
       w = [max(I)/max(S), 1]
-      # Resampling the data
+      # Resampling the data, with the signal
+      # processing stacks loaded only here
+      import scipy.signal as scs
+      from PyAstronomy import pyasl
       Sd_res, t_res = scs.resample(S, int(t[-1]), t=t)
       Id_res, t_res = scs.resample(I, int(t[-1]), t=t)
       # Filtering the values
@@ -511,7 +530,10 @@ class SIR:
       y0 = int(S[0]), int(I[0])
       # Parameter weights
       w = [max(I)/max(S), 1]
-      # Resampling the data
+      # Resampling the data, with the signal
+      # processing stacks loaded only here
+      import scipy.signal as scs
+      from PyAstronomy import pyasl
       Sd_res, t_res = scs.resample(S, int(t[-1]), t=t)
       Id_res, t_res = scs.resample(I, int(t[-1]), t=t)
       # Filtering the values
@@ -604,97 +626,48 @@ class SIR:
       :rtype: bokeh.figure
     
     """
-    # Getting the estimation dataset
-    estimation_data = self.data
-    #Building the estimated parameter info
-    r = estimation_data["pars"]["r"]
-    beta = estimation_data["pars"]["beta"]
-    years = [int(t) for t in estimation_data["time"]]
-
-    # Creating the parameter plot
-    p = figure(
-      tools="hover",
-      y_range=(min(beta), max(beta)), 
-      plot_width=plot_size[0], 
-      plot_height=plot_size[1]
-    )
-
-    # Plotting the beta parameter
-    p.line(years, beta, 
-      legend_label="beta", 
-      line_width=4, 
-      color="#c2185b", 
-      line_cap='round', 
-      line_alpha=0.9
-    )
-    # Creating the extra y axis for plotting the r parameter
-    p.extra_y_ranges = {"r_axis": Range1d(start=min(r), end=max(r))}
-    p.add_layout(LinearAxis(y_range_name="r_axis"), 'left')
-    # Plotting the r parameter
-    p.line(years, r, 
-      y_range_name="r_axis", 
-      line_dash='dashed',
-      legend_label="r", 
-      line_width=3, 
-      color="#8e44ad", 
-      line_cap='round', 
-      line_alpha=0.9
-    )
-    # Building figure background
-    p.grid.grid_line_alpha = 0
-    p.ygrid.band_fill_color = "olive"
-    p.ygrid.band_fill_alpha = 0.1
-    p.xaxis.axis_label = "Ano"
-    p.toolbar.autohide = True
-    # Creating the estimation plot
-    p1 = figure(
-      tools="hover",
-      x_range=p.x_range,
-      plot_width=plot_size[0], 
-      plot_height=plot_size[1]
-    )
-    # Plotting the full data
-    p1.line(estimation_data["full"]["t"], estimation_data["full"]["I"],
-      legend_label="Casos", 
-      line_width=2, 
-      color="#f4511e", 
-      line_cap='round', 
-      line_alpha=0.9
-    )
-    # Plotting the windowed original data
-    for dataset in estimation_data["data"]["original"]:
-      p1.line(dataset["t"], dataset["I"], 
-        legend_label="Casos", 
-        line_width=4, 
-        color="#f4511e", 
-        line_cap='round', 
-        line_alpha=0.9
-      )
-    # Plotting the estimated data
-    for dataset in estimation_data["data"]["simulated"]:
-      p1.line(dataset["t"], dataset["I"], 
-        line_dash='dashed',
-        legend_label="Estimado", 
-        line_width=3, 
-        color="#0288d1", 
-        line_cap='round', 
-        line_alpha=0.9
-      )
-    # Buildging figure background
-    p1.grid.grid_line_alpha = 0
-    p1.ygrid.band_fill_color = "olive"
-    p1.ygrid.band_fill_alpha = 0.1
-    p1.yaxis.axis_label = "Indivíduos"
-    p1.xaxis.axis_label = "Ano"
-    p1.toolbar.autohide = True
-
-    if save_results:
-      if not os.path.exists(folder_path):
-        os.mkdir(folder_path)
-      file_path = folder_path + file_name
-      export_png(column(p,p1), filename=file_path)
-    if out_plot:
-      return column(p,p1)
+    # The bokeh plotting stack is loaded
+    # only when a summary is asked
+    from . import plots
+    return plots.result_summary(self, out_plot, plot_size, 
+      save_results, folder_path, file_name)
+
+
+def warmPopulation(result, lower, upper, 
+    popsize=10, 
+    spread=0.01, 
+    seed=None):
+  """
+    The function responsible for building the initial population
+    of the differential evolution from a previous search result.
+    The candidates are sampled around the previous optimum, with 
+    the spread of the previous final population.
+
+    :param OptimizeResult result: The previous search result.
+    :param list lower: The lower bounds of the parameters.
+    :param list upper: The upper bounds of the parameters.
+    :param int popsize: The population size multiplier. Default is `10`.
+    :param float spread: The minimum spread, as a proportion of the bounds. Default is `0.01`.
+    :param int seed: The random generator seed. Default is `None`.
+
+    :return: The initial population with shape `(popsize * n_params, n_params)`.
+    :rtype: array
+  """
+  lower, upper = np.asarray(lower), np.asarray(upper)
+  center = np.clip(result.x, lower, upper)
+  # The spread of the previous population, 
+  # bounded below to keep exploring
+  scale = spread * (upper - lower)
+  population = getattr(result, "population", None)
+  if population is not None and np.shape(population)[-1] == len(center):
+    scale = np.maximum(np.std(population, axis=0), scale)
+  # Sample around the previous optimum 
+  # keeping the optimum itself
+  rng = np.random.default_rng(seed)
+  size = max(popsize * len(center), 5)
+  init = center + scale * rng.standard_normal((size, len(center)))
+  init[0] = center
+  return np.clip(init, lower, upper)
 
 
 def findEpidemyBreaks(cases, 
@@ -711,7 +684,9 @@ def findEpidemyBreaks(cases,
     :return: With the list of window's starting points and window's final points, respectively.
     :rtype: tuple
   """
-  # Filtering the data
+  # Filtering the data, with PyAstronomy loaded
+  # only when the windows are searched
+  from PyAstronomy import pyasl
   filt_cases = pyasl.smooth(cases, 11, 'hamming')
   # Compute the derivative and standard deviation
   cases_variation = np.diff(filt_cases).tolist()
@@ -0,0 +1,4 @@
+"""
+  Benchmarks of the epidemic models. Each module runs 
+  from the repository root, as :code:`python -m benchmarks.<name>`.
+"""
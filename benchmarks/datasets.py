@@ -0,0 +1,35 @@
+"""
+  Helpers to load the datasets used by the benchmarks.
+"""
+
+import numpy as np
+
+from ingestion import client as ic
+from ingestion import timeline as tl
+
+
+COUNTRY_LIST = ["BR", "IT", "CN", "DE"]
+
+
+def covid_country(country, start_size=2000):
+  """
+    The function that downloads the COVID timeline of a country
+    and builds the SIR data, as done by the update service.
+
+    :param string country: The country Alpha-2 ISO3166 code.
+    :param int start_size: The number of active cases that starts the dataset.
+
+    :return: The suceptible, infected and recovered data, the time vector and the population.
+    :rtype: tuple
+  """
+  data_json = ic.country(country)
+  N = data_json['data']['population']
+  # Creating the daily dataframe with the data
+  df = tl.normalize(data_json['data']['timeline'])
+  # Create the SIR data
+  start_moment = np.argmax(df["active"].to_numpy() >= start_size)
+  I = df['active'].to_numpy()[start_moment:]
+  R = df['recovered'].to_numpy()[start_moment:]
+  S = N - R - I
+  t = np.linspace(0, len(I)-1, len(I))
+  return S, I, R, t, N
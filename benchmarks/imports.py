@@ -0,0 +1,85 @@
+"""
+  Import time of the models package, as each spawned search
+  worker imports it, and of the copy of the update service, as
+  its job loads it on every cold start, with the optional stacks
+  that the fitting must not load. It exits with an error if any
+  of them is loaded, or if an import is slower than the given
+  budget, to guard the lazy imports against regressions.
+
+  Run from the repository root as:
+
+    python -m benchmarks.imports 5 1.0
+"""
+
+import os
+import sys
+import subprocess
+
+
+# The imported statement, as the update service does
+STATEMENT = "from models import ss"
+
+# The directories of the timed packages, from the
+# repository root, as the root package and the copy
+# deployed with the update service
+PACKAGES = (".", os.path.join("app", "services", "update-countries"))
+
+# The stacks loaded only by the plotting, the
+# window search and resampling, the screening,
+# or the first compiled simulation
+FORBIDDEN = ("bokeh", "IPython", "pandas", "PyAstronomy", "scipy.signal", "scipy.stats", "numba")
+
+# The script run on a fresh interpreter, printing
+# the import time and the loaded forbidden stacks
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(m for m in {forbidden!r} if m in sys.modules))
+"""
+
+
+def run(repeat=5, statement=STATEMENT, package="."):
+  """
+    The function that times the import on fresh interpreters,
+    so the modules are not cached by a previous import.
+
+    :param int repeat: The number of timed imports, the best one is kept.
+    :param string statement: The timed import statement. Default is :code:`STATEMENT`.
+    :param string package: The directory of the imported package, from the repository root. Default is the root one.
+
+    :return: The best import time and the forbidden stacks loaded.
+    :rtype: dict
+  """
+  root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  root = os.path.normpath(os.path.join(root, package))
+  env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+    [root] + [p for p in [os.environ.get("PYTHONPATH")] if p]))
+  script = SCRIPT.format(statement=statement, forbidden=FORBIDDEN)
+  best, loaded = float("inf"), []
+  for _ in range(repeat):
+    output = subprocess.run([sys.executable, "-c", script],
+      env=env, capture_output=True, text=True, check=True).stdout.split("\n")
+    best = min(best, float(output[0]))
+    loaded = [m for m in output[1].split(",") if m]
+  return dict(time=best, loaded=loaded)
+
+
+if __name__ == "__main__":
+  repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+  budget = float(sys.argv[2]) if len(sys.argv) > 2 else None
+  failures = []
+  for package in PACKAGES:
+    summary = run(repeat, package=package)
+    print("{} ({}): {:8.1f} ms".format(STATEMENT, package, 1e3 * summary["time"]))
+    print("  loaded optional stacks: {}".format(", ".join(summary["loaded"]) or "none"))
+    if summary["loaded"]:
+      failures.append("The fitting import of {} loads {}!".format(
+        package, ", ".join(summary["loaded"])))
+    if budget is not None and summary["time"] > budget:
+      failures.append("The fitting import of {} is over the {} s budget!".format(
+        package, budget))
+  if failures:
+    sys.exit("\n".join(failures))
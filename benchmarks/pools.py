@@ -0,0 +1,74 @@
+"""
+  Startup overhead of the search worker pools, comparing a new
+  pool started and terminated for every search, as with
+  :code:`workers=-1`, against the persistent pool reused by all
+  the searches of a backfill, with one search per fitted day.
+
+  Run from the repository root as:
+
+    python -m benchmarks.pools 30 fork
+    python -m benchmarks.pools 30 spawn
+"""
+
+import os
+import sys
+import time
+import multiprocessing
+
+
+def _task(k):
+  # The workers import the fitting stack, as the
+  # spawned ones must to unpickle the objective
+  import models.stochastic_search
+  return os.getpid()
+
+
+def run(fits=30, method=None, processes=None):
+  """
+    The function that times the worker pools of the searches of
+    a backfill, with a single task batch for each search.
+
+    :param int fits: The number of searches of the backfill.
+    :param string method: The process start method, as :code:`"fork"` or :code:`"spawn"`. Default is the platform one.
+    :param int processes: The number of worker processes. Default is the number of cores.
+
+    :return: The total time of the new pools and of the persistent one, and the saved overhead per search and per backfill.
+    :rtype: dict
+  """
+  # The fitting process has the stack imported, so
+  # only the spawned workers import it again
+  import models.stochastic_search
+  context = multiprocessing.get_context(method)
+  processes = processes or os.cpu_count() or 1
+  tasks = range(4 * processes)
+  # A new pool for each search
+  start = time.perf_counter()
+  for _ in range(fits):
+    with context.Pool(processes) as pool:
+      pool.map(_task, tasks)
+  fresh = time.perf_counter() - start
+  # The same pool for all the searches,
+  # started once in the backfill
+  start = time.perf_counter()
+  with context.Pool(processes) as pool:
+    for _ in range(fits):
+      pool.map(_task, tasks)
+  persistent = time.perf_counter() - start
+  return dict(fresh=fresh, persistent=persistent,
+    saved_per_fit=(fresh - persistent) / fits,
+    saved_per_backfill=fresh - persistent)
+
+
+if __name__ == "__main__":
+  fits = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+  method = sys.argv[2] if len(sys.argv) > 2 else None
+  # The workers find the task by its module name,
+  # also when this module runs as the main one
+  from benchmarks import pools
+  summary = pools.run(fits, method)
+  print("{} searches, {} start method".format(
+    fits, method or multiprocessing.get_start_method()))
+  print("  new pool per search : {:8.3f} s".format(summary["fresh"]))
+  print("  persistent pool     : {:8.3f} s".format(summary["persistent"]))
+  print("  saved per search    : {:8.1f} ms".format(1e3 * summary["saved_per_fit"]))
+  print("  saved per backfill  : {:8.3f} s".format(summary["saved_per_backfill"]))
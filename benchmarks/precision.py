@@ -0,0 +1,81 @@
+"""
+  Accuracy and speed tradeoff of the precision policies of
+  the discrete simulators and cost functions, on the COVID
+  country datasets.
+
+  Run from the repository root as:
+
+    python -m benchmarks.precision BR IT CN DE
+"""
+
+import sys
+import time
+import numpy as np
+
+from models import ss
+from . import datasets
+
+
+POLICIES = ["float128", "float64", "compensated"]
+
+
+def run(S, I, R, t, N, candidates=300, repeat=3, seed=0):
+  """
+    The function that scores the same population of candidate
+    parameters with each precision policy, using the float128
+    policy as the accuracy reference.
+
+    :param array S: The suceptible data.
+    :param array I: The infected data.
+    :param array R: The recovered data.
+    :param array t: The time respective to each sample.
+    :param int N: The population size.
+    :param int candidates: The number of candidate parameters scored.
+    :param int repeat: The number of timed repetitions, the best one is kept.
+    :param int seed: The random generator seed of the candidates.
+
+    :return: For each policy, the scalar and batched costs timing and the maximum relative cost error.
+    :rtype: dict
+  """
+  rng = np.random.default_rng(seed)
+  pars = np.column_stack([
+    rng.uniform(0.8, 15.0, candidates),
+    rng.uniform(5.0, 40.0, candidates),
+    rng.uniform(0.001, 0.05, candidates)])
+  dataset = [S, I, R]
+  y0 = [S[0], I[0], R[0]]
+  w = [1/np.mean(S), 1/np.mean(I), 1/np.mean(R)]
+  summary, reference = dict(), None
+  for policy in POLICIES:
+    model = ss.SIR(pop=N, focus=["S", "I", "R"], precision=policy, verbose=False)
+    model._search_pop = True
+    # Scoring each candidate on its own
+    scalar_time = np.inf
+    for _ in range(repeat):
+      start = time.perf_counter()
+      costs = np.array([model.cost_function(p, dataset, y0, t, w) for p in pars])
+      scalar_time = min(scalar_time, time.perf_counter() - start)
+    # Scoring the whole population at once
+    batch_time = np.inf
+    for _ in range(repeat):
+      start = time.perf_counter()
+      model.cost_function(pars, dataset, y0, t, w)
+      batch_time = min(batch_time, time.perf_counter() - start)
+    costs = costs.astype(np.longdouble)
+    if reference is None:
+      reference = costs
+    finite = np.isfinite(reference) & np.isfinite(costs)
+    error = np.max(np.abs(costs[finite] - reference[finite]) / np.abs(reference[finite]))
+    summary[policy] = dict(scalar=scalar_time, batch=batch_time, error=float(error))
+  return summary
+
+
+if __name__ == '__main__':
+  countries = sys.argv[1:] or datasets.COUNTRY_LIST
+  print("{:8}{:14}{:>12}{:>12}{:>14}".format(
+    "country", "precision", "scalar (s)", "batch (s)", "max rel err"))
+  for country in countries:
+    S, I, R, t, N = datasets.covid_country(country)
+    for policy, result in run(S, I, R, t, N).items():
+      print("{:8}{:14}{:12.4f}{:12.4f}{:14.3e}".format(
+        country, policy, result["scalar"], result["batch"], result["error"]))
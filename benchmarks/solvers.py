@@ -0,0 +1,87 @@
+"""
+  Speed and accuracy of the ODE solvers of the continuous
+  simulation, for each compartment model, against a tight
+  tolerance reference integration, to choose the cheapest
+  accurate solver for the production fitting.
+
+  Run from the repository root as:
+
+    python -m benchmarks.solvers 365 20
+"""
+
+import sys
+import time
+import numpy as np
+
+from models import ss
+from models import solvers as sv
+
+
+# The models, with their focus, parameters and
+# initial values as proportions of the population
+MODELS = {
+  "SIR": (["S", "I", "R"], [2.5, 12.0], [0.999, 0.001, 0.0]),
+  "SIRD": (["S", "I", "R", "D"], [2.5, 12.0, 0.01], [0.999, 0.001, 0.0, 0.0]),
+  "SEIR": (["S", "E", "I", "R"], [2.5, 12.0, 0.2], [0.998, 0.001, 0.001, 0.0]),
+}
+
+# The compared solvers, with the fixed-step ones
+# and odeint, as the continuous simulation runs
+SOLVERS = {
+  "odeint": None,
+  "LSODA": sv.Solver("LSODA"),
+  "Radau": sv.Solver("Radau"),
+  "BDF": sv.Solver("BDF"),
+  "RK45": sv.Solver("RK45"),
+  "DOP853": sv.Solver("DOP853"),
+  "RK4": sv.Solver("RK4"),
+  "RK4x4": sv.Solver("RK4", substeps=4),
+}
+
+# The reference integration
+REFERENCE = sv.Solver("DOP853", rtol=1e-12, atol=1e-9)
+
+
+def run(days=365, repeat=20, N=1e7):
+  """
+    The function that times the simulation of each model with
+    each solver, and measures its error against the reference.
+
+    :param int days: The number of simulated days.
+    :param int repeat: The number of timed repetitions, the best one is kept.
+    :param float N: The population size.
+
+    :return: For each model and solver, the best simulation time and the maximum error, as a proportion of the population.
+    :rtype: dict
+  """
+  t = np.arange(days, dtype=np.float64)
+  summary = dict()
+  for name, (focus, theta, proportions) in MODELS.items():
+    y0 = [p * N for p in proportions]
+    summary[name] = dict()
+    reference = np.array(ss.SIR(pop=N, focus=focus, simulation="ivp_continuous",
+      solver=REFERENCE, verbose=False).simulate(y0, t, theta))
+    for label, solver in SOLVERS.items():
+      simulation = "continuous" if solver is None else "ivp_continuous"
+      model = ss.SIR(pop=N, focus=focus, simulation=simulation, solver=solver, verbose=False)
+      # Warm the compiled kernels
+      result = np.array(model.simulate(y0, t, theta))
+      best = np.inf
+      for _ in range(repeat):
+        start = time.perf_counter()
+        model.simulate(y0, t, theta)
+        best = min(best, time.perf_counter() - start)
+      summary[name][label] = dict(
+        time=best, error=np.max(np.abs(result - reference)) / N)
+  return summary
+
+
+if __name__ == "__main__":
+  days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+  repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+  summary = run(days, repeat)
+  for name, solvers in summary.items():
+    print("{} over {} days".format(name, days))
+    for label, result in solvers.items():
+      print("  {:8s}: {:8.3f} ms   max error {:.2e}".format(
+        label, 1e3 * result["time"], result["error"]))
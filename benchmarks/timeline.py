@@ -0,0 +1,116 @@
+"""
+  Speed of the timeline normalization against the former
+  per-column pandas pipeline, on synthetic multi-year and
+  multi-country corona-api timelines.
+
+  Run from the repository root as:
+
+    python -m benchmarks.timeline 50 1500
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from ingestion import timeline as tl
+
+
+COLUMNS = ["confirmed", "deaths", "recovered", "active",
+  "new_confirmed", "new_deaths", "new_recovered"]
+
+
+def synthetic_timeline(days, missing=0.1, duplicated=0.02, seed=0):
+  """
+    The function that builds a synthetic corona-api timeline,
+    in reverse date order as the API sends it, with missing
+    and duplicated days.
+
+    :param int days: The number of days of the timeline.
+    :param float missing: The fraction of missing days.
+    :param float duplicated: The fraction of duplicated days.
+    :param int seed: The random generator seed.
+
+    :return: The timeline records.
+    :rtype: list
+  """
+  rng = np.random.default_rng(seed)
+  first = datetime(2020, 1, 22)
+  keep = rng.random(days) >= missing
+  keep[0] = keep[-1] = True
+  index = np.flatnonzero(keep)
+  index = np.sort(np.concatenate(
+    [index, rng.choice(index, int(duplicated * len(index)))]))
+  values = np.cumsum(rng.integers(0, 500, (days, len(COLUMNS))), axis=0)
+  records = []
+  for k in index:
+    record = {c: int(v) for c, v in zip(COLUMNS, values[k])}
+    record["date"] = (first + timedelta(days=int(k))).strftime("%Y-%m-%d")
+    record["updated_at"] = (first + timedelta(days=int(k))).isoformat() + ".000Z"
+    records.append(record)
+  records[-1]["is_in_progress"] = True
+  return records[::-1]
+
+
+def legacy(timeline):
+  """
+    The former normalization, as it was repeated in each
+    entry point of the ingestion.
+  """
+  df = pd.DataFrame(timeline)
+  df = df.sort_values('date').reset_index()
+  df['date'] = [datetime.fromisoformat(f) for f in df['date']]
+  df = df.drop_duplicates(subset='date', keep = 'last')
+  first_date = df['date'].iloc[0]
+  size_days = (df['date'].iloc[-1] - df['date'].iloc[0]).days
+  date_vec = [first_date + timedelta(days=k) for k in range(size_days)]
+  new_df = pd.DataFrame(date_vec, columns=['date'])
+  new_df = pd.merge(new_df, df, how='left', on='date')
+  new_df = new_df.drop(columns= ['index',  'updated_at', 'is_in_progress'])
+  for col in new_df.columns[1:]:
+    new_df[col] = new_df[col].interpolate(method='polynomial', order=1)
+  return new_df.dropna()
+
+
+def run(countries=50, days=1500, repeat=3):
+  """
+    The function that times both normalizations over the
+    timelines of several countries, and checks that they
+    agree.
+
+    :param int countries: The number of country timelines.
+    :param int days: The number of days of each timeline.
+    :param int repeat: The number of timed repetitions, the best one is kept.
+
+    :return: The best time of each normalization and the maximum absolute difference.
+    :rtype: dict
+  """
+  timelines = [synthetic_timeline(days, seed=k) for k in range(countries)]
+  summary = dict()
+  for name, function in [("legacy", legacy), ("normalize", tl.normalize)]:
+    best = np.inf
+    for _ in range(repeat):
+      start = time.perf_counter()
+      frames = [function(timeline) for timeline in timelines]
+      best = min(best, time.perf_counter() - start)
+    summary[name] = dict(time=best, frames=frames)
+  difference = max(
+    np.max(np.abs(a[COLUMNS].to_numpy() - b[COLUMNS].to_numpy()))
+    for a, b in zip(summary["legacy"]["frames"], summary["normalize"]["frames"]))
+  return dict(
+    legacy=summary["legacy"]["time"],
+    normalize=summary["normalize"]["time"],
+    difference=difference)
+
+
+if __name__ == "__main__":
+  countries = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+  days = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+  summary = run(countries, days)
+  print("{} countries x {} days".format(countries, days))
+  print("  legacy    : {:8.3f} s".format(summary["legacy"]))
+  print("  normalize : {:8.3f} s ({:.1f}x)".format(
+    summary["normalize"], summary["legacy"] / summary["normalize"]))
+  print("  max difference : {:.3e}".format(summary["difference"]))
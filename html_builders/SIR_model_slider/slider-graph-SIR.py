@@ -1,4 +1,4 @@
-import requests
+import sys
 import pandas as pd
 import numpy as np
 from bokeh.models import Div
@@ -7,39 +7,22 @@ from bokeh.io       import output_notebook
 
 output_notebook()
 
-covid_api = 'https://corona-api.com/countries/'
+sys.path.append("../../")
+from ingestion import client as ic
+from ingestion import timeline as tl
+
 rest_countries = 'https://restcountries.eu/rest/v2/alpha/'
 country = 'IT' # Alpha-2 ISO3166
 
-data_json =  requests.get(covid_api + country).json()
-country = requests.get(covid_api + country).json()
-
-Nr = country['data']['population']
-
-print(country['data']['name'])
-
-
-from datetime import datetime
-
-df = pd.DataFrame(data_json['data']['timeline'])
-df = df.sort_values('date').reset_index()
+data_json = ic.country(country)
 
-from datetime import datetime, timedelta
-df['date'] = [datetime.fromisoformat(f) for f in df['date']]
-df = df.drop_duplicates(subset='date', keep = 'last')
+Nr = data_json['data']['population']
 
-# Criando o vetor de tempo
-first_date = df['date'].iloc[0]
-size_days = (df['date'].iloc[-1] - df['date'].iloc[0]).days
-date_vec = [first_date + timedelta(days=k) for k in range(size_days)]
+print(data_json['data']['name'])
 
-new_df = pd.DataFrame(date_vec, columns=['date'])
-new_df = pd.merge(new_df, df, how='left', on= 'date')
-new_df = new_df.drop(columns= ['index',  'updated_at', 'is_in_progress'])
 
-for col in new_df.columns[1:]:
-    new_df[col] = new_df[col].interpolate(method='polynomial', order=1)
-df = new_df.dropna()
+# Criando o dataframe diario
+df = tl.normalize(data_json['data']['timeline'])
 
 Ir = df['active'].to_numpy()
 Rr = df['recovered'].to_numpy()
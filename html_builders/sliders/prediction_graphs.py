@@ -11,7 +11,7 @@ HEIGHT = 250
 WIDTH = 550
 # ===================================
 
-import requests
+import sys
 import pandas as pd
 import numpy as np
 import pickle
@@ -20,6 +20,10 @@ from datetime import datetime, timedelta
 import pandas_gbq
 from google.oauth2 import service_account
 
+sys.path.append("../../")
+from ingestion import client as ic
+from ingestion import timeline as tl
+
 from bokeh.layouts import column, row
 from bokeh.models import CustomJS, Slider
 from bokeh.plotting import ColumnDataSource, figure, output_file, show
@@ -46,32 +50,11 @@ credentials = service_account.Credentials.from_service_account_file(
 
 def get_corona_api_data(Country_A2):
     # Import Data
-    covid_api = 'https://corona-api.com/countries/'
-    data_json =  requests.get(covid_api + Country_A2).json()
-    country = requests.get(covid_api + Country_A2).json()
-    N = country['data']['population']
+    data_json = ic.country(Country_A2)
+    N = data_json['data']['population']
 
     # Organize Data
-    df = pd.DataFrame(data_json['data']['timeline'])
-    df = df.sort_values('date').reset_index()
-    df['date'] = [datetime.fromisoformat(f) for f in df['date']]
-    df['date'] = df['date'].dt.tz_localize(None)
-    df = df.drop_duplicates(subset='date', keep = 'last')
-
-    # Date Vector
-    first_date = df['date'].iloc[0]
-    size_days = (df['date'].iloc[-1] - df['date'].iloc[0]).days
-    date_vec = [first_date + timedelta(days=k) for k in range(size_days)]
-
-    new_df = pd.DataFrame(date_vec, columns=['date'])
-    new_df = pd.merge(new_df, df, how='left', on= 'date')
-    new_df = new_df.drop(columns= ['index',  'updated_at', 'is_in_progress'])
-
-    for col in new_df.columns[1:]:
-        new_df[col] = new_df[col].interpolate(method='polynomial', order=1)
-    df = new_df.dropna()
-
-    df.loc['date'] = df['date'].dt.tz_localize(None)
+    df = tl.normalize(data_json['data']['timeline'], naive=True)
     first_date = df['date'].iloc[0]
 
     I = df['active'].to_numpy()
@@ -0,0 +1,10 @@
+"""
+  
+  :copyright: 2010 Marcelo Lima
+  :license: BSD-3-Clause
+"""
+
+from . import client as ic
+from . import timeline as tl
+from . import warehouse as wh
+from . import predictions as ps
@@ -0,0 +1,216 @@
+"""
+  The shared client of the corona-api ingestion. All the
+  requests go through one pooled session, the countries are
+  fetched concurrently, and each response is kept in an
+  on-disk cache keyed by its ETag and fetch date, so the
+  same timeline is downloaded at most once per day.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+
+from datetime           import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Default client configurations
+COVID_API   = os.environ.get("COVID_API_URL", "https://corona-api.com/countries/")
+CACHE_DIR   = os.environ.get("COVID_API_CACHE",
+  os.path.join(tempfile.gettempdir(), "epidemicModels", "corona-api"))
+MAX_WORKERS = 8   # Concurrent requests, also the pool size
+TIMEOUT     = 30  # Seconds to wait for each response
+RETRIES     = 3   # Retries on connection and server errors
+
+
+class Client:
+  """
+    The pooled HTTP client of the corona-api. Each response
+    is stored in the cache directory with its ETag, its
+    Last-Modified header and the UTC date it was fetched.
+    A response fetched on the same day is served from the
+    cache, and an older one is revalidated with a conditional
+    request, that costs no body download when unchanged.
+  """
+
+  def __init__(self,
+      base_url=COVID_API,
+      cache_dir=CACHE_DIR,
+      max_workers=MAX_WORKERS,
+      timeout=TIMEOUT,
+      retries=RETRIES,
+      same_day=True):
+    """
+      :param string base_url: The URL of the countries endpoint.
+      :param string cache_dir: The cache directory, or :code:`None` to disable the cache.
+      :param int max_workers: The number of concurrent requests and pooled connections.
+      :param float timeout: The seconds to wait for each response.
+      :param int retries: The number of retries on connection and server errors.
+      :param bool same_day: If responses fetched on the same day are served without revalidation.
+    """
+    self.base_url = base_url
+    self.cache_dir = cache_dir
+    self.max_workers = max_workers
+    self.timeout = timeout
+    self.same_day = same_day
+    # One session shares the keep-alive
+    # connections across every request
+    self.session = requests.Session()
+    adapter = HTTPAdapter(
+      pool_connections=max_workers,
+      pool_maxsize=max_workers,
+      max_retries=Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504)))
+    self.session.mount("http://", adapter)
+    self.session.mount("https://", adapter)
+    self._lock = threading.Lock()
+    if cache_dir is not None:
+      os.makedirs(cache_dir, exist_ok=True)
+
+  def _cache_path(self, url):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(self.cache_dir, key + ".json")
+
+  def _read_cache(self, url):
+    if self.cache_dir is None:
+      return None
+    try:
+      with open(self._cache_path(url), "r") as f:
+        return json.load(f)
+    except (OSError, ValueError):
+      return None
+
+  def _write_cache(self, url, entry):
+    if self.cache_dir is None:
+      return
+    # Write to a temporary file and rename, so a
+    # concurrent reader never sees a partial entry
+    path = self._cache_path(url)
+    with self._lock:
+      tmp_path = "{}.{}.tmp".format(path, threading.get_ident())
+      with open(tmp_path, "w") as f:
+        json.dump(entry, f)
+      os.replace(tmp_path, path)
+
+  def get(self, url):
+    """
+      The method that fetches the JSON content of the URL,
+      using the cached response whenever it is still valid.
+
+      :param string url: The URL to be fetched.
+
+      :return: The JSON content of the response.
+      :rtype: dict
+    """
+    today = datetime.now(timezone.utc).date().isoformat()
+    entry = self._read_cache(url)
+    if entry is not None and self.same_day and entry["date"] == today:
+      return entry["body"]
+    # Revalidate the cached response with
+    # a conditional request
+    headers = dict()
+    if entry is not None:
+      if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+      if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    response = self.session.get(url, headers=headers, timeout=self.timeout)
+    if response.status_code == 304 and entry is not None:
+      entry["date"] = today
+    else:
+      response.raise_for_status()
+      entry = dict(
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        date=today,
+        body=response.json())
+    self._write_cache(url, entry)
+    return entry["body"]
+
+  def country(self, country):
+    """
+      The method that fetches the corona-api data of a country.
+
+      :param string country: The country Alpha-2 ISO3166 code.
+
+      :return: The JSON content of the country, with the population and timeline.
+      :rtype: dict
+    """
+    return self.get(self.base_url + country)
+
+  def countries(self, countries):
+    """
+      The method that fetches the corona-api data of several
+      countries concurrently, over the pooled connections. A
+      country that fails is reported and left out, without
+      dropping the data of the others.
+
+      :param list countries: The countries Alpha-2 ISO3166 codes.
+
+      :return: The JSON content of each fetched country, by country code.
+      :rtype: dict
+    """
+    results = dict()
+    with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+      futures = [(c, pool.submit(self.country, c)) for c in countries]
+      for country, future in futures:
+        try:
+          results[country] = future.result()
+        except (OSError, ValueError) as error:
+          # The requests errors are OSError, and
+          # the invalid JSON bodies ValueError
+          print("Country {} failed: {}".format(country, error))
+    return results
+
+
+_DEFAULT = None
+
+
+def default_client():
+  """
+    The function that returns the client shared by the
+    whole process, created on the first call.
+
+    :return: The shared corona-api client.
+    :rtype: Client
+  """
+  global _DEFAULT
+  if _DEFAULT is None:
+    _DEFAULT = Client()
+  return _DEFAULT
+
+
+def country(country):
+  """
+    The function that fetches the corona-api data of a
+    country with the shared client.
+
+    :param string country: The country Alpha-2 ISO3166 code.
+
+    :return: The JSON content of the country.
+    :rtype: dict
+  """
+  return default_client().country(country)
+
+
+def countries(countries):
+  """
+    The function that fetches the corona-api data of several
+    countries concurrently with the shared client, leaving
+    out the countries that fail.
+
+    :param list countries: The countries Alpha-2 ISO3166 codes.
+
+    :return: The JSON content of each fetched country, by country code.
+    :rtype: dict
+  """
+  return default_client().countries(countries)
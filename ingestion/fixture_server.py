@@ -0,0 +1,95 @@
+"""
+  A local fixture server of the corona-api, to run the
+  ingestion without the network. It serves the JSON files
+  of a directory, one :code:`<country>.json` for each
+  country, with ETag and Last-Modified headers, answering
+  the conditional requests as the real API does. It may also
+  fail the first requests of each country with server errors,
+  to exercise the client retries.
+
+  Run it with :code:`python -m ingestion.fixture_server <dir>`
+  and point the client at it with the :code:`COVID_API_URL`
+  environment variable, or the :code:`base_url` parameter.
+"""
+
+import os
+import sys
+import hashlib
+import threading
+
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+def _handler(fixture_dir, prefix="/countries/", failures=0):
+
+  class FixtureHandler(BaseHTTPRequestHandler):
+
+    # The countries of the requests that downloaded a body,
+    # and of the failed ones, shared by every handler of the server
+    served = []
+    failed = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+      country = self.path[len(prefix):] if self.path.startswith(prefix) else ""
+      path = os.path.join(fixture_dir, os.path.basename(country) + ".json")
+      if not country or not os.path.isfile(path):
+        self.send_error(404)
+        return
+      with self.lock:
+        fail = self.failed.count(country) < failures
+        if fail:
+          self.failed.append(country)
+      if fail:
+        self.send_error(503)
+        return
+      with open(path, "rb") as f:
+        body = f.read()
+      etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+      if self.headers.get("If-None-Match") == etag:
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        return
+      self.served.append(country)
+      self.send_response(200)
+      self.send_header("Content-Type", "application/json")
+      self.send_header("Content-Length", str(len(body)))
+      self.send_header("ETag", etag)
+      self.send_header("Last-Modified", formatdate(os.path.getmtime(path), usegmt=True))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, *args):
+      pass
+
+  return FixtureHandler
+
+
+def serve(fixture_dir, host="127.0.0.1", port=0, failures=0):
+  """
+    The function that starts the fixture server in a
+    background thread.
+
+    :param string fixture_dir: The directory with the :code:`<country>.json` files.
+    :param string host: The host address. Default is :code:`"127.0.0.1"`.
+    :param int port: The port, or :code:`0` to pick a free one.
+    :param int failures: The number of first requests of each country answered with a server error. Default is :code:`0`.
+
+    :return: The running server and the base URL of its countries endpoint.
+    :rtype: tuple
+  """
+  server = ThreadingHTTPServer((host, port), _handler(fixture_dir, failures=failures))
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  url = "http://{}:{}/countries/".format(*server.server_address[:2])
+  return server, url
+
+
+if __name__ == "__main__":
+  fixture_dir = sys.argv[1] if len(sys.argv) > 1 else "."
+  port = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+  server = ThreadingHTTPServer(("127.0.0.1", port), _handler(fixture_dir))
+  print("Serving {} at http://127.0.0.1:{}/countries/".format(fixture_dir, port))
+  server.serve_forever()
@@ -0,0 +1,174 @@
+"""
+  The warehouse storage of the update jobs. The writer buffers
+  the rows of every table across all the countries, and flushes
+  them with a single columnar write per table, followed by a
+  single commit of the replaced tables, as the job logs. The
+  backends are BigQuery, through :code:`pandas_gbq`, and the
+  local SQLite and Parquet stand-ins, to run the jobs offline.
+"""
+
+import os
+import glob
+import sqlite3
+
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class BigQueryBackend:
+  """
+    The BigQuery backend, through :code:`pandas_gbq`.
+  """
+
+  def __init__(self, project_id, credentials=None):
+    import pandas_gbq
+    self._gbq = pandas_gbq
+    self.project_id = project_id
+    self.credentials = credentials
+
+  def read(self, table):
+    return self._gbq.read_gbq(
+      "SELECT * FROM {}".format(table), project_id=self.project_id, credentials=self.credentials)
+
+  def write(self, table, df, if_exists="append"):
+    self._gbq.to_gbq(
+      df, table, project_id=self.project_id, credentials=self.credentials, if_exists=if_exists)
+
+
+class SQLiteBackend:
+  """
+    The local backend with every table in one SQLite file, or
+    in memory with the :code:`:memory:` path.
+  """
+
+  def __init__(self, path):
+    self.path = path
+    # One connection for the backend, so an
+    # in-memory database lives as long as it
+    self._connection = sqlite3.connect(path)
+
+  def read(self, table):
+    return pd.read_sql('SELECT * FROM "{}"'.format(table), self._connection)
+
+  def write(self, table, df, if_exists="append"):
+    with self._connection:
+      df.to_sql(table, self._connection, if_exists=if_exists, index=False)
+
+
+class ParquetBackend:
+  """
+    The local backend with each table as a directory of
+    Parquet files, one file for each flushed batch.
+  """
+
+  def __init__(self, path):
+    self.path = path
+
+  def _files(self, table):
+    return sorted(glob.glob(os.path.join(self.path, table, "*.parquet")))
+
+  def read(self, table):
+    files = self._files(table)
+    if len(files) == 0:
+      raise LookupError("Table {} does not exist".format(table))
+    return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+
+  def write(self, table, df, if_exists="append"):
+    directory = os.path.join(self.path, table)
+    os.makedirs(directory, exist_ok=True)
+    files = self._files(table)
+    if if_exists == "replace":
+      for f in files:
+        os.remove(f)
+      files = []
+    df.to_parquet(os.path.join(directory, "part-{:05d}.parquet".format(len(files))), index=False)
+
+
+def connect(url, credentials=None):
+  """
+    The function that creates the backend of a warehouse URL, as
+    :code:`bigquery://<project>`, :code:`sqlite://<file>` or
+    :code:`parquet://<directory>`.
+
+    :param string url: The warehouse URL.
+    :param Credentials credentials: The BigQuery credentials. Default is :code:`None`.
+
+    :return: The warehouse backend.
+    :rtype: object
+  """
+  scheme, _, path = url.partition("://")
+  if scheme == "bigquery":
+    return BigQueryBackend(path, credentials)
+  elif scheme == "sqlite":
+    return SQLiteBackend(path)
+  elif scheme == "parquet":
+    return ParquetBackend(path)
+  raise ValueError("Unknown warehouse URL {}".format(url))
+
+
+class Writer:
+  """
+    The buffered writer of a warehouse backend. The appended
+    rows of each table are kept in memory and written at once
+    on :code:`flush`, and only then the replaced tables are
+    committed, so a failed upload never advances a log.
+  """
+
+  def __init__(self, backend):
+    self.backend = backend
+    self._appends = OrderedDict()
+    self._replaces = OrderedDict()
+
+  def read(self, table):
+    """
+      The method that reads a whole table of the backend.
+
+      :param string table: The table id.
+
+      :return: The table contents.
+      :rtype: DataFrame
+    """
+    return self.backend.read(table)
+
+  def append(self, table, df):
+    """
+      The method that buffers rows to be appended to a table.
+
+      :param string table: The table id.
+      :param DataFrame df: The rows to append.
+    """
+    if df.shape[0] > 0:
+      self._appends.setdefault(table, []).append(df)
+
+  def replace(self, table, df):
+    """
+      The method that sets the contents of a table to be
+      committed after the appends, the last one prevailing.
+
+      :param string table: The table id.
+      :param DataFrame df: The new table contents.
+    """
+    self._replaces[table] = df
+
+  def flush(self):
+    """
+      The method that writes the buffered appends, with one
+      columnar batch for each table, and then commits the
+      replaced tables. The buffers are kept if a write fails.
+    """
+    while self._appends:
+      table, frames = next(iter(self._appends.items()))
+      self.backend.write(table, pd.concat(frames, ignore_index=True), if_exists="append")
+      del self._appends[table]
+    while self._replaces:
+      table, df = next(iter(self._replaces.items()))
+      self.backend.write(table, df, if_exists="replace")
+      del self._replaces[table]
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    if exc_type is None:
+      self.flush()
@@ -4,4 +4,12 @@
   :license: BSD-3-Clause
 """
 
-from . import stochastic_search as ss
\ No newline at end of file
+from . import stochastic_search as ss
+from . import peaks as pk
+from . import windows as wd
+from . import resampling as rs
+from . import trace as tr
+from . import solvers as sv
+from . import analytic as an
+from . import memo as mm
+from . import workers as wk
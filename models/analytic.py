@@ -0,0 +1,285 @@
+"""
+  The semi-analytic trajectory of the continuous SIR model,
+  used to screen the search candidates cheaply. In the SIR
+  model the suceptible is a closed function of the recovered,
+
+  .. math:: S(R) = S_0 e^{-k (R - R_0)}, \\quad k = \\beta / (r N),
+
+  so the infected is :math:`I(R) = C - R - S(R)`, with the
+  conserved :math:`C = S_0 + I_0 + R_0`, and the time to reach
+  each recovered value is the 1-D quadrature
+
+  .. math:: t(R) = D \\int_{R_0}^{R} \\frac{dR'}{I(R')}.
+
+  The D parameter only scales the time, so the quadrature
+  tables are computed once for a grid of the Ro and pop
+  parameters, and the trajectories of any candidate are
+  interpolated from them, without integrating the model.
+"""
+
+import numpy as np
+
+from scipy import integrate
+
+from . import specs as sp
+from . import trace as tr
+
+
+# The quadrature grid, as v = logit(u), where u is the
+# proportion of the recovered between R(0) and R(inf)
+QUADRATURE_POINTS = 512
+V_BOUNDS = (-27.0, 25.0)
+
+# The table grid sizes of the Ro and pop parameters
+RO_POINTS = 64
+POP_POINTS = 16
+
+# The smallest growth rate of the table scaling
+GROWTH_FLOOR = 0.05
+
+# The candidates scored at once on the screening
+SCREEN_CHUNK = 1000
+
+
+def final_recovered(S0, I0, R0, k, iterations=40):
+  """
+    The function that finds the recovered value at the end of
+    the epidemy, where the infected vanishes. The infected, as
+    a function of the recovered, is concave, so the Newton
+    steps from the conserved total converge monotonically.
+
+    :param array S0: The initial suceptible values.
+    :param array I0: The initial infected values.
+    :param array R0: The initial recovered values.
+    :param array k: The :code:`Beta / (r N)` values.
+    :param int iterations: The Newton iterations. Default is :code:`40`.
+
+    :return: The final recovered values.
+    :rtype: array
+  """
+  C = S0 + I0 + R0
+  R = np.array(C, dtype=np.float64)
+  for _ in range(iterations):
+    S = S0 * np.exp(-k * (R - R0))
+    R = R - (C - R - S) / (k * S - 1)
+  return np.maximum(R, R0)
+
+
+def quadrature(S0, I0, R0, k, points=QUADRATURE_POINTS):
+  """
+    The function that computes the time, in units of D, to
+    reach each recovered proportion, for several initial values
+    and :code:`k` at once.
+
+    :param array S0: The initial suceptible values.
+    :param array I0: The initial infected values.
+    :param array R0: The initial recovered values.
+    :param array k: The :code:`Beta / (r N)` values.
+    :param int points: The number of quadrature points. Default is :code:`QUADRATURE_POINTS`.
+
+    :return: The recovered proportions grid, the times with shape :code:`(..., points)` and the final recovered values.
+    :rtype: tuple
+  """
+  S0, I0, R0, k = [np.asarray(x, dtype=np.float64)[..., None] for x in (S0, I0, R0, k)]
+  I0 = np.maximum(I0, np.finfo(np.float64).tiny)
+  R_inf = final_recovered(S0, I0, R0, k)
+  v = np.linspace(*V_BOUNDS, points)
+  u = 1 / (1 + np.exp(-v))
+  # The integrand by v, with the infected written
+  # around the final recovered, as I = d * (1 - k S(inf)
+  # (exp(k d) - 1) / (k d)) for d = R(inf) - R, so it is
+  # finite and precise at both ends
+  d = (R_inf - R0) / (1 + np.exp(v))
+  x = k * d
+  S_inf = S0 * np.exp(-k * (R_inf - R0))
+  ratio = np.where(x > 0, np.expm1(x) / np.where(x > 0, x, 1.0), 1.0)
+  h = u / np.maximum(1 - k * S_inf * ratio, np.finfo(np.float64).tiny)
+  tau = integrate.cumulative_trapezoid(h, v, axis=-1, initial=0)
+  return u, tau, R_inf[..., 0]
+
+
+def interp_rows(x, xp, fp):
+  """
+    The function that interpolates each row of the queries on
+    its own row of the increasing sample points, all the rows
+    at once, holding the end values outside the samples.
+
+    :param array x: The queries with shape :code:`(P, T)`.
+    :param array xp: The increasing sample points with shape :code:`(P, M)`.
+    :param array fp: The sample values, shared by the rows, with shape :code:`(M,)`.
+
+    :return: The interpolated values with shape :code:`(P, T)`.
+    :rtype: array
+  """
+  P, M = xp.shape
+  # Shift each row apart, so a single search
+  # over the flattened points finds them all
+  span = max(np.max(xp[:,-1] - xp[:,0]), np.max(x)) + 1.0
+  shift = (np.arange(P) * 2 * span)[:,None]
+  index = np.searchsorted((xp + shift).ravel(), (x + shift).ravel()).reshape(x.shape)
+  index = np.clip(index - np.arange(P)[:,None] * M, 1, M - 1)
+  rows = np.arange(P)[:,None]
+  x0, x1 = xp[rows, index - 1], xp[rows, index]
+  weight = np.clip((x - x0) / np.maximum(x1 - x0, np.finfo(np.float64).tiny), 0.0, 1.0)
+  return fp[index - 1] + weight * (fp[index] - fp[index - 1])
+
+
+def growth(k, S0):
+  """
+    The function that computes the initial growth rate of the
+    infected, in units of D, bounded away from zero.
+
+    :param array k: The :code:`Beta / (r N)` values.
+    :param array S0: The initial suceptible values.
+
+    :return: The absolute growth rates.
+    :rtype: array
+  """
+  return np.abs(k * S0 - 1) + GROWTH_FLOOR
+
+
+class SIRTable:
+  """
+    The quadrature tables of the SIR model over a grid of the
+    Ro and, optionally, pop parameters, for the initial values
+    of a dataset.
+  """
+
+  def __init__(self, N, initial, Ro_bounds, pop_bounds=None,
+      Ro_points=RO_POINTS,
+      pop_points=POP_POINTS,
+      points=QUADRATURE_POINTS):
+    """
+      :param float N: The population size.
+      :param array initial: The initial suceptible, infected and recovered values.
+      :param tuple Ro_bounds: The Ro parameter bounds.
+      :param tuple pop_bounds: The pop parameter bounds, or :code:`None` if it is not searched. Default is :code:`None`.
+      :param int Ro_points: The Ro grid size. Default is :code:`RO_POINTS`.
+      :param int pop_points: The pop grid size. Default is :code:`POP_POINTS`.
+      :param int points: The number of quadrature points. Default is :code:`QUADRATURE_POINTS`.
+    """
+    self.N = N
+    S0, I0 = initial[0], initial[1]
+    R0 = initial[2] if len(initial) > 2 else 0.0
+    self.Ro = np.linspace(min(Ro_bounds), max(Ro_bounds), Ro_points)
+    if pop_bounds is None:
+      self.pop = np.ones(1)
+    else:
+      self.pop = np.linspace(min(pop_bounds), max(pop_bounds), pop_points)
+    # The pop proportion scales the initial
+    # suceptible and the infection rate
+    pop, Ro = np.meshgrid(self.pop, self.Ro, indexing="ij")
+    self.u, tau, _ = quadrature(pop * S0, I0, R0, Ro / (pop * N), points)
+    # The times are kept scaled by the initial growth
+    # rate, so they interpolate smoothly along Ro
+    self.tau = tau * growth(Ro / (pop * N), pop * S0)[..., None]
+
+  def _interpolate(self, grid, values):
+    # The lower grid index and weight of each value
+    if len(grid) == 1:
+      return np.zeros(len(values), dtype=int), np.zeros(len(values))
+    index = np.clip(np.searchsorted(grid, values) - 1, 0, len(grid) - 2)
+    weight = np.clip((values - grid[index]) / (grid[index+1] - grid[index]), 0.0, 1.0)
+    return index, weight
+
+  def simulate_population(self, initial, time, thetas):
+    """
+      The function that interpolates the trajectories of a
+      population of parameter sets from the tables.
+
+      :param array initial: The initial values with shape :code:`(n,)` or :code:`(P, n)`, with the pop proportion already applied.
+      :param array time: The time points to simulate the model.
+      :param array thetas: The parameters matrix with shape :code:`(P, n_params)`.
+
+      :return: The simulated compartments with shape :code:`(P, n, T)`.
+      :rtype: array
+    """
+    thetas = np.atleast_2d(thetas)
+    P = thetas.shape[0]
+    initial = np.broadcast_to(np.asarray(initial, dtype=np.float64), (P, np.shape(initial)[-1]))
+    Ro, D = thetas[:,0], thetas[:,1]
+    pop = thetas[:,2] if thetas.shape[1] > 2 else np.ones(P)
+    S0, I0 = initial[:,0], initial[:,1]
+    R0 = initial[:,2] if initial.shape[1] > 2 else np.zeros(P)
+    k = Ro / (pop * self.N)
+    R_inf = final_recovered(S0, I0, R0, k)
+    # The bilinear interpolation of the tables
+    i, a = self._interpolate(self.pop, pop)
+    j, b = self._interpolate(self.Ro, Ro)
+    i1 = np.minimum(i + 1, len(self.pop) - 1)
+    tau = (
+      ((1 - a) * (1 - b))[:,None] * self.tau[i, j] +
+      ((1 - a) * b)[:,None] * self.tau[i, j + 1] +
+      (a * (1 - b))[:,None] * self.tau[i1, j] +
+      (a * b)[:,None] * self.tau[i1, j + 1])
+    tau /= growth(k, S0)[:,None]
+    # The recovered proportion at each time,
+    # scaled by the D parameter of each one
+    time = np.asarray(time, dtype=np.float64) - time[0]
+    u = interp_rows(time[None,:] / D[:,None], tau, self.u)
+    R = R0[:,None] + u * (R_inf - R0)[:,None]
+    S = S0[:,None] * np.exp(-k[:,None] * (R - R0[:,None]))
+    I = (S0 + I0 + R0)[:,None] - S - R
+    result = np.stack((S, I, R), axis=1)
+    return result[:, :initial.shape[1]]
+
+
+class AnalyticObjective(sp.Objective):
+  """
+    The objective that scores the candidates with the SIR
+    trajectories interpolated from the quadrature tables.
+  """
+
+  def __init__(self, objective, table):
+    """
+      :param Objective objective: The exact objective.
+      :param SIRTable table: The quadrature tables.
+    """
+    super().__init__(objective.spec, objective.N,
+      focus=objective.focus,
+      simulation="continuous",
+      precision="float64",
+      search_pop=objective._search_pop,
+      iter_error=tr.Trace(initial=10**14))
+    self.table = table
+
+  def simulate_population(self, initial, time, thetas):
+    return self.table.simulate_population(initial, time, thetas)
+
+
+def screen(objective, lower, upper, args, candidates=20000, population=None, seed=0):
+  """
+    The function that scores many candidates with the
+    semi-analytic SIR trajectories, and keeps the best ones
+    as the initial population of the exact search.
+
+    :param Objective objective: The exact objective, of the SIR model.
+    :param list lower: The parameters lower bounds.
+    :param list upper: The parameters upper bounds.
+    :param tuple args: The cost function parameters, as :code:`(dataset, initial, t, w)`.
+    :param int candidates: The number of screened candidates. Default is :code:`20000`.
+    :param int population: The number of kept candidates. Default is :code:`15` times the number of parameters.
+    :param int seed: The random generator seed of the candidates. Default is :code:`0`.
+
+    :return: The kept candidates, from the best one.
+    :rtype: array
+  """
+  if objective.spec.name != "SIR":
+    raise ValueError("The semi-analytic screening runs only on the SIR model!")
+  # The statistics stack is loaded only on the screening
+  from scipy.stats import qmc
+  lower, upper = np.asarray(lower, dtype=np.float64), np.asarray(upper, dtype=np.float64)
+  population = 15 * len(lower) if population is None else population
+  dataset, initial, t, w = args
+  table = SIRTable(objective.N, initial, (lower[0], upper[0]),
+    pop_bounds=(lower[-1], upper[-1]) if objective._search_pop else None)
+  analytic = AnalyticObjective(objective, table)
+  pars = qmc.scale(
+    qmc.LatinHypercube(d=len(lower), seed=seed).random(candidates),
+    np.minimum(lower, upper), np.maximum(lower, upper))
+  # Score in chunks, to bound the trajectories memory
+  costs = np.concatenate([
+    np.asarray(analytic.cost_function(chunk, dataset, initial, t, w))
+    for chunk in np.array_split(pars, max(candidates // SCREEN_CHUNK, 1))])
+  costs = np.where(np.isfinite(costs), costs, np.inf)
+  return pars[np.argsort(costs)[:population]]
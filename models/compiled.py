@@ -0,0 +1,115 @@
+"""
+  The numba compiled kernels of the compartment models, the
+  right-hand sides used by :code:`odeint` and the Euler kernels
+  used by the discrete simulation. It is imported by the first
+  :code:`kernels.get`, so numba is loaded, and the kernels
+  compiled or read from the disk cache, only when a compiled
+  simulation runs.
+"""
+
+import numba
+import numpy as np
+
+from .kernels import register, SIR_rates, SIRD_rates, SEIR_rates, NSIR_rates
+
+
+@numba.njit(cache=True)
+def SIR_rhs(y, t, rates, N):
+  Beta, r = rates[0], rates[1]
+  infection = Beta * y[0] * y[1] / N
+  ydot = np.empty(len(y))
+  ydot[0] = -infection
+  ydot[1] = infection - r * y[1]
+  if len(y) == 3:
+    ydot[2] = r * y[1]
+  return ydot
+
+
+@numba.njit(cache=True)
+def SIRD_rhs(y, t, rates, N):
+  Beta, r, mu = rates[0], rates[1], rates[2]
+  infection = Beta * y[0] * y[1] / N
+  ydot = np.empty(len(y))
+  ydot[0] = -infection
+  ydot[1] = infection - r * y[1] - mu * y[1]
+  if len(y) == 4:
+    ydot[2] = r * y[1]
+  ydot[-1] = mu * y[1]
+  return ydot
+
+
+@numba.njit(cache=True)
+def SEIR_rhs(y, t, rates, N):
+  Beta, r, sigma = rates[0], rates[1], rates[2]
+  infection = Beta * y[0] * y[2] / N
+  ydot = np.empty(4)
+  ydot[0] = -infection
+  ydot[1] = infection - sigma * y[1]
+  ydot[2] = sigma * y[1] - r * y[2]
+  ydot[3] = r * y[2]
+  return ydot
+
+
+@numba.njit(cache=True)
+def NSIR_rhs(y, t, rates, N):
+  beta, r, betan, alpha, rn = rates[0], rates[1], rates[2], rates[3], rates[4]
+  infection = y[0] * (alpha * y[1] + beta * y[2]) / N
+  ydot = np.empty(4)
+  ydot[0] = -infection
+  ydot[1] = infection - (r + betan) * y[1]
+  ydot[2] = betan * y[1] - rn * y[2]
+  ydot[3] = rn * y[2] + r * y[1]
+  return ydot
+
+
+# The Euler kernels integrate a population of
+# trajectories, with the initial values as a
+# (P, n) matrix and the rates as (P, k)
+@numba.njit(cache=True)
+def SIR_euler(y0, time, rates, N):
+  result = np.empty((y0.shape[0], y0.shape[1], len(time)))
+  for p in range(y0.shape[0]):
+    result[p,:,0] = y0[p]
+    for k in range(len(time) - 1):
+      dt = time[k+1] - time[k]
+      result[p,:,k+1] = result[p,:,k] + dt * SIR_rhs(result[p,:,k], time[k], rates[p], N)
+  return result
+
+
+@numba.njit(cache=True)
+def SIRD_euler(y0, time, rates, N):
+  result = np.empty((y0.shape[0], y0.shape[1], len(time)))
+  for p in range(y0.shape[0]):
+    result[p,:,0] = y0[p]
+    for k in range(len(time) - 1):
+      dt = time[k+1] - time[k]
+      result[p,:,k+1] = result[p,:,k] + dt * SIRD_rhs(result[p,:,k], time[k], rates[p], N)
+  return result
+
+
+@numba.njit(cache=True)
+def SEIR_euler(y0, time, rates, N):
+  result = np.empty((y0.shape[0], y0.shape[1], len(time)))
+  for p in range(y0.shape[0]):
+    result[p,:,0] = y0[p]
+    for k in range(len(time) - 1):
+      dt = time[k+1] - time[k]
+      result[p,:,k+1] = result[p,:,k] + dt * SEIR_rhs(result[p,:,k], time[k], rates[p], N)
+  return result
+
+
+@numba.njit(cache=True)
+def NSIR_euler(y0, time, rates, N):
+  result = np.empty((y0.shape[0], y0.shape[1], len(time)))
+  for p in range(y0.shape[0]):
+    result[p,:,0] = y0[p]
+    for k in range(len(time) - 1):
+      dt = time[k+1] - time[k]
+      result[p,:,k+1] = result[p,:,k] + dt * NSIR_rhs(result[p,:,k], time[k], rates[p], N)
+  return result
+
+
+register("SIR", SIR_rhs, SIR_euler, SIR_rates)
+register("SIRD", SIRD_rhs, SIRD_euler, SIRD_rates)
+register("SEIR", SEIR_rhs, SEIR_euler, SEIR_rates)
+register("NSIR", NSIR_rhs, NSIR_euler, NSIR_rates)
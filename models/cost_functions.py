@@ -1,6 +1,7 @@
 
 import numpy as np
-from PyAstronomy import pyasl
+
+from . import precision as pc
 
 import sys
 import os
@@ -9,9 +10,38 @@ def PrintException(e):
     fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1]
     print(e, ' - line:', exc_tb.tb_lineno)
 
+
+# The numeric errors of a diverging simulation,
+# scored as the worst cost
+NUMERIC_ERRORS = (ArithmeticError, ValueError)
+
+
+def finite(cost):
+  """
+    The function that scores the non finite costs, as the ones
+    of a diverging simulation, as the worst ones, so the search
+    never keeps them as its best candidates.
+
+    :param float cost: The cost, or the costs of a population.
+
+    :return: The cost, with :code:`inf` instead of the non finite values.
+    :rtype: float or array
+  """
+  if np.ndim(cost) == 0:
+    return cost if np.isfinite(cost) else np.inf
+  return np.where(np.isfinite(cost), cost, np.inf)
+
+def _check_dataset(self, dataset):
+  # The population search estimates the suceptible
+  # data from the infected and recovered ones
+  if self._search_pop and len(dataset) < 3:
+    raise ValueError("The population search needs the recovered data!")
+
+
 def cost_NSIR(self, pars, dataset, initial, t, w):
   """
   """
+  dtype = pc.dtype(self)
   model_pars = [p for p in pars]
   model_init = [item for item in initial]
 
@@ -22,17 +52,17 @@ def cost_NSIR(self, pars, dataset, initial, t, w):
     # Simulate the differential equation system
     result = self.simulate(model_init, t, model_pars)
     # Compute the error for all samples
-    erro["S"] = w[0] * ( result[0].astype(np.float128) - S.astype(np.float128) )**2
-    erro["I"] = w[1] * ( result[2].astype(np.float128) - I.astype(np.float128) )**2
-    erro["R"] = w[2] * ( result[3].astype(np.float128) - R.astype(np.float128) )**2
+    erro["S"] = w[0] * ( result[0].astype(dtype) - S.astype(dtype) )**2
+    erro["I"] = w[1] * ( result[2].astype(dtype) - I.astype(dtype) )**2
+    erro["R"] = w[2] * ( result[3].astype(dtype) - R.astype(dtype) )**2
     # Merging the error
     erro_acc = 0.0
     for item in self.focus:
-      erro_acc += np.sqrt(np.mean(erro[item]))
+      erro_acc += np.sqrt(pc.mean(self, erro[item]))
+    erro_acc = finite(erro_acc)
     self._iter_error.append(erro_acc)
-  except Exception as e:
-    print("Except da merda")
-    erro_acc = self._iter_error[-1]
+  except NUMERIC_ERRORS:
+    erro_acc = np.inf
   return erro_acc
 
 
@@ -53,10 +83,21 @@ def cost_SIR(self, pars, dataset, initial, t, w):
     :return: The sum of the quadratic error, between simulated and real data.
     :rtype: float
   """
+  # A parameters matrix means a whole
+  # population of candidates to score
+  _check_dataset(self, dataset)
+  if np.ndim(pars) == 2:
+    return cost_SIR_population(self, pars, dataset, initial, t, w)
+
+  dtype = pc.dtype(self)
+
   model_pars = list(pars)
   model_init = list(initial)
   
-  S, I, R = dataset[0], dataset[1], dataset[2]
+  # The windows of fit_multiple 
+  # have no recovered data
+  S, I = dataset[0], dataset[1]
+  R = dataset[2] if len(dataset) > 2 else None
   erro = dict(S=1.0, I=1.0, R=1.0)
 
   if self._search_pop:
@@ -67,17 +108,65 @@ def cost_SIR(self, pars, dataset, initial, t, w):
     result = self.simulate(model_init, t, model_pars)
     # Compute the error for all samples
     
-    erro["S"] = (np.sqrt(w[0]) * result[0].astype(np.float128) - np.sqrt(w[0]) * S.astype(np.float128))**2
-    erro["I"] = (np.sqrt(w[1]) * result[1].astype(np.float128) - np.sqrt(w[1]) * I.astype(np.float128))**2
-    erro["R"] = (np.sqrt(w[2]) * result[2].astype(np.float128) - np.sqrt(w[2]) * R.astype(np.float128))**2
+    erro["S"] = (np.sqrt(w[0]) * result[0].astype(dtype) - np.sqrt(w[0]) * S.astype(dtype))**2
+    erro["I"] = (np.sqrt(w[1]) * result[1].astype(dtype) - np.sqrt(w[1]) * I.astype(dtype))**2
+    if R is not None:
+      erro["R"] = (np.sqrt(w[2]) * result[2].astype(dtype) - np.sqrt(w[2]) * R.astype(dtype))**2
     # Merging the error
     erro_acc = 0.0
     for item in self.focus:
-      erro_acc += np.sqrt(np.mean(erro[item]))
+      erro_acc += np.sqrt(pc.mean(self, erro[item]))
+    erro_acc = finite(erro_acc)
     self._iter_error.append(erro_acc)
-  except:
-    print("Except da merda")
-    erro_acc = self._iter_error[-1]
+  except NUMERIC_ERRORS:
+    erro_acc = np.inf
+  return erro_acc
+
+
+def cost_SIR_population(self, pars, dataset, initial, t, w):
+  """
+    The function to compute the error of a whole population 
+    of candidate parameters with a single batched simulation.
+
+    :param array pars: The candidate parameters matrix with shape :code:`(P, n_params)`.
+    :param list dataset: The dataset with the respective S, I and R arrays.
+    :param array initial: The initial values of suceptible, infected and recovered, respectivelly.
+    :param array t: The time respective to each sample.
+    :param array w: The weight respective to the suceptible, infected and recovered errors.
+
+    :return: The sum of the quadratic errors of each candidate.
+    :rtype: array
+  """
+  _check_dataset(self, dataset)
+  dtype = pc.dtype(self)
+  pars = np.atleast_2d(pars)
+  P = pars.shape[0]
+
+  n = min(len(dataset), 3)
+  # Build the initial conditions and 
+  # the reference data of every candidate
+  model_init = np.tile(np.asarray(initial, dtype=dtype), (P, 1))
+  data = np.empty((P, n, len(t)), dtype=dtype)
+  for k in range(n):
+    data[:,k] = dataset[k]
+  if self._search_pop:
+    S, I, R = dataset[0], dataset[1], dataset[2]
+    data[:,0] = pars[:,-1,None] * self.N - R - I
+    model_init[:,0] *= pars[:,-1]
+  try:
+    # Simulate all the candidates at once
+    result = self.simulate_population(model_init, t, pars)
+    # Compute the error for all samples
+    weights = np.sqrt(np.asarray(w[:n], dtype=dtype))[None,:,None]
+    erro = (weights * result[:,:n] - weights * data)**2
+    # Merging the error
+    erro_acc = np.zeros(P, dtype=dtype)
+    for item in self.focus:
+      erro_acc += np.sqrt(pc.mean(self, erro[:,"SIR".index(item)], axis=-1))
+    erro_acc = finite(erro_acc)
+    self._iter_error.extend(erro_acc)
+  except NUMERIC_ERRORS:
+    erro_acc = np.full(P, np.inf)
   return erro_acc
 
 
@@ -99,6 +188,8 @@ def cost_dSIR(self, pars, dataset, initial, t, w):
   model_pars = [p for p in pars]
   model_init = [item for item in initial]
   
+  # PyAstronomy is loaded only by the smoothed cost
+  from PyAstronomy import pyasl
   S = pyasl.smooth(dataset[0], 13, "hamming")
   I = pyasl.smooth(dataset[1], 13, "hamming")
   R = pyasl.smooth(dataset[2], 13, "hamming")
@@ -121,11 +212,11 @@ def cost_dSIR(self, pars, dataset, initial, t, w):
     # Merging the error
     erro_acc = 0.0
     for item in self.focus:
-      erro_acc += np.sqrt(np.mean(erro[item]))
+      erro_acc += np.sqrt(pc.mean(self, erro[item]))
+    erro_acc = finite(erro_acc)
     self._iter_error.append(erro_acc)
-  except:
-    print("Except da merda")
-    erro_acc = self._iter_error[-1]
+  except NUMERIC_ERRORS:
+    erro_acc = np.inf
   return erro_acc
 
 
@@ -134,7 +225,7 @@ def cost_SEIR(self, pars, dataset, initial, t, w):
     The function to compute the error to guide the learning
     algorithm. It computes the quadratic error.
 
-    :param tuple pars: Tuple with Beta and r parameters, respectivelly.
+    :param tuple pars: Tuple with Ro, D, sigma and, optionally, pop parameters, respectivelly.
     :param list dataset: The dataset with the respective S, I and R arrays.
     :param array initial: The initial values of suceptible and infected, respectivelly.
     :param array t: The time respective to each sample.
@@ -143,6 +234,11 @@ def cost_SEIR(self, pars, dataset, initial, t, w):
     :return: The sum of the quadratic error, between simulated and real data.
     :rtype: float
   """
+  # A parameters matrix means a whole
+  # population of candidates to score
+  if np.ndim(pars) == 2:
+    return cost_SEIR_population(self, pars, dataset, initial, t, w)
+
   model_pars = [p for p in pars]
   model_init = [item for item in initial]
   
@@ -163,13 +259,60 @@ def cost_SEIR(self, pars, dataset, initial, t, w):
     # Merging the error
     erro_acc = 0.0
     for item in self.focus:
-      erro_acc += np.sqrt(np.mean(erro[item]))
+      erro_acc += np.sqrt(pc.mean(self, erro[item]))
+    erro_acc = finite(erro_acc)
     self._iter_error.append(erro_acc)
-  except:
-    print("Except da merda")
-    erro_acc = self._iter_error[-1]
+  except NUMERIC_ERRORS:
+    erro_acc = np.inf
+  return erro_acc
+
+def cost_SEIR_population(self, pars, dataset, initial, t, w):
+  """
+    The function to compute the error of a whole population 
+    of candidate parameters with a single batched simulation.
+
+    :param array pars: The candidate parameters matrix with shape :code:`(P, n_params)`.
+    :param list dataset: The dataset with the respective S, I and R arrays.
+    :param array initial: The initial values of suceptible, exposed, infected and recovered, respectivelly.
+    :param array t: The time respective to each sample.
+    :param array w: The weight respective to the suceptible, infected and recovered errors.
+
+    :return: The sum of the quadratic errors of each candidate.
+    :rtype: array
+  """
+  dtype = pc.dtype(self)
+  pars = np.atleast_2d(pars)
+  P = pars.shape[0]
+  model_pars = pars
+
+  S, I, R = dataset[0], dataset[1], dataset[2]
+  # Build the initial conditions and 
+  # the reference data of every candidate
+  model_init = np.tile(np.asarray(initial, dtype=dtype), (P, 1))
+  S = np.broadcast_to(S, (P, len(t)))
+  if self._search_pop:
+    model_init[:,0] *= pars[:,-1]
+    model_pars = pars[:,:-1]
+    S = pars[:,-1,None] * self.N - R - I
+  try:
+    # Simulate all the candidates at once
+    result = self.simulate_population(model_init, t, model_pars)
+    # Compute the error for all samples
+    erro = {item: np.ones((P, 1)) for item in "SEIR"}
+    erro["S"] = w[0] * ( result[:,0] + result[:,1] - S )**2
+    erro["I"] = w[1] * ( result[:,2] - I )**2
+    erro["R"] = w[2] * ( result[:,3] - R )**2
+    # Merging the error
+    erro_acc = np.zeros(P, dtype=dtype)
+    for item in self.focus:
+      erro_acc += np.sqrt(pc.mean(self, erro[item], axis=-1))
+    erro_acc = finite(erro_acc)
+    self._iter_error.extend(erro_acc)
+  except NUMERIC_ERRORS:
+    erro_acc = np.full(P, np.inf)
   return erro_acc
 
+
 def cost_SIRD(self, pars, dataset, initial, t, w):
   """
     The function to compute the error to guide the learning
@@ -185,6 +328,13 @@ def cost_SIRD(self, pars, dataset, initial, t, w):
     :return: The sum of the quadratic error, between simulated and real data.
     :rtype: float
   """
+  # A parameters matrix means a whole
+  # population of candidates to score
+  if np.ndim(pars) == 2:
+    return cost_SIRD_population(self, pars, dataset, initial, t, w)
+
+  dtype = pc.dtype(self)
+
   model_pars = list(pars)
   model_init = list(initial)
 
@@ -201,10 +351,177 @@ def cost_SIRD(self, pars, dataset, initial, t, w):
     # Compute the error for all samples
     erro = 0.0
     for d,r, p in zip(datatest, result, w):
-      erro+= np.sqrt(np.mean((np.sqrt(p) * r.astype(np.float128) - np.sqrt(p) * d.astype(np.float128) )**2))
+      erro+= np.sqrt(pc.mean(self, (np.sqrt(p) * r.astype(dtype) - np.sqrt(p) * d.astype(dtype) )**2))
+    erro = finite(erro)
     self._iter_error.append(erro)
-  except Exception as e:
-    print(e)
-    print("Except da merda")
-    erro = self._iter_error[-1]
+  except NUMERIC_ERRORS:
+    erro = np.inf
   return erro
+
+
+def cost_SIRD_population(self, pars, dataset, initial, t, w):
+  """
+    The function to compute the error of a whole population 
+    of candidate parameters with a single batched simulation.
+
+    :param array pars: The candidate parameters matrix with shape :code:`(P, n_params)`.
+    :param list dataset: The dataset with the respective compartments arrays.
+    :param array initial: The initial values of each compartment.
+    :param array t: The time respective to each sample.
+    :param array w: The weight respective to each compartment error.
+
+    :return: The sum of the quadratic errors of each candidate.
+    :rtype: array
+  """
+  dtype = pc.dtype(self)
+  pars = np.atleast_2d(pars)
+  P = pars.shape[0]
+  # Build the initial conditions and 
+  # the reference data of every candidate
+  model_init = np.tile(np.asarray(initial, dtype=dtype), (P, 1))
+  datatest = np.empty((P, len(dataset), len(t)), dtype=dtype)
+  for k, d in enumerate(dataset):
+    datatest[:,k] = d
+  if self._search_pop:
+    datatest[:,0] = pars[:,-1,None] * self.N - np.sum(dataset[1:], axis=0)
+    model_init[:,0] *= pars[:,-1]
+  try:
+    # Simulate all the candidates at once
+    result = self.simulate_population(model_init, t, pars)
+    # Compute the error for all samples
+    weights = np.sqrt(np.asarray(w, dtype=dtype))[None,:,None]
+    erro = (weights * result - weights * datatest)**2
+    erro = np.sum(np.sqrt(pc.mean(self, erro, axis=-1)), axis=-1)
+    erro = finite(erro)
+    self._iter_error.extend(erro)
+  except NUMERIC_ERRORS:
+    erro = np.full(P, np.inf)
+  return erro
+
+
+def _cost_gradient(self, pars, model_pars, initial, t, observations, constant=0.0):
+  """
+    The function that computes the sum of the root mean square
+    errors of the observations, and its gradient by the searched
+    parameters, from the forward sensitivities of the simulation.
+
+    :param array pars: The searched parameters, with the pop proportion last if it is searched.
+    :param array model_pars: The parameters of the simulation.
+    :param array initial: The initial values of the model compartments.
+    :param array t: The time respective to each sample.
+    :param list observations: The states combination, error weight, data and data derivative by the pop proportion of each observation.
+    :param float constant: The cost of the non observed compartments. Default is :code:`0.0`.
+
+    :return: The cost and its gradient.
+    :rtype: tuple
+  """
+  pars = np.asarray(pars, dtype=np.float64)
+  model_init = np.array(initial, dtype=np.float64)
+  if self._search_pop:
+    model_init[0] *= pars[-1]
+  try:
+    result, dpars, dinit = self.simulate_sensitivity(model_init, t, model_pars)
+    # The states sensitivities by each searched
+    # parameter, where the pop proportion also
+    # scales the initial suceptible
+    dstates = np.zeros((result.shape[0], len(pars), len(t)))
+    dstates[:, :len(model_pars)] = dpars
+    if self._search_pop:
+      dstates[:, -1] += dinit[:, 0] * initial[0]
+    erro_acc, gradient = constant, np.zeros(len(pars))
+    for row, weight, data, data_pop in observations:
+      erro = weight * (row @ result - data)
+      derro = weight * np.einsum("n,npt->pt", row, dstates)
+      if data_pop is not None:
+        derro[-1] -= weight * data_pop
+      rmse = np.sqrt(np.mean(erro**2))
+      erro_acc += rmse
+      if rmse > 0:
+        gradient += np.mean(erro * derro, axis=-1) / rmse
+    if not np.isfinite(erro_acc):
+      raise FloatingPointError("Non finite cost")
+    self._iter_error.append(erro_acc)
+  except NUMERIC_ERRORS:
+    erro_acc, gradient = np.inf, np.zeros(len(pars))
+  return erro_acc, gradient
+
+
+def gradient_SIR(self, pars, dataset, initial, t, w):
+  """
+    The function to compute the :code:`cost_SIR` error and its
+    gradient by the parameters.
+
+    :param tuple pars: Tuple with Ro, D and, optionally, pop parameters, respectivelly.
+    :param list dataset: The dataset with the respective S, I and, optionally, R arrays.
+    :param array initial: The initial values of suceptible, infected and, optionally, recovered.
+    :param array t: The time respective to each sample.
+    :param array w: The weight respective to each compartment error.
+
+    :return: The error and its gradient.
+    :rtype: tuple
+  """
+  _check_dataset(self, dataset)
+  S, I = dataset[0], dataset[1]
+  R = dataset[2] if len(dataset) > 2 else None
+  data, data_pop = dict(S=S, I=I, R=R), None
+  if self._search_pop:
+    data["S"], data_pop = pars[-1] * self.N - R - I, self.N
+  states = np.eye(len(initial))
+  observations = []
+  for item in self.focus:
+    k = "SIR".index(item)
+    observations.append((states[k], np.sqrt(w[k]), data[item], data_pop if item == "S" else None))
+  return _cost_gradient(self, pars, pars, initial, t, observations)
+
+
+def gradient_SIRD(self, pars, dataset, initial, t, w):
+  """
+    The function to compute the :code:`cost_SIRD` error and its
+    gradient by the parameters.
+
+    :param tuple pars: Tuple with Ro, D, mu and, optionally, pop parameters, respectivelly.
+    :param list dataset: The dataset with the respective compartments arrays.
+    :param array initial: The initial values of each compartment.
+    :param array t: The time respective to each sample.
+    :param array w: The weight respective to each compartment error.
+
+    :return: The error and its gradient.
+    :rtype: tuple
+  """
+  data, data_pop = list(dataset), None
+  if self._search_pop:
+    data[0], data_pop = pars[-1] * self.N - np.sum(dataset[1:], axis=0), self.N
+  states = np.eye(len(initial))
+  observations = [
+    (states[k], np.sqrt(w[k]), d, data_pop if k == 0 else None)
+    for k, d in enumerate(data)]
+  return _cost_gradient(self, pars, pars, initial, t, observations)
+
+
+def gradient_SEIR(self, pars, dataset, initial, t, w):
+  """
+    The function to compute the :code:`cost_SEIR` error and its
+    gradient by the parameters.
+
+    :param tuple pars: Tuple with Ro, D, sigma and, optionally, pop parameters, respectivelly.
+    :param list dataset: The dataset with the respective S, I and R arrays.
+    :param array initial: The initial values of suceptible, exposed, infected and recovered, respectivelly.
+    :param array t: The time respective to each sample.
+    :param array w: The weight respective to the suceptible, infected and recovered errors.
+
+    :return: The error and its gradient.
+    :rtype: tuple
+  """
+  S, I, R = dataset[0], dataset[1], dataset[2]
+  model_pars, data_pop = pars, None
+  if self._search_pop:
+    model_pars = pars[:-1]
+    S, data_pop = pars[-1] * self.N - R - I, self.N
+  # The suceptible data also holds the exposed
+  observed = dict(
+    S=(np.array([1.0, 1.0, 0.0, 0.0]), np.sqrt(w[0]), S, data_pop),
+    I=(np.array([0.0, 0.0, 1.0, 0.0]), np.sqrt(w[1]), I, None),
+    R=(np.array([0.0, 0.0, 0.0, 1.0]), np.sqrt(w[2]), R, None))
+  observations = [observed[item] for item in self.focus if item in observed]
+  constant = float(len(self.focus) - len(observations))
+  return _cost_gradient(self, pars, model_pars, initial, t, observations, constant)
@@ -3,9 +3,10 @@
 import numpy as np
 
 
-def NSIR(self, y, t, beta, r, betan, alpha, rn, *args):
+def NSIR(self, y, t, parameters, *args):
   """
   """
+  beta, r, betan, alpha, rn = parameters[:5]
 
   S, I, In, R = y
 
@@ -53,20 +54,21 @@ def SIR(self, y, t, parameters, *args):
     return Sdot, Idot, Rdot
 
 
-def SEIR(self, y, t, Beta, r, sigma):
+def SEIR(self, y, t, parameters, *args):
   """
     The function that computes the diferential set of 
     equations of the SEIR Epidemic Model.
     
     :param tuple y: Tuple with the suceptible and infected data.
     :param array t: The time respective to each y set of samples.
-    :param float Beta: The Beta parameter.
-    :param float r: The r parameter.
-    :param float sigma: The sigma parameter.
+    :param list parameters: The Ro, D and sigma parameters, respectivelly.
     
     :return: The derivative of the suceptible and infected data.
     :rtype: tuple
   """
+  # The rates of the Ro and D parametrization
+  Ro, D, sigma = parameters[:3]
+  Beta, r = Ro / D, 1 / D
 
   S, E, I, R = y
   Sdot = -Beta * S * I / self.N
@@ -105,4 +107,149 @@ def SIRD(self, y, t, parameters):
   Idot = Beta * I * S  / self.N - r * I - mu * I
   Rdot = r * I
   Ddot = mu* I
-  return Sdot, Idot, Rdot, Ddot
\ No newline at end of file
+  return Sdot, Idot, Rdot, Ddot
+
+def _infection_rate(parameters, pop_index):
+  """
+    The function that computes the Beta rate of the Ro and D
+    parametrization, and its derivatives by each parameter.
+  """
+  Ro, D = parameters[0], parameters[1]
+  pop = parameters[pop_index] if len(parameters) > pop_index else 1.0
+  Beta = Ro / (D * pop)
+  dBeta = np.zeros(len(parameters))
+  dBeta[0], dBeta[1] = Beta / Ro, -Beta / D
+  if len(parameters) > pop_index:
+    dBeta[pop_index] = -Beta / pop
+  return Beta, dBeta
+
+
+def SIR_jacobian(self, y, t, parameters, *args):
+  """
+    The function that computes the coefficients of the forward
+    sensitivity equations of the SIR Epidemic Model, as the
+    derivative of the states by the states and by the Ro, D
+    and, optionally, pop parameters.
+
+    :param array y: The suceptible, infected and, optionally, recovered values.
+    :param float t: The time of the values.
+    :param list parameters: The Ro, D and, optionally, pop parameters, respectivelly.
+
+    :return: The derivative of the states, the states jacobian and the parameters jacobian.
+    :rtype: tuple
+  """
+  Beta, dBeta = _infection_rate(parameters, 2)
+  r, D = 1 / parameters[1], parameters[1]
+  S, I = y[0], y[1]
+  n = len(y)
+  infection = Beta * S * I / self.N
+  ydot = np.array([-infection, infection - r * I, r * I][:n])
+  # The states jacobian
+  Jy = np.zeros((n, n))
+  Jy[0,0], Jy[0,1] = -Beta * I / self.N, -Beta * S / self.N
+  Jy[1,0], Jy[1,1] = Beta * I / self.N, Beta * S / self.N - r
+  if n == 3:
+    Jy[2,1] = r
+  # The parameters jacobian, through the rates
+  Jp = np.outer([-S * I / self.N, S * I / self.N, 0.0][:n], dBeta)
+  Jp[1,1] += I / D**2
+  if n == 3:
+    Jp[2,1] -= I / D**2
+  return ydot, Jy, Jp
+
+
+def SIRD_jacobian(self, y, t, parameters, *args):
+  """
+    The function that computes the coefficients of the forward
+    sensitivity equations of the SIRD Epidemic Model, as the
+    derivative of the states by the states and by the Ro, D,
+    mu and, optionally, pop parameters.
+
+    :param array y: The suceptible, infected, optionally recovered, and deaths values.
+    :param float t: The time of the values.
+    :param list parameters: The Ro, D, mu and, optionally, pop parameters, respectivelly.
+
+    :return: The derivative of the states, the states jacobian and the parameters jacobian.
+    :rtype: tuple
+  """
+  Beta, dBeta = _infection_rate(parameters, 3)
+  r, D, mu = 1 / parameters[1], parameters[1], parameters[2]
+  S, I = y[0], y[1]
+  n = len(y)
+  infection = Beta * S * I / self.N
+  ydot = np.zeros(n)
+  ydot[0], ydot[1], ydot[-1] = -infection, infection - r * I - mu * I, mu * I
+  # The states jacobian
+  Jy = np.zeros((n, n))
+  Jy[0,0], Jy[0,1] = -Beta * I / self.N, -Beta * S / self.N
+  Jy[1,0], Jy[1,1] = Beta * I / self.N, Beta * S / self.N - r - mu
+  Jy[-1,1] = mu
+  # The parameters jacobian, through the rates
+  Jp = np.zeros((n, len(parameters)))
+  Jp[0], Jp[1] = -S * I / self.N * dBeta, S * I / self.N * dBeta
+  Jp[1,1] += I / D**2
+  Jp[1,2] -= I
+  Jp[-1,2] += I
+  if n == 4:
+    ydot[2] = r * I
+    Jy[2,1] = r
+    Jp[2,1] -= I / D**2
+  return ydot, Jy, Jp
+
+
+def SEIR_jacobian(self, y, t, parameters, *args):
+  """
+    The function that computes the coefficients of the forward
+    sensitivity equations of the SEIR Epidemic Model, as the
+    derivative of the states by the states and by the Ro, D
+    and sigma parameters.
+
+    :param array y: The suceptible, exposed, infected and recovered values.
+    :param float t: The time of the values.
+    :param list parameters: The Ro, D and sigma parameters, respectivelly.
+
+    :return: The derivative of the states, the states jacobian and the parameters jacobian.
+    :rtype: tuple
+  """
+  Ro, D, sigma = parameters[:3]
+  Beta, r = Ro / D, 1 / D
+  S, E, I, R = y
+  infection = Beta * S * I / self.N
+  ydot = np.array([-infection, infection - sigma * E, sigma * E - r * I, r * I])
+  # The states jacobian
+  Jy = np.zeros((4, 4))
+  Jy[0,0], Jy[0,2] = -Beta * I / self.N, -Beta * S / self.N
+  Jy[1,0], Jy[1,1], Jy[1,2] = Beta * I / self.N, -sigma, Beta * S / self.N
+  Jy[2,1], Jy[2,2] = sigma, -r
+  Jy[3,2] = r
+  # The parameters jacobian, through the rates
+  Jp = np.zeros((4, 3))
+  Jp[0,:2] = -S * I / self.N * np.array([1 / D, -Beta / D])
+  Jp[1,:2] = -Jp[0,:2]
+  Jp[2,1], Jp[3,1] = I / D**2, -I / D**2
+  Jp[1,2], Jp[2,2] = -E, E
+  return ydot, Jy, Jp
+
+
+def sensitivity(self, z, t, parameters, jacobian, n):
+  """
+    The function that computes the derivative of the model
+    states augmented with the forward sensitivities, by the
+    parameters and by the initial states, as
+    :code:`s' = Jy s + Jp`.
+
+    :param array z: The states followed by the flattened :code:`(n, n_params + n)` sensitivities.
+    :param float t: The time of the values.
+    :param list parameters: The model parameters.
+    :param function jacobian: The sensitivity coefficients function of the model.
+    :param int n: The number of states.
+
+    :return: The derivative of the augmented states.
+    :rtype: array
+  """
+  m = len(parameters)
+  ydot, Jy, Jp = jacobian(self, z[:n], t, parameters)
+  sens = z[n:].reshape(n, m + n)
+  sdot = Jy @ sens
+  sdot[:, :m] += Jp
+  return np.concatenate((ydot, sdot.ravel()))
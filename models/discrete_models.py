@@ -1,8 +1,55 @@
 import numpy as np
 
+from . import precision as pc
+
+
+def euler(self, y, time, derivative, P):
+  """
+    The function that integrates a population of trajectories
+    with the forward Euler method, following the precision
+    policy of the model.
+
+    :param array y: The initial values with shape :code:`(n,)` or :code:`(P, n)`.
+    :param array time: The time points to simulate the model.
+    :param function derivative: The function that writes the derivatives of the :code:`(P, n)` states into its second argument.
+    :param int P: The number of trajectories.
+
+    :return: The simulated compartments with shape :code:`(P, n, T)`.
+    :rtype: array
+  """
+  dtype = pc.dtype(self)
+  # Preallocate the response with the
+  # initial values of every trajectory
+  y = np.atleast_2d(np.asarray(y, dtype=dtype))
+  result = np.empty((P, y.shape[1], len(time)), dtype=dtype)
+  result[:,:,0] = y
+  dt = np.diff(time).astype(dtype)
+  # The compensation of the lost low
+  # order bits of each state (Kahan)
+  compensated = pc.compensated(self)
+  compensation = np.zeros((P, y.shape[1]), dtype=dtype)
+  increment = np.empty((P, y.shape[1]), dtype=dtype)
+  for k in range(len(dt)):
+    # Compute the x(k) = x(k-1) + dt * x'(k-1)
+    derivative(result[:,:,k], increment)
+    increment *= dt[k]
+    if compensated:
+      increment -= compensation
+      np.add(result[:,:,k], increment, out=result[:,:,k+1])
+      compensation = (result[:,:,k+1] - result[:,:,k]) - increment
+    else:
+      np.add(result[:,:,k], increment, out=result[:,:,k+1])
+  return result
+
+
 def SIR(self, y, time, parameters, *args):
   """
   """
+  # The compensated summation runs 
+  # on the batched simulator
+  if pc.compensated(self):
+    return tuple(SIR_batch(self, y, time, [parameters])[0])
+  dtype = pc.dtype(self)
   # Build the model parameters
   if len(parameters) == 3:
     Beta = parameters[0] / (parameters[1] * parameters[2])
@@ -14,7 +61,7 @@ def SIR(self, y, time, parameters, *args):
   # Compute the Suceptible and the 
   # infected data
   if len(y) == 2:
-    S_, I_ = [y[0]], [y[1]]
+    S_, I_ = [dtype(y[0])], [dtype(y[1])]
     for t1, t2 in zip(time[:-1], time[1:]):
       dt = t2 - t1
       S, I = S_[-1], I_[-1]
@@ -22,16 +69,16 @@ def SIR(self, y, time, parameters, *args):
       Idot = Beta * S * I / self.N  - r * I
       S_.append(S_[-1] + dt * Sdot)
       I_.append(I_[-1] + dt * Idot)
-    S_ = np.array(S_)
-    I_ = np.array(I_)
+    S_ = np.array(S_, dtype=dtype)
+    I_ = np.array(I_, dtype=dtype)
     return S_, I_
 
   if len(y) == 3:
-    # Initialize the vectors as 
-    # numpy float 128 bits
-    S_ = [ y[0].astype(np.float128) ]
-    I_ = [ y[1].astype(np.float128) ]
-    R_ = [ y[2].astype(np.float128) ]
+    # Initialize the vectors with the 
+    # precision of the model
+    S_ = [ dtype(y[0]) ]
+    I_ = [ dtype(y[1]) ]
+    R_ = [ dtype(y[2]) ]
 
     for t1, t2 in zip(time[:-1], time[1:]):
       # Compute the dT 
@@ -47,14 +94,19 @@ def SIR(self, y, time, parameters, *args):
       I_.append(I_[-1] + dt * Idot)
       R_.append(R_[-1] + dt * Rdot)
     # Make the responses numpy arrays
-    S_ = np.array(S_, dtype=np.float128)
-    I_ = np.array(I_, dtype=np.float128)
-    R_ = np.array(R_, dtype=np.float128)
+    S_ = np.array(S_, dtype=dtype)
+    I_ = np.array(I_, dtype=dtype)
+    R_ = np.array(R_, dtype=dtype)
     return S_, I_, R_
 
 def SIRD(self, y, time, parameters, *args):
   """
   """
+  # The compensated summation runs 
+  # on the batched simulator
+  if pc.compensated(self):
+    return tuple(SIRD_batch(self, y, time, [parameters])[0])
+  dtype = pc.dtype(self)
   # Build the model parameters
   if len(parameters) == 4:
     Beta = parameters[0] / (parameters[1] * parameters[-1])
@@ -67,7 +119,7 @@ def SIRD(self, y, time, parameters, *args):
   # Compute the Suceptible and the 
   # infected data
   if len(y) == 3:
-    S_, I_, D_ = [y[0]], [y[1]], [y[2]]
+    S_, I_, D_ = [dtype(y[0])], [dtype(y[1])], [dtype(y[2])]
     for t1, t2 in zip(time[:-1], time[1:]):
       dt = t2 - t1
       S, I, D = S_[-1], I_[-1], D_[-1]
@@ -77,18 +129,18 @@ def SIRD(self, y, time, parameters, *args):
       S_.append(S_[-1] + dt * Sdot)
       I_.append(I_[-1] + dt * Idot)
       D_.append(D_[-1] + dt * Ddot)
-    S_ = np.array(S_)
-    I_ = np.array(I_)
-    D_ = np.array(D_)
+    S_ = np.array(S_, dtype=dtype)
+    I_ = np.array(I_, dtype=dtype)
+    D_ = np.array(D_, dtype=dtype)
     return S_, I_, D_
 
   if len(y) == 4:
-    # Initialize the vectors as 
-    # numpy float 128 bits
-    S_ = [ y[0].astype(np.float128) ]
-    I_ = [ y[1].astype(np.float128) ]
-    R_ = [ y[2].astype(np.float128) ]
-    D_ = [ y[3].astype(np.float128) ]
+    # Initialize the vectors with the 
+    # precision of the model
+    S_ = [ dtype(y[0]) ]
+    I_ = [ dtype(y[1]) ]
+    R_ = [ dtype(y[2]) ]
+    D_ = [ dtype(y[3]) ]
 
     for t1, t2 in zip(time[:-1], time[1:]):
       # Compute the dT 
@@ -106,8 +158,156 @@ def SIRD(self, y, time, parameters, *args):
       R_.append(R_[-1] + dt * Rdot)
       D_.append(D_[-1] + dt * Ddot)
     # Make the responses numpy arrays
-    S_ = np.array(S_, dtype=np.float128)
-    I_ = np.array(I_, dtype=np.float128)
-    R_ = np.array(R_, dtype=np.float128)
-    D_ = np.array(D_, dtype=np.float128)
+    S_ = np.array(S_, dtype=dtype)
+    I_ = np.array(I_, dtype=dtype)
+    R_ = np.array(R_, dtype=dtype)
+    D_ = np.array(D_, dtype=dtype)
     return S_, I_, R_, D_
+
+
+def SIR_batch(self, y, time, parameters, *args):
+  """
+    The function that simulates the discrete SIR model for a
+    whole population of parameter sets at once, advancing all
+    the trajectories together with array operations.
+
+    :param array y: The initial values with shape :code:`(n,)` or :code:`(P, n)`.
+    :param array time: The time points to simulate the model.
+    :param array parameters: The parameters matrix with shape :code:`(P, n_params)`.
+
+    :return: The simulated compartments with shape :code:`(P, n, T)`.
+    :rtype: array
+  """
+  parameters = np.atleast_2d(parameters)
+  # Build the model parameters
+  if parameters.shape[1] == 3:
+    Beta = parameters[:,0] / (parameters[:,1] * parameters[:,2])
+  else:
+    Beta = parameters[:,0] / parameters[:,1]
+  r = 1 / parameters[:,1]
+
+  def derivative(x, xdot):
+    # Compute the differential
+    infection = Beta * x[:,0] * x[:,1] / self.N
+    recovery = r * x[:,1]
+    xdot[:,0] = -infection
+    xdot[:,1] = infection - recovery
+    if x.shape[1] == 3:
+      xdot[:,2] = recovery
+
+  return euler(self, y, time, derivative, parameters.shape[0])
+
+
+def SIRD_batch(self, y, time, parameters, *args):
+  """
+    The function that simulates the discrete SIRD model for a
+    whole population of parameter sets at once.
+
+    :param array y: The initial values with shape :code:`(n,)` or :code:`(P, n)`.
+    :param array time: The time points to simulate the model.
+    :param array parameters: The parameters matrix with shape :code:`(P, n_params)`.
+
+    :return: The simulated compartments with shape :code:`(P, n, T)`.
+    :rtype: array
+  """
+  parameters = np.atleast_2d(parameters)
+  # Build the model parameters
+  if parameters.shape[1] == 4:
+    Beta = parameters[:,0] / (parameters[:,1] * parameters[:,-1])
+  else:
+    Beta = parameters[:,0] / parameters[:,1]
+  r = 1 / parameters[:,1]
+  mu = parameters[:,2]
+
+  def derivative(x, xdot):
+    # Compute the differential
+    infection = Beta * x[:,0] * x[:,1] / self.N
+    recovery = r * x[:,1]
+    death = mu * x[:,1]
+    xdot[:,0] = -infection
+    xdot[:,1] = infection - recovery - death
+    if x.shape[1] == 4:
+      xdot[:,2] = recovery
+    xdot[:,-1] = death
+
+  return euler(self, y, time, derivative, parameters.shape[0])
+
+
+def SEIR(self, y, time, parameters, *args):
+  """
+    The function that simulates the discrete SEIR model.
+
+    :param tuple y: Tuple with the suceptible, exposed, infected and recovered initial values.
+    :param array time: The time points to simulate the model.
+    :param list parameters: The Ro, D and sigma parameters, respectivelly.
+
+    :return: The suceptible, exposed, infected and recovered values, respectivelly.
+    :rtype: tuple
+  """
+  result = SEIR_batch(self, y, time, [parameters[:3]])[0]
+  return tuple(result)
+
+
+def SEIR_batch(self, y, time, parameters, *args):
+  """
+    The function that simulates the discrete SEIR model for a
+    whole population of parameter sets at once.
+
+    :param array y: The initial values with shape :code:`(4,)` or :code:`(P, 4)`.
+    :param array time: The time points to simulate the model.
+    :param array parameters: The parameters matrix with shape :code:`(P, 3)`.
+
+    :return: The simulated compartments with shape :code:`(P, 4, T)`.
+    :rtype: array
+  """
+  parameters = np.atleast_2d(parameters)
+  # Build the model parameters, from
+  # the Ro and D parametrization
+  Beta = parameters[:,0] / parameters[:,1]
+  r = 1 / parameters[:,1]
+  sigma = parameters[:,2]
+
+  def derivative(x, xdot):
+    # Compute the differential
+    infection = Beta * x[:,0] * x[:,2] / self.N
+    incubation = sigma * x[:,1]
+    recovery = r * x[:,2]
+    xdot[:,0] = -infection
+    xdot[:,1] = infection - incubation
+    xdot[:,2] = incubation - recovery
+    xdot[:,3] = recovery
+
+  return euler(self, y, time, derivative, parameters.shape[0])
+
+
+def sensitivity(self, y, time, parameters, jacobian, *args):
+  """
+    The function that simulates the discrete model with its
+    forward sensitivities, by the parameters and by the initial
+    states. The sensitivities follow the Euler steps, as
+    :code:`s(k) = s(k-1) + dt * (Jy s(k-1) + Jp)`, so they are
+    the exact derivatives of the discrete simulation.
+
+    :param array y: The initial values with shape :code:`(n,)`.
+    :param array time: The time points to simulate the model.
+    :param list parameters: The model parameters.
+    :param function jacobian: The sensitivity coefficients function of the model, from :code:`differential_models`.
+
+    :return: The simulated compartments with shape :code:`(n, T)`, their sensitivities by the parameters with shape :code:`(n, n_params, T)` and by the initial states with shape :code:`(n, n, T)`.
+    :rtype: tuple
+  """
+  y = np.asarray(y, dtype=np.float64)
+  n, m = len(y), len(parameters)
+  result = np.empty((n, len(time)))
+  sens = np.empty((n, m + n, len(time)))
+  result[:,0] = y
+  sens[:,:m,0] = 0.0
+  sens[:,m:,0] = np.eye(n)
+  dt = np.diff(time)
+  for k in range(len(dt)):
+    ydot, Jy, Jp = jacobian(self, result[:,k], time[k], parameters)
+    sdot = Jy @ sens[:,:,k]
+    sdot[:,:m] += Jp
+    result[:,k+1] = result[:,k] + dt[k] * ydot
+    sens[:,:,k+1] = sens[:,:,k] + dt[k] * sdot
+  return result, sens[:,:m], sens[:,m:]
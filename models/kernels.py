@@ -0,0 +1,113 @@
+"""
+  The compiled kernels of the compartment models. When
+  numba is available, each model registers a nopython
+  compiled right-hand side, used by :code:`odeint`, and an
+  Euler kernel, used by the discrete simulation. The kernels
+  live in the :code:`compiled` module, imported on the first
+  lookup, so importing the package does not load numba. The
+  compilation is cached to disk, so it is paid only once.
+"""
+
+import importlib.util
+
+from collections import namedtuple
+
+import numpy as np
+
+# If the numba backend is installed, checked
+# without importing it
+AVAILABLE = importlib.util.find_spec("numba") is not None
+
+
+# The registered kernels of each model, where
+# the rates function maps the model parameters
+# vector into the kernel rate constants
+Kernel = namedtuple("Kernel", ["rhs", "euler", "rates"])
+KERNELS = dict()
+
+# If the compiled module was already imported
+_loaded = dict(done=False)
+
+
+def register(name, rhs, euler, rates):
+  """
+    The function that registers the compiled kernels of a model.
+
+    :param string name: The model name, as the name of its differential model function.
+    :param function rhs: The compiled right-hand side as :code:`rhs(y, t, rates, N)`.
+    :param function euler: The compiled Euler kernel as :code:`euler(y0, time, rates, N)`.
+    :param function rates: The function that maps the parameters vector into the kernel rates.
+  """
+  KERNELS[name] = Kernel(rhs, euler, rates)
+
+
+def get(name):
+  """
+    The function that returns the compiled kernels of a model.
+
+    :param string name: The model name, as the name of its differential model function.
+
+    :return: The registered kernels, or :code:`None` if there are none.
+    :rtype: Kernel
+  """
+  if not _loaded["done"]:
+    _loaded["done"] = True
+    if AVAILABLE:
+      from . import compiled
+  return KERNELS.get(name)
+
+
+def SIR_rates(parameters):
+  """
+    The function that computes the Beta and r rates of the SIR model.
+
+    :param list parameters: The Ro, D and, optionally, pop parameters, respectivelly.
+
+    :return: The Beta and r rates.
+    :rtype: array
+  """
+  if len(parameters) == 3:
+    Beta = parameters[0] / (parameters[1] * parameters[2])
+  else:
+    Beta = parameters[0] / parameters[1]
+  return np.array([Beta, 1 / parameters[1]], dtype=np.float64)
+
+
+def SIRD_rates(parameters):
+  """
+    The function that computes the Beta, r and mu rates of the SIRD model.
+
+    :param list parameters: The Ro, D, mu and, optionally, pop parameters, respectivelly.
+
+    :return: The Beta, r and mu rates.
+    :rtype: array
+  """
+  if len(parameters) == 4:
+    Beta = parameters[0] / (parameters[1] * parameters[-1])
+  else:
+    Beta = parameters[0] / parameters[1]
+  return np.array([Beta, 1 / parameters[1], parameters[2]], dtype=np.float64)
+
+
+def SEIR_rates(parameters):
+  """
+    The function that computes the Beta, r and sigma rates of the SEIR model.
+
+    :param list parameters: The Ro, D and sigma parameters, respectivelly.
+
+    :return: The Beta, r and sigma rates.
+    :rtype: array
+  """
+  return np.array([parameters[0] / parameters[1], 1 / parameters[1], parameters[2]], dtype=np.float64)
+
+
+def NSIR_rates(parameters):
+  """
+    The function that computes the rates of the NSIR model.
+
+    :param list parameters: The beta, r, betan, alpha and rn parameters, respectivelly.
+
+    :return: The beta, r, betan, alpha and rn rates.
+    :rtype: array
+  """
+  return np.array(parameters[:5], dtype=np.float64)
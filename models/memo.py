@@ -0,0 +1,233 @@
+"""
+  The memoization of the simulations and of the cost functions.
+  The search algorithms evaluate again candidates within the
+  numerical noise of the ones already evaluated, mainly near
+  the convergence, so the results are kept by the parameters
+  and initial values rounded to a number of significant digits,
+  and by the hash of the time grid and of the dataset. The
+  least recently used results are evicted to bound the memory.
+
+  The search workers, as the differential evolution with
+  :code:`workers` other than :code:`1`, evaluate the costs on
+  copies of the objective, so only the evaluations of the main
+  process, as the vectorized ones, share the memoized results.
+"""
+
+import hashlib
+
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+
+# The number of results kept
+MEMO_SIZE = 4096
+
+# The significant digits of the rounded keys
+DIGITS = 10
+
+# The cache statistics
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "size", "maxsize"])
+
+
+class LRUCache:
+  """
+    The least recently used cache, with its hit and miss statistics.
+  """
+
+  def __init__(self, maxsize=MEMO_SIZE):
+    """
+      :param int maxsize: The number of values kept. Default is :code:`MEMO_SIZE`.
+    """
+    self.maxsize = maxsize
+    self.hits, self.misses = 0, 0
+    self._values = OrderedDict()
+
+  def get(self, key):
+    """
+      The method that returns a cached value, marking it
+      as the most recently used one.
+
+      :param tuple key: The value key.
+
+      :return: The cached value, or :code:`None` if it is not cached.
+      :rtype: object
+    """
+    value = self._values.get(key)
+    if value is None:
+      self.misses += 1
+      return None
+    self.hits += 1
+    self._values.move_to_end(key)
+    return value
+
+  def put(self, key, value):
+    """
+      The method that stores a value, evicting the least
+      recently used ones beyond the cache size.
+
+      :param tuple key: The value key.
+      :param object value: The value.
+    """
+    self._values[key] = value
+    self._values.move_to_end(key)
+    while len(self._values) > self.maxsize:
+      self._values.popitem(last=False)
+
+  def clear(self):
+    """
+      The method that removes every value and resets the statistics.
+    """
+    self._values.clear()
+    self.hits, self.misses = 0, 0
+
+  def info(self):
+    """
+      The method that returns the cache statistics.
+
+      :return: The hits, misses, size and maximum size of the cache.
+      :rtype: CacheInfo
+    """
+    return CacheInfo(self.hits, self.misses, len(self._values), self.maxsize)
+
+
+def quantize(values, digits=DIGITS):
+  """
+    The function that rounds the values to a number of
+    significant digits, as the bytes of the rounded array.
+
+    :param array values: The values to be rounded.
+    :param int digits: The significant digits. Default is :code:`DIGITS`.
+
+    :return: The rounded values bytes.
+    :rtype: bytes
+  """
+  values = np.asarray(values, dtype=np.float64)
+  magnitude = np.abs(values)
+  exponent = np.floor(np.log10(np.where(magnitude > 0, magnitude, 1.0)))
+  scale = 10.0 ** (digits - 1 - exponent)
+  return (np.round(values * scale) / scale).tobytes()
+
+
+def _digest(value, digest):
+  # The arrays of a nested dataset, in order
+  if isinstance(value, (list, tuple)):
+    digest.update(b"(")
+    for item in value:
+      _digest(item, digest)
+    digest.update(b")")
+  else:
+    array = np.ascontiguousarray(value)
+    digest.update(str((array.dtype, array.shape)).encode())
+    digest.update(array.data)
+
+
+def data_key(*values):
+  """
+    The function that computes the hash of the data, as the
+    time grid or the cost function parameters.
+
+    :param object values: The arrays, or nested lists of them.
+
+    :return: The data hash.
+    :rtype: string
+  """
+  digest = hashlib.sha1()
+  _digest(values, digest)
+  return digest.hexdigest()
+
+
+class Memo:
+  """
+    The memoized results of the simulations and of the costs
+    of a model.
+  """
+
+  def __init__(self, maxsize=MEMO_SIZE, digits=DIGITS):
+    """
+      :param int maxsize: The number of results kept. Default is :code:`MEMO_SIZE`.
+      :param int digits: The significant digits of the rounded keys. Default is :code:`DIGITS`.
+    """
+    self.digits = digits
+    self.cache = LRUCache(maxsize)
+
+  def __getstate__(self):
+    # The copies sent to the workers start empty
+    state = self.__dict__.copy()
+    state["cache"] = LRUCache(self.cache.maxsize)
+    return state
+
+  def simulate(self, function, initial, time, theta):
+    """
+      The method that returns the memoized simulation, or
+      simulates and keeps it.
+
+      :param function function: The simulation, as :code:`function(initial, time, theta)`.
+      :param array initial: The initial values of the model compartments.
+      :param array time: The time points to simulate the model.
+      :param array theta: The model parameters.
+
+      :return: The simulated compartments.
+      :rtype: tuple
+    """
+    key = ("simulate", quantize(theta, self.digits), quantize(initial, self.digits),
+      data_key(time))
+    result = self.cache.get(key)
+    if result is None:
+      result = function(initial, time, theta)
+      self.cache.put(key, result)
+    return result
+
+  def cost(self, function, pars, args):
+    """
+      The method that returns the memoized costs of the
+      candidates, computing only the ones not kept, all
+      together when the candidates are a population.
+
+      :param function function: The cost function, as :code:`function(pars, *args)`.
+      :param array pars: The candidate parameters, or the :code:`(P, n_params)` population.
+      :param tuple args: The cost function parameters.
+
+      :return: The cost of the candidate, or of each one.
+      :rtype: float or array
+    """
+    # The data is hashed by its contents, so the arrays
+    # changed in place are not served stale costs
+    data = data_key(*args)
+    if np.ndim(pars) < 2:
+      key = ("cost", quantize(pars, self.digits), data)
+      cost = self.cache.get(key)
+      if cost is None:
+        cost = function(pars, *args)
+        self.cache.put(key, cost)
+      return cost
+    pars = np.asarray(pars)
+    keys = [("cost", quantize(p, self.digits), data) for p in pars]
+    costs = np.empty(len(pars))
+    missing = []
+    for k, key in enumerate(keys):
+      cost = self.cache.get(key)
+      if cost is None:
+        missing.append(k)
+      else:
+        costs[k] = cost
+    if len(missing) > 0:
+      costs[missing] = function(pars[missing], *args)
+      for k in missing:
+        self.cache.put(keys[k], costs[k])
+    return costs
+
+  def info(self):
+    """
+      The method that returns the memoization statistics.
+
+      :return: The hits, misses, size and maximum size of the cache.
+      :rtype: CacheInfo
+    """
+    return self.cache.info()
+
+  def clear(self):
+    """
+      The method that removes every memoized result.
+    """
+    self.cache.clear()
@@ -0,0 +1,70 @@
+"""
+  The peak analysis of the infected forecasts. The peaks of a
+  whole ensemble of forecasts, as the time shift predictions
+  or the Monte Carlo runs, are found together, with the
+  ensemble confidence bands of the peak day and height.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+# The peak of each forecast and the ensemble
+# bands, as the quantiles of the peak values
+Peaks = namedtuple("Peaks", ["day", "height", "bands"])
+
+
+def _growth(forecasts):
+  """
+    The function that finds the last day with a non negative
+    derivative of each forecast, and if the forecast grows at
+    all, from the end of each forecast.
+  """
+  dI = np.gradient(forecasts, axis=1)
+  signal = dI[:, ::-1] >= 0
+  last = forecasts.shape[1] - 1 - np.argmax(signal, axis=1)
+  return last, signal.any(axis=1)
+
+
+def peak_days(forecasts):
+  """
+    The function that finds the peak day of each forecast, as
+    the day after the last day with a non negative derivative,
+    the convention of the :code:`peak_est` rows uploaded by the
+    update service. A forecast still growing at its end, or one
+    that never grows, peaks at its horizon.
+
+    :param array forecasts: The forecasts with shape :code:`(n_forecasts, horizon)`, or a single one.
+
+    :return: The peak day of each forecast.
+    :rtype: array
+  """
+  forecasts = np.atleast_2d(forecasts)
+  last, grows = _growth(forecasts)
+  return np.where(grows, last + 1, forecasts.shape[1])
+
+
+def peak_analysis(forecasts, quantiles=(0.05, 0.5, 0.95)):
+  """
+    The function that finds the peak day and height of every
+    forecast of the ensemble, and the ensemble bands. The day
+    follows the :code:`peak_days` convention, and the height is
+    the value at the last growing day.
+
+    :param array forecasts: The forecasts with shape :code:`(n_forecasts, horizon)`.
+    :param tuple quantiles: The quantiles of the bands. Default is :code:`(0.05, 0.5, 0.95)`.
+
+    :return: The peak days, the peak heights and the bands of both, by quantile.
+    :rtype: Peaks
+  """
+  forecasts = np.atleast_2d(forecasts)
+  last, grows = _growth(forecasts)
+  day = np.where(grows, last + 1, forecasts.shape[1])
+  # The height at the last growing day, or
+  # at the first one if it never grows
+  height = forecasts[np.arange(len(forecasts)), np.where(grows, last, 0)]
+  bands = dict(
+    day=dict(zip(quantiles, np.quantile(day, quantiles))),
+    height=dict(zip(quantiles, np.quantile(height, quantiles))))
+  return Peaks(day, height, bands)
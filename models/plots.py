@@ -0,0 +1,136 @@
+"""
+  The summary plots of the estimated models, with the bokeh
+  plotting stack. It is loaded only when a summary is asked,
+  so the fitting does not import the plotting stack, and the
+  notebook output is set up on its first import.
+"""
+
+import os
+
+from bokeh.models   import LinearAxis, Range1d
+from bokeh.plotting import figure
+from bokeh.layouts  import column
+from bokeh.io       import output_notebook, export_png
+
+output_notebook()
+
+# Default plot configs
+TOOLS = "pan,zoom_in,zoom_out,save"
+PLOT_WIDTH = 600
+PLOT_HEIGHT = 400
+
+
+def result_summary(model,
+    out_plot=False,
+    plot_size=[600,400],
+    save_results=False,
+    folder_path="./",
+    file_name="SIR_result_summary.png"
+    ):
+  """
+    Function responsible for building a proper summary plot of 
+    the estimate process of the SIR model.
+
+    :param SIR model: The model estimated by :code:`fit_multiple`.
+    :param bool out_plot: Flag to output the bokeh.figure object.
+    :param list plot_size: List with the plot size as `[width, height]`.
+    :param bool save_results: Flag to save the results as a .png image.
+    :param string folder_path: The path to the folder the user wants to save resulted image.
+    :param string file_name: The name of the resulted image that will be saved.
+
+    :return: If `out_plot=True`, it returns a bokeh.figure object with the builded plots.
+    :rtype: bokeh.figure
+  
+  """
+  # Getting the estimation dataset
+  estimation_data = model.data
+  #Building the estimated parameter info
+  r = estimation_data["pars"]["r"]
+  beta = estimation_data["pars"]["beta"]
+  years = [int(t) for t in estimation_data["time"]]
+
+  # Creating the parameter plot
+  p = figure(
+    tools="hover",
+    y_range=(min(beta), max(beta)), 
+    plot_width=plot_size[0], 
+    plot_height=plot_size[1]
+  )
+
+  # Plotting the beta parameter
+  p.line(years, beta, 
+    legend_label="beta", 
+    line_width=4, 
+    color="#c2185b", 
+    line_cap='round', 
+    line_alpha=0.9
+  )
+  # Creating the extra y axis for plotting the r parameter
+  p.extra_y_ranges = {"r_axis": Range1d(start=min(r), end=max(r))}
+  p.add_layout(LinearAxis(y_range_name="r_axis"), 'left')
+  # Plotting the r parameter
+  p.line(years, r, 
+    y_range_name="r_axis", 
+    line_dash='dashed',
+    legend_label="r", 
+    line_width=3, 
+    color="#8e44ad", 
+    line_cap='round', 
+    line_alpha=0.9
+  )
+  # Building figure background
+  p.grid.grid_line_alpha = 0
+  p.ygrid.band_fill_color = "olive"
+  p.ygrid.band_fill_alpha = 0.1
+  p.xaxis.axis_label = "Ano"
+  p.toolbar.autohide = True
+  # Creating the estimation plot
+  p1 = figure(
+    tools="hover",
+    x_range=p.x_range,
+    plot_width=plot_size[0], 
+    plot_height=plot_size[1]
+  )
+  # Plotting the full data
+  p1.line(estimation_data["full"]["t"], estimation_data["full"]["I"],
+    legend_label="Casos", 
+    line_width=2, 
+    color="#f4511e", 
+    line_cap='round', 
+    line_alpha=0.9
+  )
+  # Plotting the windowed original data
+  for dataset in estimation_data["data"]["original"]:
+    p1.line(dataset["t"], dataset["I"], 
+      legend_label="Casos", 
+      line_width=4, 
+      color="#f4511e", 
+      line_cap='round', 
+      line_alpha=0.9
+    )
+  # Plotting the estimated data
+  for dataset in estimation_data["data"]["simulated"]:
+    p1.line(dataset["t"], dataset["I"], 
+      line_dash='dashed',
+      legend_label="Estimado", 
+      line_width=3, 
+      color="#0288d1", 
+      line_cap='round', 
+      line_alpha=0.9
+    )
+  # Buildging figure background
+  p1.grid.grid_line_alpha = 0
+  p1.ygrid.band_fill_color = "olive"
+  p1.ygrid.band_fill_alpha = 0.1
+  p1.yaxis.axis_label = "Indivíduos"
+  p1.xaxis.axis_label = "Ano"
+  p1.toolbar.autohide = True
+
+  if save_results:
+    if not os.path.exists(folder_path):
+      os.mkdir(folder_path)
+    file_path = folder_path + file_name
+    export_png(column(p,p1), filename=file_path)
+  if out_plot:
+    return column(p,p1)
+
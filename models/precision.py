@@ -0,0 +1,68 @@
+"""
+  The floating point policy of the discrete simulators and of
+  the cost functions. The default :code:`float128` policy keeps
+  the extended precision Euler arithmetic of the former models,
+  so the stored fits are reproduced. The :code:`float64` policy
+  runs on the native type, and with the compiled kernels, and the
+  :code:`compensated` one stays on float64 but accumulates the
+  simulation steps and the error means with compensated summation.
+"""
+
+import math
+import numpy as np
+
+
+# The floating point types of each precision
+# policy. The compensated policy runs on the
+# native float64 type, but accumulates the
+# simulation steps and the error means with
+# compensated summation.
+PRECISION_TYPES = {
+  "float64": np.float64,
+  "float128": getattr(np, "float128", np.longdouble),
+  "compensated": np.float64
+}
+
+# The policy of the models
+DEFAULT = "float128"
+
+
+def dtype(self):
+  """
+    The function that returns the floating point type used
+    by the simulators and cost functions of the model.
+
+    :return: The numpy floating point type of the model precision.
+    :rtype: type
+  """
+  return PRECISION_TYPES[getattr(self, "precision", DEFAULT)]
+
+
+def compensated(self):
+  """
+    The function that checks if the model runs with the
+    compensated summation policy.
+
+    :return: If the compensated summation must be used.
+    :rtype: bool
+  """
+  return getattr(self, "precision", DEFAULT) == "compensated"
+
+
+def mean(self, values, axis=None):
+  """
+    The function that computes the mean of the values
+    following the precision policy of the model.
+
+    :param array values: The values to be averaged.
+    :param int axis: The axis along which the mean is computed. Default is :code:`None`.
+
+    :return: The mean of the values.
+    :rtype: float or array
+  """
+  if not compensated(self):
+    return np.mean(values, axis=axis)
+  values = np.asarray(values, dtype=np.float64)
+  if axis is None:
+    return math.fsum(values.ravel()) / values.size
+  return np.apply_along_axis(math.fsum, axis, values) / values.shape[axis]
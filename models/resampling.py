@@ -0,0 +1,72 @@
+"""
+  The resampling and filtering of the epidemy windows, with a
+  cache of the results. The suceptible and infected series of
+  a window are resampled together, with a single FFT, and the
+  resampled and filtered windows are kept by the data hash,
+  the window bounds, the resample length and the filter
+  configuration, so the windows of a dataset refitted with
+  other sensitivities are not computed again. The least
+  recently used windows are evicted to bound the memory.
+"""
+
+import numpy as np
+
+from . import memo as mm
+
+
+# The number of windows kept by the cache
+CACHE_SIZE = 64
+
+# The filter of the resampled windows
+FILTER = "hamming"
+
+
+class WindowCache(mm.LRUCache):
+  """
+    The least recently used cache of the preprocessed windows.
+  """
+
+
+# The cache shared by the fitting methods
+cache = WindowCache(CACHE_SIZE)
+
+
+def resample_window(S, I, t, num, filt_window=None, key=None):
+  """
+    The function that resamples the suceptible and infected
+    series of a window, and filters them if a filter window is
+    given. With a key, as the dataset hash and the window
+    bounds, the result is cached, and the cached arrays are
+    read only.
+
+    :param array S: The suceptible window.
+    :param array I: The infected window.
+    :param array t: The time of the window samples.
+    :param int num: The number of resampled samples.
+    :param int filt_window: The window size of the filter, or :code:`None` to not filter. Default is :code:`None`.
+    :param tuple key: The dataset hash and the window bounds, or :code:`None` to not cache. Default is :code:`None`.
+
+    :return: The resampled suceptible, infected and time arrays.
+    :rtype: tuple
+  """
+  if key is not None:
+    key = (key, num, filt_window, FILTER)
+    window = cache.get(key)
+    if window is not None:
+      return window
+  # The signal processing stacks are loaded
+  # only when a window is resampled
+  import scipy.signal as scs
+  from PyAstronomy import pyasl
+  # Both series in a single FFT
+  data, t_res = scs.resample(np.vstack((S, I)), num, t=t, axis=1)
+  Sd_res, Id_res = data[0], data[1]
+  if filt_window is not None:
+    Sd_res = pyasl.smooth(Sd_res, filt_window, FILTER)
+    Id_res = pyasl.smooth(Id_res, filt_window, FILTER)
+  window = Sd_res, Id_res, t_res
+  if key is not None:
+    for array in window:
+      array.setflags(write=False)
+    cache.put(key, window)
+  return window
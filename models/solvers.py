@@ -0,0 +1,156 @@
+"""
+  The ODE solvers of the continuous simulation. A solver
+  holds the integration method, as the adaptive :code:`LSODA`,
+  :code:`Radau`, :code:`BDF`, :code:`RK45` and :code:`DOP853`
+  ones of :code:`solve_ivp`, or the fixed-step :code:`RK4`,
+  with its tolerances, and always returns the compartments as
+  an array over the time points, or as a dense callable of
+  the time. The :code:`auto` method is :code:`LSODA`, that
+  switches between the stiff and non stiff integration as
+  the epidemy evolves.
+"""
+
+import numpy as np
+
+from scipy import integrate, interpolate
+
+
+# The integration methods, where the
+# auto method picks the default one
+METHODS = ["auto", "LSODA", "Radau", "BDF", "RK45", "DOP853", "RK4"]
+AUTO_METHOD = "LSODA"
+
+
+class Solver:
+  """
+    The configuration of the ODE integration.
+  """
+
+  def __init__(self, method="auto", rtol=1e-6, atol=1e-6, max_step=np.inf, substeps=1):
+    """
+      :param string method: The integration method, one of :code:`METHODS`. Default is :code:`"auto"`.
+      :param float rtol: The relative tolerance of the adaptive methods. Default is :code:`1e-6`.
+      :param float atol: The absolute tolerance of the adaptive methods. Default is :code:`1e-6`.
+      :param float max_step: The maximum step of the adaptive methods. Default is :code:`inf`.
+      :param int substeps: The steps of the :code:`RK4` method between each time point. Default is :code:`1`.
+    """
+    if method not in METHODS:
+      raise ValueError("Unknown method {}! Use one of {}".format(method, METHODS))
+    self.method = AUTO_METHOD if method == "auto" else method
+    self.rtol = rtol
+    self.atol = atol
+    self.max_step = max_step
+    self.substeps = substeps
+
+  def __repr__(self):
+    return "Solver(method={!r}, rtol={}, atol={}, max_step={}, substeps={})".format(
+      self.method, self.rtol, self.atol, self.max_step, self.substeps)
+
+  def solve(self, model, initial, time, args=()):
+    """
+      The method that integrates the model over the time points.
+
+      :param function model: The model derivative, as :code:`model(y, t, *args)`.
+      :param array initial: The initial values of the model compartments.
+      :param array time: The time points to simulate the model.
+      :param tuple args: The extra arguments of the model. Default is :code:`()`.
+
+      :return: The simulated compartments with shape :code:`(n, T)`.
+      :rtype: array
+    """
+    time = np.asarray(time, dtype=np.float64)
+    if self.method == "RK4":
+      return rk4(model, initial, time, args, self.substeps)
+    solution = self._solve_ivp(model, initial, time, args, dense_output=False)
+    return solution.y
+
+  def dense(self, model, initial, time, args=()):
+    """
+      The method that integrates the model over the time span,
+      returning the continuous solution.
+
+      :param function model: The model derivative, as :code:`model(y, t, *args)`.
+      :param array initial: The initial values of the model compartments.
+      :param array time: The time points of the span, or its bounds.
+      :param tuple args: The extra arguments of the model. Default is :code:`()`.
+
+      :return: The solution, that returns the compartments with shape :code:`(n, T)` at any times of the span.
+      :rtype: function
+    """
+    time = np.asarray(time, dtype=np.float64)
+    if self.method == "RK4":
+      # The cubic interpolation of the steps,
+      # with the model derivative at each one
+      result = rk4(model, initial, time, args, self.substeps)
+      derivative = np.array([model(y, t, *args) for y, t in zip(result.T, time)]).T
+      return interpolate.CubicHermiteSpline(time, result, derivative, axis=1)
+    solution = self._solve_ivp(model, initial, time[[0, -1]], args, dense_output=True)
+    return solution.sol
+
+  def _solve_ivp(self, model, initial, time, args, dense_output):
+    solution = integrate.solve_ivp(
+      lambda t, y: model(y, t, *args),
+      (time[0], time[-1]),
+      np.asarray(initial, dtype=np.float64),
+      method=self.method,
+      t_eval=None if dense_output else time,
+      dense_output=dense_output,
+      rtol=self.rtol,
+      atol=self.atol,
+      max_step=self.max_step)
+    if not solution.success:
+      raise RuntimeError("The {} integration failed: {}".format(self.method, solution.message))
+    return solution
+
+
+def rk4(model, initial, time, args=(), substeps=1):
+  """
+    The function that integrates the model with the classic
+    fixed-step Runge-Kutta method, with the given steps between
+    each pair of time points.
+
+    :param function model: The model derivative, as :code:`model(y, t, *args)`.
+    :param array initial: The initial values of the model compartments.
+    :param array time: The time points to simulate the model.
+    :param tuple args: The extra arguments of the model. Default is :code:`()`.
+    :param int substeps: The steps between each time point. Default is :code:`1`.
+
+    :return: The simulated compartments with shape :code:`(n, T)`.
+    :rtype: array
+  """
+  def f(y, t):
+    return np.asarray(model(y, t, *args), dtype=np.float64)
+
+  result = np.empty((len(initial), len(time)))
+  result[:,0] = initial
+  y = result[:,0].copy()
+  for k in range(len(time) - 1):
+    h = (time[k+1] - time[k]) / substeps
+    t = time[k]
+    for _ in range(substeps):
+      k1 = f(y, t)
+      k2 = f(y + h / 2 * k1, t + h / 2)
+      k3 = f(y + h / 2 * k2, t + h / 2)
+      k4 = f(y + h * k3, t + h)
+      y = y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+      t += h
+    result[:,k+1] = y
+  return result
+
+
+def get(solver=None):
+  """
+    The function that builds the solver of a configuration.
+
+    :param object solver: A :code:`Solver`, the method name, the :code:`Solver` options dictionary or :code:`None` for the default one.
+
+    :return: The solver.
+    :rtype: Solver
+  """
+  if solver is None:
+    return Solver()
+  if isinstance(solver, Solver):
+    return solver
+  if isinstance(solver, str):
+    return Solver(method=solver)
+  return Solver(**solver)
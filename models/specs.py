@@ -0,0 +1,291 @@
+"""
+  The model specifications and the picklable objective of
+  the stochastic search. Each :code:`SIR` instance binds its
+  own specification, so differently configured models never
+  share the selected functions, and the search algorithms
+  receive only the lightweight objective, instead of the
+  whole :code:`SIR` state.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy import integrate
+
+from . import differential_models as dm
+from . import cost_functions as cm
+from . import discrete_models as dcm
+from . import kernels as kn
+from . import trace as tr
+from . import solvers as sv
+from . import precision as pc
+
+
+# The immutable specification of a model, with
+# the module level functions used to simulate
+# and to compute the cost of each candidate, and
+# the sensitivities used by the gradient refinement
+ModelSpec = namedtuple("ModelSpec", [
+  "name", "differential_model", "batch_model", "cost_function",
+  "jacobian", "cost_gradient"], defaults=(None, None))
+
+
+def select(focus, simulation="discrete"):
+  """
+    The function that selects the model specification for the
+    model focus and simulation type.
+
+    :param list focus: The model compartments, e.g. :code:`["S", "I", "R"]`.
+    :param string simulation: The simulation type. Default is :code:`"discrete"`.
+
+    :return: The model specification.
+    :rtype: ModelSpec
+  """
+  discrete = simulation == "discrete"
+  if 'D' in focus:
+    if discrete:
+      return ModelSpec("SIRD", dcm.SIRD, dcm.SIRD_batch, cm.cost_SIRD,
+        dm.SIRD_jacobian, cm.gradient_SIRD)
+    return ModelSpec("SIRD", dm.SIRD, None, cm.cost_SIRD,
+      dm.SIRD_jacobian, cm.gradient_SIRD)
+  elif 'E' in focus:
+    if discrete:
+      return ModelSpec("SEIR", dcm.SEIR, dcm.SEIR_batch, cm.cost_SEIR,
+        dm.SEIR_jacobian, cm.gradient_SEIR)
+    return ModelSpec("SEIR", dm.SEIR, None, cm.cost_SEIR,
+      dm.SEIR_jacobian, cm.gradient_SEIR)
+  elif 'N' in focus:
+    return ModelSpec("NSIR", dm.NSIR, None, cm.cost_NSIR)
+  if discrete:
+    return ModelSpec("SIR", dcm.SIR, dcm.SIR_batch, cm.cost_SIR,
+      dm.SIR_jacobian, cm.gradient_SIR)
+  return ModelSpec("SIR", dm.SIR, None, cm.cost_SIR,
+    dm.SIR_jacobian, cm.gradient_SIR)
+
+
+class Objective:
+  """
+    The picklable objective of the search algorithms. It carries
+    only the model specification and the configuration needed to
+    simulate and compute the cost of the candidates.
+  """
+
+  def __init__(self, spec, N,
+      focus=["I","R"],
+      simulation="discrete",
+      precision=pc.DEFAULT,
+      search_pop=False,
+      compiled=True,
+      ode_full_output=False,
+      solver=None,
+      memo=None,
+      iter_error=None):
+    self.spec = spec
+    self.N = N
+    self.focus = focus
+    self.simulation = simulation
+    self.precision = precision
+    self.compiled = compiled
+    self.ode_full_output = ode_full_output
+    self.solver = sv.get(solver)
+    self._search_pop = search_pop
+    self._iter_error = tr.Trace(initial=10**14) if iter_error is None else iter_error
+    self.memo = memo
+
+  def __call__(self, pars, *args):
+    return self.cost_function(pars, *args)
+
+  @property
+  def kernel(self):
+    """
+      The compiled kernels of the model, if the numba backend
+      exists and the compiled option is set.
+    """
+    return kn.get(self.spec.name) if self.compiled else None
+
+  def differential_model(self, *args):
+    return self.spec.differential_model(self, *args)
+
+  def batch_model(self, *args):
+    return self.spec.batch_model(self, *args)
+
+  def cost_function(self, pars, *args):
+    if self.memo is not None:
+      return self.memo.cost(self._cost_function, pars, args)
+    return self.spec.cost_function(self, pars, *args)
+
+  def _cost_function(self, pars, *args):
+    return self.spec.cost_function(self, pars, *args)
+
+  def cost_gradient(self, pars, *args):
+    """
+      The method that computes the cost and its gradient by the
+      parameters, from the forward sensitivities of the model.
+
+      :param array pars: The candidate parameters.
+      :param tuple *args: cost function parameters
+
+      :return: The cost and its gradient.
+      :rtype: tuple
+    """
+    if self.spec.cost_gradient is None:
+      raise ValueError("The {} model has no sensitivities!".format(self.spec.name))
+    return self.spec.cost_gradient(self, pars, *args)
+
+  def vectorized(self, x, *args):
+    """
+      The method responsible for computing the cost when the
+      search algorithm evaluates the whole population at once,
+      as the differential evolution does with :code:`vectorized=True`.
+
+      :param array x: The candidates matrix with shape :code:`(n_params, S)`.
+      :param tuple *args: cost function parameters
+
+      :return: the cost of each candidate
+      :rtype: array
+    """
+    response = self.cost_function(np.asarray(x).T, *args)
+    return np.asarray(response, dtype=np.float64)
+
+  def simulate(self, initial, time, theta):
+    """
+      The function that simulate the differential SIR
+      model, by computing the integration of the
+      differential equations.
+
+      :param array initial: The initial values of the infected and suceptible data.
+      :param array time: The time points to simulate the model.
+      :param array theta: The Beta parameter, and r parameter, respectivelly.
+
+      :return: The values of the suceptible and infected, at time, respectivelly.
+      :rtype: tuple
+    """
+    if self.memo is not None:
+      return self.memo.simulate(self._simulate, initial, time, theta)
+    return self._simulate(initial, time, theta)
+
+  def _simulate(self, initial, time, theta):
+    # The compiled kernels, when available,
+    # avoid the python overhead of each step
+    kernel = self.kernel
+    if self.simulation == "continuous":
+      model, args = self._rhs(theta)
+      result = integrate.odeint(
+        model,
+        initial,
+        time,
+        args=args,
+        full_output=self.ode_full_output
+      ).T
+    elif self.simulation == "ivp_continuous":
+      model, args = self._rhs(theta)
+      result = tuple(self.solver.solve(model, initial, time, args))
+    elif kernel is not None and self.precision == "float64":
+      result = tuple(self._kernel_population(
+        kernel, initial, time, [theta])[0])
+    else:
+      result = self.differential_model(
+        initial, time, theta)
+    return result
+
+  def _rhs(self, theta):
+    """
+      The function that returns the model derivative of the 
+      continuous simulation, compiled when available, with its
+      extra arguments.
+    """
+    kernel = self.kernel
+    if kernel is not None:
+      return kernel.rhs, (kernel.rates(theta), float(self.N))
+    return self.differential_model, (theta,)
+
+  def simulate_dense(self, initial, time, theta):
+    """
+      The function that integrates the continuous model with
+      the solver, returning the dense solution over the time
+      span.
+
+      :param array initial: The initial values of the model compartments.
+      :param array time: The time points of the span, or its bounds.
+      :param array theta: The model parameters.
+
+      :return: The solution, that returns the compartments with shape :code:`(n, T)` at any times of the span.
+      :rtype: function
+    """
+    model, args = self._rhs(theta)
+    return self.solver.dense(model, initial, time, args)
+
+  def simulate_sensitivity(self, initial, time, theta):
+    """
+      The function that simulates the model with its forward
+      sensitivities, following the Euler steps on the discrete
+      simulation, or integrating the sensitivity equations with
+      the model ones otherwise.
+
+      :param array initial: The initial values of the model compartments.
+      :param array time: The time points to simulate the model.
+      :param array theta: The model parameters.
+
+      :return: The simulated compartments with shape :code:`(n, T)`, their sensitivities by the parameters with shape :code:`(n, n_params, T)` and by the initial states with shape :code:`(n, n, T)`.
+      :rtype: tuple
+    """
+    jacobian = self.spec.jacobian
+    if jacobian is None:
+      raise ValueError("The {} model has no sensitivities!".format(self.spec.name))
+    if self.simulation == "discrete":
+      return dcm.sensitivity(self, initial, time, theta, jacobian)
+    n, m = len(initial), len(theta)
+    z0 = np.concatenate((
+      np.asarray(initial, dtype=np.float64), np.eye(n, m + n, m).ravel()))
+    z = integrate.odeint(
+      lambda z, t: dm.sensitivity(self, z, t, theta, jacobian, n), z0, time).T
+    sens = z[n:].reshape(n, m + n, len(time))
+    return z[:n], sens[:,:m], sens[:,m:]
+
+  def _kernel_population(self, kernel, initial, time, thetas):
+    """
+      The function that simulates a population of parameter sets
+      with the compiled Euler kernel of the model.
+
+      :param Kernel kernel: The compiled kernels of the model.
+      :param array initial: The initial values with shape :code:`(n,)` or :code:`(P, n)`.
+      :param array time: The time points to simulate the model.
+      :param array thetas: The parameters matrix with shape :code:`(P, n_params)`.
+
+      :return: The simulated compartments with shape :code:`(P, n, T)`.
+      :rtype: array
+    """
+    rates = np.array([kernel.rates(theta) for theta in thetas])
+    initial = np.atleast_2d(np.asarray(initial, dtype=np.float64))
+    initial = np.ascontiguousarray(
+      np.broadcast_to(initial, (len(rates), initial.shape[1])))
+    return kernel.euler(
+      initial, np.asarray(time, dtype=np.float64), rates, float(self.N))
+
+  def simulate_population(self, initial, time, thetas):
+    """
+      The function that simulates the model for a whole
+      population of parameter sets. When the model has a
+      batched discrete simulator, all the trajectories are
+      computed together, otherwise each one is simulated
+      on its own.
+
+      :param array initial: The initial values with shape :code:`(n,)` or :code:`(P, n)`.
+      :param array time: The time points to simulate the model.
+      :param array thetas: The parameters matrix with shape :code:`(P, n_params)`.
+
+      :return: The simulated compartments with shape :code:`(P, n, T)`.
+      :rtype: array
+    """
+    thetas = np.atleast_2d(thetas)
+    if self.simulation == "discrete":
+      kernel = self.kernel
+      if kernel is not None and self.precision == "float64":
+        return self._kernel_population(kernel, initial, time, thetas)
+      if self.spec.batch_model is not None:
+        return self.batch_model(initial, time, thetas)
+    # Simulate each trajectory on its own
+    initial = np.broadcast_to(initial, (len(thetas), np.shape(initial)[-1]))
+    return np.array([
+      np.array(self.simulate(list(y0), time, list(theta)))
+      for y0, theta in zip(initial, thetas)])
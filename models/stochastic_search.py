@@ -2,27 +2,26 @@
 
 import os
 import numpy as np
-import scipy.signal as scs
 
-from PyAstronomy import pyasl
-from scipy import integrate, interpolate
+from concurrent.futures import ProcessPoolExecutor
 
 from scipy.optimize import differential_evolution, dual_annealing
-from scipy.optimize import shgo, leastsq, NonlinearConstraint
-
-from bokeh.models   import ColumnDataSource, RangeTool, LinearAxis, Range1d
-from bokeh.palettes import brewer, Inferno10
-from bokeh.plotting import figure, show
-from bokeh.layouts  import column
-from bokeh.io       import output_notebook, export_png
+from scipy.optimize import shgo, leastsq, minimize, NonlinearConstraint
 
 from . import preprocessing as pp
 from . import differential_models as dm
 from . import cost_functions as cm
 from . import constraints as ct
 from . import discrete_models as dcm
-
-output_notebook()
+from . import trace as tr
+from . import solvers as sv
+from . import analytic as an
+from . import memo as mm
+from . import precision as pc
+from . import specs as sp
+from . import windows as wd
+from . import resampling as rs
+from . import workers as wk
 
 # import warnings
 # warnings.filterwarnings("error")
@@ -30,11 +29,6 @@ output_notebook()
 # Estimate response structure
 GLOBAL_ERROR_CONTROLLER = 10**14
 
-# Default plot configs
-TOOLS = "pan,zoom_in,zoom_out,save"
-PLOT_WIDTH = 600
-PLOT_HEIGHT = 400
-
 
 
 class SIR:
@@ -55,43 +49,53 @@ class SIR:
       stochastic_search=False,
       forced_search_pop=False,
       ode_full_output=False,
+      vectorized=False,
+      precision=pc.DEFAULT,
+      compiled=True,
+      solver=None,
+      memoize=0,
+      memo_digits=mm.DIGITS,
+      pool=None,
+      workers=-1,
       verbose=True):
     # Main constants
     self.N = pop
     self.focus = focus
     self.verbose = verbose
+    # The floating point policy of the
+    # simulators and cost functions
+    if precision not in pc.PRECISION_TYPES:
+      raise ValueError("Unknown precision {}! Use one of {}".format(
+        precision, list(pc.PRECISION_TYPES.keys())))
+    self.precision = precision
     # Local variables
     self.__mc_props = [0.5, 0.75, 0.9, 1.5]
     self.__search_alg = algorithm
     self.__ssearch = stochastic_search
+    self.__vectorized = vectorized
     # Semi Local variables
-    self._iter_error = [10**14]
+    self._iter_error = tr.Trace(initial=GLOBAL_ERROR_CONTROLLER)
     self._search_pop = forced_search_pop
     # Simulation type
     self.__sim_type = simulation
-    # Algorithm focus variables
-    if 'D' in self.focus:
-      if self.__sim_type == "discrete":
-        self.__class__.differential_model = dcm.SIRD
-      else:
-        self.__class__.differential_model = dm.SIRD
-      self.__class__.cost_function = cm.cost_SIRD
-    elif 'E' in self.focus:
-      self.__class__.differential_model = dm.SEIR
-      self.__class__.cost_function = cm.cost_SEIR
-    elif 'N' in self.focus:
-      self.__class__.differential_model = dm.NSIR
-      self.__class__.cost_function = cm.cost_NSIR
-    else:
-      if self.__sim_type == "discrete":
-        self.__class__.differential_model = dcm.SIR
-      else:
-        self.__class__.differential_model = dm.SIR
-      self.__class__.cost_function = cm.cost_SIR
+    # The model specification, bound to 
+    # this instance and its compiled kernels
+    self.spec = sp.select(self.focus, self.__sim_type)
+    self.__compiled = compiled
     # The ODE full output option
     self.__ode_full_output = ode_full_output
-    # The preprocessing modules
-    self.__class__.learn_points = pp.define_learning_points
+    # The ODE solver of the ivp_continuous
+    # simulation, with its tolerances
+    self.solver = sv.get(solver)
+    # The memoized simulations and costs, kept
+    # by the rounded parameters, if any size
+    self.memo = mm.Memo(memoize, memo_digits) if memoize > 0 else None
+    # The worker pool of the searches, kept
+    # alive and reused by all the fits, or
+    # the number of processes of the shared
+    # persistent one, all the cores by default
+    self.pool = pool
+    self.workers = workers
 
     # Accumulating variables
     self.acc_error = dict()
@@ -118,6 +122,43 @@ class SIR:
       "time": []
     }
 
+  def objective(self):
+    """
+      The method that builds the picklable objective of the search 
+      algorithms, with only the model specification and the 
+      configuration needed to compute the cost of the candidates.
+      
+      :return: the objective of the current model configuration
+      :rtype: specs.Objective
+    """
+    return sp.Objective(self.spec, self.N,
+      focus=self.focus,
+      simulation=self.__sim_type,
+      precision=self.precision,
+      search_pop=self._search_pop,
+      compiled=self.__compiled,
+      ode_full_output=self.__ode_full_output,
+      solver=self.solver,
+      memo=self.memo,
+      iter_error=self._iter_error)
+
+  @property
+  def trace(self):
+    """
+      The optimization trace of the cost evaluations, to
+      monitor the convergence of the searches.
+    """
+    return self._iter_error
+
+  def differential_model(self, *args):
+    return self.spec.differential_model(self, *args)
+
+  def cost_function(self, *args):
+    return self.objective().cost_function(*args)
+
+  def learn_points(self, dataset=None):
+    return pp.define_learning_points(self, dataset)
+
   def cost_wrapper(self, *args):
     """
       The method responsible for wrapping the cost function. 
@@ -131,6 +172,41 @@ class SIR:
     response = self.cost_function(*args)
     return response
 
+  def _workers(self):
+    """
+      The method that returns the map of the worker pool of the
+      searches. It is the pool given to the model, as a
+      multiprocessing :code:`Pool` or a :code:`ProcessPoolExecutor`,
+      whose lifetime the caller controls. Otherwise, it is the
+      persistent pool of the workers module, kept alive across
+      the fits until :code:`workers.shutdown`, or the end of a
+      :code:`workers.session`, with all the cores for the default
+      :code:`workers=-1`. With :code:`workers=1` the searches
+      run serially.
+
+      :return: The map of the worker pool, or :code:`None` to run serially.
+      :rtype: function
+    """
+    if self.pool is not None:
+      return self.pool.map
+    if self.workers != 1:
+      return wk.pool(None if self.workers == -1 else self.workers).map
+    return None
+
+  def vectorized_cost_wrapper(self, x, *args):
+    """
+      The method responsible for wrapping the cost function when
+      the search algorithm evaluates the whole population at once,
+      as the differential evolution does with :code:`vectorized=True`.
+      
+      :param array x: The candidates matrix with shape :code:`(n_params, S)`.
+      :param tuple *args: cost function parameters
+      
+      :return: the cost of each candidate
+      :rtype: array
+    """
+    return self.objective().vectorized(x, *args)
+
 
   def simulate(self, initial, time, theta):
     """
@@ -145,27 +221,55 @@ class SIR:
       :return: The values of the suceptible and infected, at time, respectivelly.
       :rtype: tuple
     """
+    return self.objective().simulate(initial, time, theta)
 
-    if self.__sim_type == "continuous":
-      result = integrate.odeint(
-        self.differential_model, 
-        initial, 
-        time,
-        args=(theta),
-        full_output=self.__ode_full_output
-      ).T
-    elif self.__sim_type == "ivp_continuous":
-      result = integrate.solve_ivp(
-        self.differential_model,
-        (time[0], time[-1]), 
-        initial,
-        args=(theta),
-        t_eval=time
-      )
-    else:
-      result = self.differential_model(
-        initial, time, theta)
-    return result
+
+  def simulate_population(self, initial, time, thetas):
+    """
+      The function that simulates the model for a whole 
+      population of parameter sets. When the model has a 
+      batched discrete simulator, all the trajectories are 
+      computed together, otherwise each one is simulated 
+      on its own.
+      
+      :param array initial: The initial values with shape :code:`(n,)` or :code:`(P, n)`.
+      :param array time: The time points to simulate the model.
+      :param array thetas: The parameters matrix with shape :code:`(P, n_params)`.
+      
+      :return: The simulated compartments with shape :code:`(P, n, T)`.
+      :rtype: array
+    """
+    return self.objective().simulate_population(initial, time, thetas)
+
+
+  def simulate_dense(self, initial, time, theta):
+    """
+      The function that integrates the continuous model with 
+      the ODE solver, returning the dense solution.
+      
+      :param array initial: The initial values of the model compartments.
+      :param array time: The time points of the span, or its bounds.
+      :param array theta: The model parameters.
+      
+      :return: The solution, that returns the compartments at any times of the span.
+      :rtype: function
+    """
+    return self.objective().simulate_dense(initial, time, theta)
+
+
+  def simulate_sensitivity(self, initial, time, theta):
+    """
+      The function that simulates the model with its forward 
+      sensitivities, by the parameters and by the initial states.
+      
+      :param array initial: The initial values of the model compartments.
+      :param array time: The time points to simulate the model.
+      :param array theta: The model parameters.
+      
+      :return: The simulated compartments, their sensitivities by the parameters and by the initial states.
+      :rtype: tuple
+    """
+    return self.objective().simulate_sensitivity(initial, time, theta)
 
 
   def predict(self, initial, t):
@@ -204,11 +308,21 @@ class SIR:
       notified_sens=None,
       sample_ponder=None,
       optim_verbose=False,
+      warm_start=None,
+      warm_popsize=10,
+      warm_spread=0.01,
+      refine=None,
+      search_tol=None,
+      screen=0,
       **kwargs):
     """
       The method responsible for estimating a set of beta and r 
       parameters for the provided data set. It assumes that in 
-      the data there is only one epidemic period.
+      the data there is only one epidemic period. With the 
+      :code:`refine="gradient"` option, the global search optimum
+      is refined by a local search driven by the gradient of the 
+      cost, from the model sensitivities, instead of polishing it
+      with finite differences.
       
       :param array dataset: list with the respective arrays of Suceptible, Infected, Recovered and Deaths.
       :param array t: The time respective to each set of samples.
@@ -219,8 +333,18 @@ class SIR:
       :param list r_sens: The r parameter sensibility minimun and maximun boundaries, respectivelly. Default is :code:`[100,1000]`.
       :param bool sample_ponder: The flag to set the pondering of the non informative recovered data.
       :param bool optim_verbose: If :code:`True`, after fitting will show the optimization summary.
+      :param OptimizeResult warm_start: A previous search result, used to seed the search around its optimum. Default is :code:`None`.
+      :param int warm_popsize: The seeded population size multiplier, only if :code:`warm_start` is set. Default is :code:`10`.
+      :param float warm_spread: The minimum seeded spread, as a proportion of the bounds, only if :code:`warm_start` is set. Default is :code:`0.01`.
+      :param string refine: The refinement of the search optimum, :code:`"gradient"` or :code:`None`. Default is :code:`None`.
+      :param float search_tol: The differential evolution tolerance. Default is :code:`1e-6`, or :code:`1e-2` with the gradient refinement, that polishes the optimum.
+      :param int screen: The number of candidates screened with the semi-analytic SIR trajectories to seed the search, or :code:`0` to not screen. Default is :code:`0`.
       :param dict **kwargs: The optimization search algorithms options.
     """
+    if refine not in (None, "gradient"):
+      raise ValueError("Unknown refinement {}! Use \"gradient\" or None".format(refine))
+    if search_tol is None:
+      search_tol = 1e-6 if refine is None else 1e-2
     # Create the data values including
     # the Susceptible, Infected, 
     # Recovered and Death data into 
@@ -242,7 +366,7 @@ class SIR:
     # Check for possible zero values 
     # on the components and create 
     # the disconsideration indexes
-    self._consider_points = self.learn_points(S,I,R,D)
+    self._consider_points = self.learn_points(dataset)
     # Computing the approximate values 
     # of the parameters to build the 
     # parameter boundaries
@@ -304,43 +428,138 @@ class SIR:
     # controlled by the flag on the 
     # __init__ method.
     if self.__search_alg == "differential_evolution":
-      summary = differential_evolution(
-          self.cost_wrapper, 
-          list(zip(lower, upper)),
-          maxiter=10000,
-          popsize=60,
-          mutation=(0.5, 1.5),
-          strategy="best1exp",
-          tol=1e-6,
-          args=(datatrain, y0, t, w),
-          constraints=constraints,
-          updating='deferred',
-          workers=-1,
-          # disp=True
-        )
+      # The vectorized mode scores the whole 
+      # population in the main process, with
+      # a single batched simulation
+      objective = self.objective()
+      args, shared = (datatrain, y0, t, w), None
+      workers = self._workers()
+      if self.__vectorized:
+        cost, parallel = objective.vectorized, dict(vectorized=True)
+      elif workers is None:
+        cost, parallel = objective, dict()
+      else:
+        # The workers of the pool read the train
+        # data from shared memory, so only the
+        # handle of the block is sent with each task
+        shared = wk.SharedDataset(args)
+        cost, parallel = wk.SharedObjective(objective, shared), dict(workers=workers)
+        # The workers trace the costs on their own
+        # copies, so the best of each generation is
+        # evaluated again here, for the trace
+        parallel["callback"] = wk.record(cost)
+      # A warm start seeds the population 
+      # around the previous optimum
+      if warm_start is not None:
+        parallel["init"] = warmPopulation(
+          warm_start, lower, upper, warm_popsize, warm_spread)
+      # Otherwise, the screening seeds the population
+      # with the best of many candidates, scored on
+      # the cheap semi-analytic SIR trajectories
+      elif screen > 0 and self.spec.name == "SIR":
+        parallel["init"] = an.screen(
+          objective, lower, upper, (datatrain, y0, t, w), 
+          candidates=screen)
+      try:
+        summary = differential_evolution(
+            cost, 
+            list(zip(lower, upper)),
+            maxiter=10000,
+            popsize=60,
+            mutation=(0.5, 1.5),
+            strategy="best1exp",
+            tol=search_tol,
+            args=() if shared is not None else args,
+            constraints=constraints,
+            updating='deferred',
+            polish=refine is None,
+            **parallel
+            # disp=True
+          )
+      finally:
+        if shared is not None:
+          shared.close()
     elif self.__search_alg == "dual_annealing":
       summary = dual_annealing(
-          self.cost_wrapper, 
+          self.objective(), 
           list(zip(lower, upper)),
           maxiter=10000,
-          args=(datatrain, y0, t, w)
+          args=(datatrain, y0, t, w),
+          x0=None if warm_start is None else warm_start.x
         )
     elif self.__search_alg == "shgo":
       summary = shgo(
-          self.cost_wrapper,
+          self.objective(),
           list(zip(lower, upper)),
           n=500, iters=10,
           sampling_method="sobol",
           args=(datatrain, y0, t, w)
         )
+    # Refine the global optimum with the
+    # gradient from the model sensitivities
+    if refine == "gradient":
+      summary = self._refine(summary, lower, upper, constraints, (datatrain, y0, t, w))
     # Saving the estimated parameters
     self.parameters = summary.x
+    self.result = summary
     # Printing summary
     if self.verbose:
       print("\t └─ Defined at: ", self.parameters[0], " ─ ", self.parameters[1], "\n")
     if optim_verbose:
       print(summary)
 
+  def _refine(self, summary, lower, upper, constraints, args):
+    """
+      The method that refines the search optimum with a local 
+      search driven by the cost gradient, from the forward 
+      sensitivities of the model. The refined optimum is kept
+      only if it improves the cost.
+      
+      :param OptimizeResult summary: The global search result.
+      :param list lower: The parameters lower bounds.
+      :param list upper: The parameters upper bounds.
+      :param tuple constraints: The search constraints.
+      :param tuple args: The cost function parameters.
+      
+      :return: The search result, with the refinement result as :code:`refinement`.
+      :rtype: OptimizeResult
+    """
+    objective = self.objective()
+    # The constrained searches run with SLSQP,
+    # since L-BFGS-B supports only bounds
+    method = "SLSQP" if constraints else "L-BFGS-B"
+    refinement = minimize(
+      objective.cost_gradient,
+      np.clip(summary.x, lower, upper),
+      args=args,
+      jac=True,
+      method=method,
+      bounds=list(zip(lower, upper)),
+      constraints=constraints)
+    if refinement.fun < summary.fun:
+      summary.x, summary.fun = refinement.x, refinement.fun
+    summary.nfev += refinement.nfev
+    summary.refinement = refinement
+    if self.verbose:
+      print("\t ├─ Refined in ", refinement.nfev, " evaluations ─ ", refinement.fun)
+    return summary
+
+  def refit(self, dataset, t, warm_start=None, **kwargs):
+    """
+      The method responsible for re-estimating the parameters when 
+      new points are added to the dataset. The search starts from a
+      population seeded around the previous optimum and its spread, 
+      instead of a cold start over the whole bounds.
+      
+      :param array dataset: list with the respective arrays of Suceptible, Infected, Recovered and Deaths.
+      :param array t: The time respective to each set of samples.
+      :param OptimizeResult warm_start: The previous search result. Default is the last result of this model, if any.
+      :param dict **kwargs: The :code:`fit` method options.
+    """
+    if warm_start is None:
+      warm_start = getattr(self, "result", None)
+    self.fit(dataset, t, warm_start=warm_start, **kwargs)
+
   def fit_multiple(self, Sd, Id, Bd, td, 
       threshold_prop=1,
       cases_before=10,
@@ -349,12 +568,16 @@ class SIR:
       beta_sens=[100,10],
       r_sens=[100,10],
       out_type=0,
+      window_workers=1,
       **kwargs):
     """
       The method responsible for estimating a set of beta and r 
       parameters for each epidemy period existent in the provided
       dataset. It assumes that in the data there are several epidemic
-      periods.
+      periods. The windows are independent, so with :code:`window_workers`
+      greater than one they are fitted at the same time, each on its own
+      process, and the processes of each search are reduced to share 
+      the cores among the windows.
       
       :param array Sd: Array with the suceptible data.
       :param array Id: Array with the infected data.
@@ -367,6 +590,7 @@ class SIR:
       :param list beta_sens: The beta parameter sensibility minimun and maximun boundaries, respectivelly. Default is :code:`[100,100]`.
       :param list r_sens: The r parameter sensibility minimun and maximun boundaries, respectivelly. Default is :code:`[100,1000]`.
       :param int out_type: The output type, it can be :code:`1` or :code:`0`. Default is :code:`0`.
+      :param int window_workers: The number of windows fitted at the same time. Default is :code:`1`.
       
       :return: If the :code:`out_type=0`, it returns a tuple with the estimated beta and r, estimated, with the year of each respective window. If `out_type=1` it returns the self.data of the model, a summary with all model information.
       :rtype: tuple
@@ -376,6 +600,8 @@ class SIR:
       "B": Bd, "t": td }
     # Find the epidemy start and end points
     start, end = findEpidemyBreaks(Id, threshold_prop, cases_before)
+    # The dataset hash, to key the cached windows
+    data_key = mm.data_key(Sd, Id, td)
     # Check the window sizes
     if len(start) < 2:
       print("The windows are too small!")
@@ -391,7 +617,8 @@ class SIR:
     # parameter boundaries
     beta_approx = 1 
     r_approx = 1 / 10
-    # For each epidemy window
+    # Prepare the data of each epidemy window
+    windows = []
     for s, e in zip(start, end):
       if self.verbose:
         print("New iter::: ", self.iter_counter)
@@ -406,13 +633,10 @@ class SIR:
       y0 = int(S[0]), int(I[0])
       # Parameter weights
       w = [max(I)/max(S), 1]
-      # Resampling the data
-      Sd_res, t_res = scs.resample(S, int(t[-1]), t=t)
-      Id_res, t_res = scs.resample(I, int(t[-1]), t=t)
-      # Filtering the values
-      if filt_estimate:
-        Sd_res = pyasl.smooth(Sd_res, filt_window, 'hamming')
-        Id_res = pyasl.smooth(Id_res, filt_window, 'hamming')
+      # Resampling and filtering the data,
+      # or reading the cached window
+      Sd_res, Id_res, t_res = rs.resample_window(S, I, t, int(t[-1]),
+        filt_window=filt_window if filt_estimate else None, key=(data_key, s, e))
       # Computing the parameter bounds   
       x0 = [beta_approx, r_approx]
       lower = [x0[0]/beta_sens[0], x0[1]/r_sens[0]]
@@ -422,21 +646,32 @@ class SIR:
         print("\t ├─ beta ─  ", x0[0], "  r ─  ", x0[1])
         print("\t ├─ beta bound ─  ", lower[0], " ─ ", upper[0])
         print("\t ├─ r bound ─  ", lower[1], " ─ ", upper[1])
-      #(c, kvg) = leastsq(obj, theta0, args=(Sd_res, Id_res, y0, t_res, w))
-      c = differential_evolution(
-          self.cost_function, 
-          list(zip(lower, upper)),
-          maxiter=60000,
-          popsize=35,
-          mutation=(1.5, 1.99),
-          strategy="best1exp",
-          workers=-1,
-          updating='deferred',
-          tol=0.00001,
-          args=((Sd_res, Id_res), y0, t_res, w)
-        ).x
+      windows.append(dict(B=B, S=S, I=I, t=t, year_ref=year_ref, 
+        y0=y0, Sd_res=Sd_res, Id_res=Id_res, t_res=t_res,
+        bounds=list(zip(lower, upper)), args=((Sd_res, Id_res), y0, t_res, w)))
+    # Fit the windows, one after another with 
+    # all the cores on each search, or several 
+    # windows at once sharing the cores
+    objective = self.objective()
+    if window_workers > 1 and len(windows) > 1:
+      window_workers = min(window_workers, len(windows))
+      workers = max((os.cpu_count() or 1) // window_workers, 1)
+      with ProcessPoolExecutor(max_workers=window_workers) as pool:
+        estimates = list(pool.map(_fitWindow, 
+          [objective] * len(windows),
+          [window["bounds"] for window in windows],
+          [window["args"] for window in windows],
+          [workers] * len(windows)))
+    else:
+      estimates = [_fitWindow(objective, window["bounds"], window["args"],
+        workers=self._workers() or 1) for window in windows]
+    # Save the results of each window, in order
+    for window, c in zip(windows, estimates):
+      B, S, I, t = window["B"], window["S"], window["I"], window["t"]
+      Sd_res, Id_res, t_res = window["Sd_res"], window["Id_res"], window["t_res"]
+      year_ref = window["year_ref"]
       # Simulando os dados
-      [Sa, Ia] = self.simulate(y0, t_res, c)
+      [Sa, Ia] = self.simulate(window["y0"], t_res, c)
       # Save the year data
       self.data["data"]["original"].append(
         { "I": I, "B": B, "S": S, "t": t/365 + year_ref })
@@ -469,12 +704,19 @@ class SIR:
       beta_sens=[1000,10],
       r_sens=[1000,10],
       out_type=0,
+      chained=False,
+      warm_spread=0.001,
+      stable_tol=None,
+      stable_steps=3,
       **kwargs):
     """
       The method responsible for estimating a set of beta and r 
       parameters for each epidemy period existent in the provided
       dataset. It assumes that in the data there are several epidemic
-      periods.
+      periods. In the chained mode, each expanding window search starts
+      from the final population of the previous one, which differs only
+      by :code:`steps_indays` samples, and it may stop once the 
+      parameters are stable.
       
       :param array Sd: Array with the suceptible data.
       :param array Id: Array with the infected data.
@@ -487,6 +729,10 @@ class SIR:
       :param list beta_sens: The beta parameter sensibility minimun and maximun boundaries, respectivelly. Default is :code:`[100,100]`.
       :param list r_sens: The r parameter sensibility minimun and maximun boundaries, respectivelly. Default is :code:`[100,1000]`.
       :param int out_type: The output type, it can be :code:`1` or :code:`0`. Default is :code:`0`. 
+      :param bool chained: Flag to warm start each expanding window from the previous one. Default is :code:`False`.
+      :param float warm_spread: The minimum seeded spread, as a proportion of the bounds, only if :code:`chained=True`. Default is :code:`0.001`.
+      :param float stable_tol: The relative parameters change below which a window is stable, or :code:`None` to never stop early. Default is :code:`None`.
+      :param int stable_steps: The number of consecutive stable windows to stop early. Default is :code:`3`.
       
       :return: If the :code:`out_type=0`, it returns a tuple with the estimated beta and r, estimated, with the year of each respective window. If `out_type=1` it returns the self.data of the model, a summary with all model information.
       :rtype: tuple
@@ -496,6 +742,8 @@ class SIR:
       "B": Bd, "t": td }
     # Find the epidemy start and end points
     start, end = findEpidemyBreaks(Id, threshold_prop, cases_before)
+    # The dataset hash, to key the cached windows
+    data_key = mm.data_key(Sd, Id, td)
     # Check the window sizes
     if len(start) < 2:
       print("The windows are too small!")
@@ -527,13 +775,10 @@ class SIR:
       y0 = int(S[0]), int(I[0])
       # Parameter weights
       w = [max(I)/max(S), 1]
-      # Resampling the data
-      Sd_res, t_res = scs.resample(S, int(t[-1]), t=t)
-      Id_res, t_res = scs.resample(I, int(t[-1]), t=t)
-      # Filtering the values
-      if filt_estimate:
-        Sd_res = pyasl.smooth(Sd_res, filt_window, 'hamming')
-        Id_res = pyasl.smooth(Id_res, filt_window, 'hamming')
+      # Resampling and filtering the data,
+      # or reading the cached window
+      Sd_res, Id_res, t_res = rs.resample_window(S, I, t, int(t[-1]),
+        filt_window=filt_window if filt_estimate else None, key=(data_key, s, e))
       # Computing the parameter bounds   
       x0 = [beta_approx, r_approx]
       lower = [x0[0]/beta_sens[0], x0[1]/r_sens[0]]
@@ -549,24 +794,36 @@ class SIR:
       # Create the simulation steps
       initial_indexes = range(minimum_days, int(t[-1]), steps_indays)
       # Estimate for each sample set
-      mc_window_data = dict(pars=list(), time=list(), bounds=[s,e])
+      mc_window_data = dict(pars=list(), time=list(), bounds=[s,e], nfev=list())
+      previous, stable = None, 0
       for bound in initial_indexes:
         # Get only a fraction of the data
         S_, I_, t_ = Sd_res[:bound], Id_res[:bound], t_res[:bound]
+        # In the chained mode, seed the search
+        # with the previous final population
+        objective, workers = self.objective(), self._workers()
+        options = dict() if workers is None else dict(
+          callback=wk.record(objective, (S_, I_), y0, t_, w))
+        if chained and previous is not None:
+          options["init"] = warmPopulation(
+            previous, lower, upper, popsize=15, spread=warm_spread)
         # Minimize the cost funciton for 
         # the selected window
-        c = differential_evolution(
-          self.cost_function, 
+        summary = differential_evolution(
+          objective, 
           list(zip(lower, upper)),
           maxiter=60000, 
           popsize=15,
           mutation=(0.5, 1.5),
           strategy="best1exp",
-          workers=-1,
+          workers=workers or 1,
           updating='deferred',
           tol=0.00001,
-          args=((S_, I_), y0, t_, w)
-        ).x # <- Get only the parameters
+          args=((S_, I_), y0, t_, w),
+          **options
+        )
+        c = summary.x # <- Get only the parameters
+        mc_window_data["nfev"].append(summary.nfev)
         # Print some information
         sim_prop = initial_indexes.index(bound) / len(initial_indexes)
         if self.verbose and (sim_prop > self.__mc_props[self.__prop_ind]):
@@ -575,8 +832,23 @@ class SIR:
         # Save monte carlo estimated data
         mc_window_data["pars"].append(c)
         mc_window_data["time"].append(t_[-1]*365 + year_ref)
+        # Stop when the parameters are stable 
+        # along the last expanding windows
+        if stable_tol is not None and previous is not None:
+          change = np.max(np.abs(c - previous.x) / np.abs(previous.x))
+          stable = stable + 1 if change < stable_tol else 0
+          if stable >= stable_steps:
+            break
+        previous = summary
+      # The evaluations saved, estimated with the
+      # first window search, that is always cold
+      nfev = mc_window_data["nfev"]
+      mc_window_data["saved_nfev"] = int(
+        nfev[0] * len(initial_indexes) - sum(nfev)) if len(nfev) > 0 else 0
       if self.verbose and (sim_prop > 0.5):
         print("│  │ └─ Finished! ✓")
+      if self.verbose and (chained or stable_tol is not None):
+        print("│  ├─ Evaluations saved ─  ", mc_window_data["saved_nfev"])
       # Save the window data
       self.mc["results"][str(self.iter_counter-1)] = mc_window_data
       # Simulando os dados
@@ -620,97 +892,77 @@ class SIR:
       :rtype: bokeh.figure
     
     """
-    # Getting the estimation dataset
-    estimation_data = self.data
-    #Building the estimated parameter info
-    r = estimation_data["pars"]["r"]
-    beta = estimation_data["pars"]["beta"]
-    years = [int(t) for t in estimation_data["time"]]
-
-    # Creating the parameter plot
-    p = figure(
-      tools="hover",
-      y_range=(min(beta), max(beta)), 
-      plot_width=plot_size[0], 
-      plot_height=plot_size[1]
-    )
-
-    # Plotting the beta parameter
-    p.line(years, beta, 
-      legend_label="beta", 
-      line_width=4, 
-      color="#c2185b", 
-      line_cap='round', 
-      line_alpha=0.9
-    )
-    # Creating the extra y axis for plotting the r parameter
-    p.extra_y_ranges = {"r_axis": Range1d(start=min(r), end=max(r))}
-    p.add_layout(LinearAxis(y_range_name="r_axis"), 'left')
-    # Plotting the r parameter
-    p.line(years, r, 
-      y_range_name="r_axis", 
-      line_dash='dashed',
-      legend_label="r", 
-      line_width=3, 
-      color="#8e44ad", 
-      line_cap='round', 
-      line_alpha=0.9
-    )
-    # Building figure background
-    p.grid.grid_line_alpha = 0
-    p.ygrid.band_fill_color = "olive"
-    p.ygrid.band_fill_alpha = 0.1
-    p.xaxis.axis_label = "Ano"
-    p.toolbar.autohide = True
-    # Creating the estimation plot
-    p1 = figure(
-      tools="hover",
-      x_range=p.x_range,
-      plot_width=plot_size[0], 
-      plot_height=plot_size[1]
-    )
-    # Plotting the full data
-    p1.line(estimation_data["full"]["t"], estimation_data["full"]["I"],
-      legend_label="Casos", 
-      line_width=2, 
-      color="#f4511e", 
-      line_cap='round', 
-      line_alpha=0.9
-    )
-    # Plotting the windowed original data
-    for dataset in estimation_data["data"]["original"]:
-      p1.line(dataset["t"], dataset["I"], 
-        legend_label="Casos", 
-        line_width=4, 
-        color="#f4511e", 
-        line_cap='round', 
-        line_alpha=0.9
-      )
-    # Plotting the estimated data
-    for dataset in estimation_data["data"]["simulated"]:
-      p1.line(dataset["t"], dataset["I"], 
-        line_dash='dashed',
-        legend_label="Estimado", 
-        line_width=3, 
-        color="#0288d1", 
-        line_cap='round', 
-        line_alpha=0.9
-      )
-    # Buildging figure background
-    p1.grid.grid_line_alpha = 0
-    p1.ygrid.band_fill_color = "olive"
-    p1.ygrid.band_fill_alpha = 0.1
-    p1.yaxis.axis_label = "Indivíduos"
-    p1.xaxis.axis_label = "Ano"
-    p1.toolbar.autohide = True
-
-    if save_results:
-      if not os.path.exists(folder_path):
-        os.mkdir(folder_path)
-      file_path = folder_path + file_name
-      export_png(column(p,p1), filename=file_path)
-    if out_plot:
-      return column(p,p1)
+    # The bokeh plotting stack is loaded
+    # only when a summary is asked
+    from . import plots
+    return plots.result_summary(self, out_plot, plot_size, 
+      save_results, folder_path, file_name)
+
+
+def _fitWindow(objective, bounds, args, workers=-1):
+  """
+    The function that runs the differential evolution of an 
+    epidemy window of :code:`SIR.fit_multiple`. It is a module
+    level function, so the windows can be fitted on a process
+    pool.
+
+    :param specs.Objective objective: The objective of the model.
+    :param list bounds: The parameters boundaries.
+    :param tuple args: The cost function arguments of the window.
+    :param object workers: The number of processes of the search, or the map of a worker pool. Default is `-1`.
+
+    :return: The estimated parameters.
+    :rtype: array
+  """
+  return differential_evolution(
+      objective, 
+      bounds,
+      maxiter=60000,
+      popsize=35,
+      mutation=(1.5, 1.99),
+      strategy="best1exp",
+      workers=workers,
+      updating='deferred',
+      tol=0.00001,
+      args=args
+    ).x
+
+
+def warmPopulation(result, lower, upper, 
+    popsize=10, 
+    spread=0.01, 
+    seed=None):
+  """
+    The function responsible for building the initial population
+    of the differential evolution from a previous search result.
+    The candidates are sampled around the previous optimum, with 
+    the spread of the previous final population.
+
+    :param OptimizeResult result: The previous search result.
+    :param list lower: The lower bounds of the parameters.
+    :param list upper: The upper bounds of the parameters.
+    :param int popsize: The population size multiplier. Default is `10`.
+    :param float spread: The minimum spread, as a proportion of the bounds. Default is `0.01`.
+    :param int seed: The random generator seed. Default is `None`.
+
+    :return: The initial population with shape `(popsize * n_params, n_params)`.
+    :rtype: array
+  """
+  lower, upper = np.asarray(lower), np.asarray(upper)
+  center = np.clip(result.x, lower, upper)
+  # The spread of the previous population, 
+  # bounded below to keep exploring
+  scale = spread * (upper - lower)
+  population = getattr(result, "population", None)
+  if population is not None and np.shape(population)[-1] == len(center):
+    scale = np.maximum(np.std(population, axis=0), scale)
+  # Sample around the previous optimum 
+  # keeping the optimum itself
+  rng = np.random.default_rng(seed)
+  size = max(popsize * len(center), 5)
+  init = center + scale * rng.standard_normal((size, len(center)))
+  init[0] = center
+  return np.clip(init, lower, upper)
 
 
 def findEpidemyBreaks(cases, 
@@ -727,33 +979,8 @@ def findEpidemyBreaks(cases,
     :return: With the list of window's starting points and window's final points, respectively.
     :rtype: tuple
   """
-  # Filtering the data
-  filt_cases = pyasl.smooth(cases, 11, 'hamming')
-  # Compute the derivative and standard deviation
-  cases_variation = np.diff(filt_cases).tolist()
-  threshold = threshold_prop * np.std(cases_variation)
-  # Initializing the variables
-  start_points, end_points = [], []
-  in_epidemy = False
-  for k, value in enumerate(cases_variation):
-    if not in_epidemy:
-      # Check value
-      if value > threshold:
-        in_epidemy = True
-        # Find the start point
-        start_index = 0 if k-cases_before < 0 else k-cases_before
-        window = [abs(v) for v in cases_variation[start_index:k]]
-        ref_index = window.index(min(window))
-        start_index = k - (cases_before - ref_index)
-        if cases[start_index] == 0:
-          while cases[start_index] == 0:
-            start_index += 1
-        start_points.append(start_index)
-    else:
-      check_1 = (cases_variation[k-1] < 0)
-      check_2 = (value >= 0)
-      if check_1 and check_2:
-        in_epidemy = False
-        end_points.append(k)
-  return start_points, end_points
-
+  # The vectorized detector, see 
+  # windows.BreakDetector to stream
+  return wd.epidemy_breaks(cases,
+    threshold_prop=threshold_prop,
+    cases_before=cases_before)
@@ -0,0 +1,210 @@
+"""
+  The optimization trace of the cost functions. The costs of
+  the last evaluations, and the best cost up to each of them,
+  are kept in fixed size ring buffers, and the whole run may be
+  kept as a downsampled history, with the best cost of each
+  block of evaluations, the blocks merged two by two whenever
+  the history is full. Every search runs in constant memory,
+  however many evaluations it takes.
+
+  The search workers, as the differential evolution with
+  :code:`workers` other than :code:`1`, evaluate the costs on
+  copies of the objective, so only the evaluations of the main
+  process are traced. With the workers, the search callback
+  evaluates the best parameters of each generation again in
+  the main process, so the trace has one cost per generation.
+"""
+
+import numpy as np
+
+
+# The number of last evaluations kept
+TRACE_SIZE = 1024
+
+# The number of blocks of the downsampled history
+HISTORY_SIZE = 512
+
+
+class Trace:
+  """
+    The fixed size trace of the cost evaluations, with the
+    convergence monitoring of the search.
+  """
+
+  def __init__(self, size=TRACE_SIZE, history_size=HISTORY_SIZE, initial=None):
+    """
+      :param int size: The number of last evaluations kept. Default is :code:`TRACE_SIZE`.
+      :param int history_size: The even number of blocks of the history, or :code:`0` to not keep it. Default is :code:`HISTORY_SIZE`.
+      :param float initial: The cost returned as the last one before any evaluation. Default is :code:`None`.
+    """
+    if history_size % 2 != 0:
+      raise ValueError("The history size must be even!")
+    self.size = size
+    self.initial = initial
+    self.count = 0
+    self.best = np.inf
+    self._costs = np.full(size, np.nan)
+    self._bests = np.full(size, np.nan)
+    # The downsampled history, with the best cost
+    # of each block of stride evaluations
+    self.stride = 1
+    self._history = np.empty(history_size)
+    self._history_len = 0
+    self._block_best = np.inf
+    self._block_count = 0
+
+  def __len__(self):
+    return self.count
+
+  @property
+  def last(self):
+    """
+      The cost of the last evaluation, or the initial one.
+    """
+    if self.count == 0:
+      return self.initial
+    return self._costs[(self.count - 1) % self.size]
+
+  def append(self, cost):
+    """
+      The method that records the cost of an evaluation.
+
+      :param float cost: The evaluation cost.
+    """
+    self.extend([cost])
+
+  def extend(self, costs):
+    """
+      The method that records the costs of several evaluations,
+      as the costs of a whole population.
+
+      :param array costs: The evaluation costs, in order.
+    """
+    costs = np.asarray(costs, dtype=np.float64).ravel()
+    if len(costs) == 0:
+      return
+    bests = np.fmin.accumulate(np.concatenate(([self.best], costs)))[1:]
+    # Only the last ones fit the buffers
+    kept = min(len(costs), self.size)
+    positions = np.arange(self.count + len(costs) - kept, self.count + len(costs)) % self.size
+    self._costs[positions] = costs[-kept:]
+    self._bests[positions] = bests[-kept:]
+    self.count += len(costs)
+    self.best = bests[-1]
+    if len(self._history) > 0:
+      self._record_history(costs)
+
+  def _record_history(self, costs):
+    position = 0
+    while position < len(costs):
+      taken = min(self.stride - self._block_count, len(costs) - position)
+      self._block_best = np.fmin(self._block_best, np.min(costs[position:position + taken]))
+      self._block_count += taken
+      position += taken
+      if self._block_count == self.stride:
+        self._history[self._history_len] = self._block_best
+        self._history_len += 1
+        self._block_best, self._block_count = np.inf, 0
+        # Merge once full, so the next blocks
+        # already take the doubled stride
+        if self._history_len == len(self._history):
+          self._merge_history()
+
+  def _merge_history(self):
+    # Merge the blocks two by two, doubling the stride
+    half = self._history_len // 2
+    self._history[:half] = np.fmin(
+      self._history[0:self._history_len:2], self._history[1:self._history_len:2])
+    self._history_len = half
+    self.stride *= 2
+
+  def recent(self):
+    """
+      The method that returns the costs of the last evaluations.
+
+      :return: The costs kept, from the oldest to the newest.
+      :rtype: array
+    """
+    kept = min(self.count, self.size)
+    positions = np.arange(self.count - kept, self.count) % self.size
+    return self._costs[positions]
+
+  def history(self):
+    """
+      The method that returns the downsampled history of the
+      whole run, with the best cost of each complete block.
+
+      :return: The number of evaluations at the end of each block, and the best cost of the block.
+      :rtype: tuple
+    """
+    evaluations = (np.arange(self._history_len) + 1) * self.stride
+    return evaluations, self._history[:self._history_len].copy()
+
+  def improvement(self, window):
+    """
+      The method that computes the relative improvement of the
+      best cost along the last evaluations.
+
+      :param int window: The number of last evaluations, smaller than the trace size.
+
+      :return: The relative improvement, or :code:`inf` if there are not enough evaluations.
+      :rtype: float
+    """
+    if window >= self.size:
+      raise ValueError("The window must be smaller than the trace size!")
+    if window >= self.count:
+      return np.inf
+    before = self._bests[(self.count - 1 - window) % self.size]
+    if not np.isfinite(before):
+      return np.inf
+    return (before - self.best) / max(abs(before), np.finfo(np.float64).tiny)
+
+  def converged(self, tol=1e-6, window=None):
+    """
+      The method that checks if the best cost stopped improving.
+
+      :param float tol: The relative improvement tolerance. Default is :code:`1e-6`.
+      :param int window: The number of last evaluations checked. Default is the trace size minus one.
+
+      :return: If the relative improvement along the window is below the tolerance.
+      :rtype: bool
+    """
+    window = self.size - 1 if window is None else window
+    return self.improvement(window) <= tol
+
+  def callback(self, tol=1e-6, window=None, cost=None, args=()):
+    """
+      The method that builds the callback of the search
+      algorithms, as the :code:`differential_evolution` one,
+      that stops the search once the trace converged. With the
+      search workers, the :code:`cost` is evaluated on the best
+      parameters before the check, to record them in the trace.
+
+      :param float tol: The relative improvement tolerance. Default is :code:`1e-6`.
+      :param int window: The number of last evaluations checked. Default is the trace size minus one.
+      :param function cost: The objective of the search, evaluated in this process. Default is none.
+      :param tuple args: The objective parameters. Default is none.
+
+      :return: The callback function.
+      :rtype: function
+    """
+    def stop(xk, *_, **__):
+      if cost is not None:
+        cost(xk, *args)
+      return self.converged(tol, window)
+    return stop
+
+  def summary(self):
+    """
+      The method that summarizes the trace.
+
+      :return: The number of evaluations, the best and the last costs.
+      :rtype: dict
+    """
+    return dict(count=self.count, best=self.best, last=self.last)
+
+  def clear(self):
+    """
+      The method that removes every recorded evaluation.
+    """
+    self.__init__(self.size, len(self._history), self.initial)
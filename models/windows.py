@@ -0,0 +1,245 @@
+"""
+  The detection of the epidemy windows on the cases series.
+  The batch detector finds the window breaks of a whole series
+  with array operations, and the streaming detector consumes
+  the samples one at a time, emitting the window open and
+  close events as soon as they are known.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+# The smoothing window of the cases series
+WINDOW_LEN = 11
+WINDOW = "hamming"
+
+
+def _refine_start(nonzero, variation, k, cases_before):
+  """
+    The function that moves the start point of the window
+    opened at the :code:`k` variation to the smallest variation
+    of the previous samples, and then to the first sample with
+    cases, from the sorted indexes of the samples with cases.
+  """
+  start_index = max(k - cases_before, 0)
+  if k > start_index:
+    ref_index = int(np.argmin(np.abs(variation[start_index:k])))
+    start = max(k - (cases_before - ref_index), 0)
+  else:
+    start = 0
+  # Skip the samples without cases
+  position = np.searchsorted(nonzero, start)
+  return int(nonzero[position]) if position < len(nonzero) else start
+
+
+def epidemy_breaks(cases,
+    threshold_prop=1.0,
+    cases_before=10,
+    threshold=None):
+  """
+    The function that determines the initial and final points of
+    the epidemy windows. A window opens when the variation of
+    the smoothed cases exceeds the threshold, and closes when the
+    variation turns from negative to non negative.
+
+    :param array cases: The array with the cases values along time.
+    :param float threshold_prop: The standard deviation proportion used as threshold for windowing. Default is `1.0`.
+    :param int cases_before: The number of back samples to check for the initial window point. Default is `10`.
+    :param float threshold: The variation threshold, instead of the proportion of its standard deviation. Default is `None`.
+
+    :return: With the list of window's starting points and window's final points, respectively.
+    :rtype: tuple
+  """
+  # PyAstronomy is loaded only when the windows
+  # are searched, not on the package import
+  from PyAstronomy import pyasl
+  cases = np.asarray(cases)
+  # Compute the derivative and standard deviation
+  variation = np.diff(pyasl.smooth(cases, WINDOW_LEN, WINDOW))
+  if threshold is None:
+    threshold = threshold_prop * np.std(variation)
+  # The candidates of every open and close point
+  nonzero = np.flatnonzero(cases != 0)
+  opens = np.flatnonzero(variation > threshold)
+  closes = np.flatnonzero((variation[:-1] < 0) & (variation[1:] >= 0)) + 1
+  # Alternate between the candidates, each search
+  # jumping over a whole window at once
+  start_points, end_points = [], []
+  k = -1
+  while True:
+    position = np.searchsorted(opens, k + 1)
+    if position == len(opens):
+      break
+    k = int(opens[position])
+    start_points.append(_refine_start(nonzero, variation, k, cases_before))
+    position = np.searchsorted(closes, k + 1)
+    if position == len(closes):
+      break
+    k = int(closes[position])
+    end_points.append(k)
+  return start_points, end_points
+
+
+class BreakDetector:
+  """
+    The streaming detector of the epidemy windows. Each new
+    sample is smoothed as soon as the samples after it are
+    known, half the smoothing window later, and the events
+    are emitted as :code:`("open", start_point)` and
+    :code:`("close", end_point)` tuples, with the same points
+    of :code:`epidemy_breaks`. Only the last samples are kept,
+    so it runs on series of any length.
+
+    Without a fixed threshold, the threshold is the proportion
+    of the standard deviation of the variations seen so far,
+    instead of the whole series one.
+  """
+
+  def __init__(self,
+      threshold_prop=1.0,
+      cases_before=10,
+      threshold=None):
+    """
+      :param float threshold_prop: The standard deviation proportion used as threshold for windowing. Default is `1.0`.
+      :param int cases_before: The number of back samples to check for the initial window point. Default is `10`.
+      :param float threshold: The variation threshold, instead of the proportion of its standard deviation. Default is `None`.
+    """
+    self.threshold_prop = threshold_prop
+    self.cases_before = cases_before
+    self.threshold = threshold
+    self.in_epidemy = False
+    self._weights = getattr(np, WINDOW)(WINDOW_LEN)
+    self._weights = self._weights / self._weights.sum()
+    self._half = WINDOW_LEN // 2
+    # The first samples, mirrored at the series start,
+    # and the last ones, to smooth and refine the starts
+    self._head = []
+    self._cases = deque(maxlen=WINDOW_LEN + cases_before)
+    self._variation = deque(maxlen=cases_before + 1)
+    self._count = 0
+    self._smoothed = None
+    self._k = -1
+    # The running variation statistics (Welford)
+    self._mean, self._m2 = 0.0, 0.0
+
+  def _sample(self, i):
+    if i < 0:
+      return self._head[-i]
+    if i >= self._count:
+      # Mirrored at the series end
+      return self._cases[self._count - 1 - i]
+    return self._cases[i - self._count]
+
+  def _smooth(self, j):
+    return sum(
+      w * self._sample(j + i - self._half)
+      for i, w in enumerate(self._weights))
+
+  def _step(self, j):
+    """
+      The method that smooths the :code:`j` sample and runs
+      the detection over its variation.
+    """
+    smoothed = self._smooth(j)
+    previous, self._smoothed = self._smoothed, smoothed
+    if previous is None:
+      return []
+    value = smoothed - previous
+    self._k += 1
+    k = self._k
+    # Update the running standard deviation
+    delta = value - self._mean
+    self._mean += delta / (k + 1)
+    self._m2 += delta * (value - self._mean)
+    threshold = self.threshold
+    if threshold is None:
+      threshold = self.threshold_prop * np.sqrt(self._m2 / (k + 1))
+    events = []
+    if not self.in_epidemy:
+      if value > threshold:
+        self.in_epidemy = True
+        events.append(("open", self._start_point(k)))
+    elif self._variation[-1] < 0 and value >= 0:
+      self.in_epidemy = False
+      events.append(("close", k))
+    self._variation.append(value)
+    return events
+
+  def _start_point(self, k):
+    # The previous variations, by index
+    previous = list(self._variation)[-self.cases_before:] if self.cases_before > 0 else []
+    first = k - len(previous)
+    start_index = max(k - self.cases_before, 0)
+    if k > start_index:
+      window = [abs(v) for v in previous[start_index - first:]]
+      ref_index = int(np.argmin(window))
+      start = max(k - (self.cases_before - ref_index), 0)
+    else:
+      start = 0
+    # Skip the samples without cases, among the kept ones
+    known = self._count - len(self._cases)
+    start = max(start, known)
+    while start < self._count - 1 and self._cases[start - known] == 0:
+      start += 1
+    return start
+
+  def update(self, value):
+    """
+      The method that consumes a new sample of the cases.
+
+      :param float value: The new cases value.
+
+      :return: The window events known after the sample.
+      :rtype: list
+    """
+    if len(self._head) < WINDOW_LEN:
+      self._head.append(value)
+    self._cases.append(value)
+    self._count += 1
+    # The sample half a window back is
+    # now surrounded by known samples
+    j = self._count - 1 - self._half
+    if self._count <= WINDOW_LEN:
+      return self._catch_up(j)
+    return self._step(j)
+
+  def _catch_up(self, j):
+    # The first samples are smoothed together once
+    # the mirrored series start is known
+    if self._count == WINDOW_LEN:
+      events = []
+      for i in range(0, j + 1):
+        events += self._step(i)
+      return events
+    return []
+
+  def extend(self, values):
+    """
+      The method that consumes several new samples of the cases.
+
+      :param array values: The new cases values.
+
+      :return: The window events known after the samples.
+      :rtype: list
+    """
+    events = []
+    for value in values:
+      events += self.update(value)
+    return events
+
+  def close(self):
+    """
+      The method that ends the series, smoothing its last
+      samples with the series end mirrored, as the batch
+      smoothing does.
+
+      :return: The window events of the last samples.
+      :rtype: list
+    """
+    events = []
+    if self._count >= WINDOW_LEN:
+      for j in range(self._count - self._half, self._count):
+        events += self._step(j)
+    return events
@@ -0,0 +1,234 @@
+"""
+  The worker processes of the stochastic search. The training
+  arrays of a fit are placed once in shared memory, and the
+  workers receive only the small handle of the block, with a
+  lightweight copy of the objective, instead of the pickled
+  arrays on every task. Each worker attaches the block once,
+  and the pool is kept alive across the successive fits, so
+  the workers do not import the modules again. The pool is
+  created by the first search on the workers, as with the
+  default :code:`workers=-1` of the models, and lives until
+  :code:`shutdown`, or the end of a :code:`session`.
+"""
+
+import atexit
+import copy
+import contextlib
+import multiprocessing
+
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from . import trace as tr
+
+
+def _layout(value, arrays, offset):
+  """
+    The function that describes a nested value, as the cost
+    function parameters, moving its arrays into the list of
+    the shared ones, at their offsets of the block.
+  """
+  if isinstance(value, (list, tuple)):
+    items = []
+    for item in value:
+      layout, offset = _layout(item, arrays, offset)
+      items.append(layout)
+    return (type(value).__name__, items), offset
+  if np.ndim(value) == 0:
+    return ("scalar", value), offset
+  array = np.ascontiguousarray(value, dtype=np.float64)
+  arrays.append((offset, array))
+  return ("array", offset, array.shape), offset + array.nbytes
+
+
+def _rebuild(layout, buffer):
+  kind = layout[0]
+  if kind == "scalar":
+    return layout[1]
+  if kind == "array":
+    _, offset, shape = layout
+    array = np.ndarray(shape, dtype=np.float64, buffer=buffer, offset=offset)
+    array.flags.writeable = False
+    return array
+  items = [_rebuild(item, buffer) for item in layout[1]]
+  return tuple(items) if kind == "tuple" else items
+
+
+class SharedDataset:
+  """
+    The training arrays of a fit, placed in a shared memory
+    block. The handle is the block name and the layout of the
+    arrays, and the block is released on :code:`close`.
+  """
+
+  def __init__(self, data):
+    """
+      :param tuple data: The cost function parameters, as :code:`(dataset, initial, t, w)`.
+    """
+    arrays = []
+    layout, size = _layout(data, arrays, 0)
+    self._memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for offset, array in arrays:
+      self._memory.buf[offset:offset + array.nbytes] = array.view(np.uint8).ravel()
+    self.handle = (self._memory.name, layout)
+    self.data = data
+
+  def close(self):
+    """
+      The method that releases the shared memory block.
+    """
+    if self._memory is not None:
+      self._memory.close()
+      self._memory.unlink()
+      self._memory = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
+
+# The block attached by this process, kept until
+# the handle of another fit arrives
+_attached = dict(name=None, memory=None, data=None)
+
+
+def _open(name):
+  try:
+    return shared_memory.SharedMemory(name=name, track=False)
+  except TypeError:
+    # Before Python 3.13 attaching registers the block
+    # again, and the tracker of a worker would report it
+    # leaked and unlink it at the exit, or the unregister
+    # of a tracker shared with the main process would drop
+    # its own entry, so the worker skips the registration,
+    # as track=False does, and only the main process, that
+    # created the block, tracks it until the unlink
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+      return shared_memory.SharedMemory(name=name)
+    finally:
+      resource_tracker.register = register
+
+
+def attach(handle):
+  """
+    The function that returns the arrays of a shared dataset,
+    attaching its block only once in each process.
+
+    :param tuple handle: The shared dataset handle.
+
+    :return: The cost function parameters, with read only arrays.
+    :rtype: tuple
+  """
+  name, layout = handle
+  if _attached["name"] != name:
+    if _attached["memory"] is not None:
+      _attached["data"] = None
+      _attached["memory"].close()
+    memory = _open(name)
+    _attached.update(name=name, memory=memory, data=_rebuild(layout, memory.buf))
+  return _attached["data"]
+
+
+class SharedObjective:
+  """
+    The objective sent to the workers, with the handle of the
+    shared dataset instead of the arrays, and without the
+    optimization trace, that the workers would only copy. In
+    the main process, as on the polishing, it evaluates the
+    objective on the arrays of the dataset directly.
+  """
+
+  def __init__(self, objective, shared):
+    """
+      :param Objective objective: The objective of the search.
+      :param SharedDataset shared: The shared train data.
+    """
+    self.objective = objective
+    self.handle = shared.handle
+    self._data = shared.data
+
+  def __getstate__(self):
+    # The workers receive a copy without the trace
+    # and the memoized results, that stay in the main process
+    objective = copy.copy(self.objective)
+    objective._iter_error = tr.Trace(size=1, history_size=0, initial=self.objective._iter_error.last)
+    objective.memo = None
+    return dict(objective=objective, handle=self.handle, _data=None)
+
+  def __call__(self, pars):
+    data = attach(self.handle) if self._data is None else self._data
+    return self.objective(pars, *data)
+
+
+def record(cost, *args):
+  """
+    The function that builds the callback of the searches on the
+    workers, that evaluates the best parameters of each generation
+    again in the main process, so its optimization trace records
+    the progress of the search.
+
+    :param function cost: The objective of the search.
+    :param tuple args: The objective parameters, if any.
+
+    :return: The callback function.
+    :rtype: function
+  """
+  def callback(xk, *_, **__):
+    cost(xk, *args)
+  return callback
+
+
+# The pool kept across the fits
+_pool = dict(pool=None, processes=None)
+
+
+def pool(processes=None):
+  """
+    The function that returns the persistent pool of the search
+    workers, created on the first call, and created again only
+    if another number of processes is asked.
+
+    :param int processes: The number of worker processes. Default is the number of cores.
+
+    :return: The worker pool.
+    :rtype: Pool
+  """
+  if _pool["pool"] is None or (processes is not None and processes != _pool["processes"]):
+    shutdown()
+    _pool.update(pool=multiprocessing.Pool(processes), processes=processes)
+  return _pool["pool"]
+
+
+def shutdown():
+  """
+    The function that terminates the persistent pool, if any.
+  """
+  if _pool["pool"] is not None:
+    _pool["pool"].terminate()
+    _pool["pool"].join()
+    _pool.update(pool=None, processes=None)
+
+
+@contextlib.contextmanager
+def session(processes=None):
+  """
+    The context of the persistent pool, terminated on its exit,
+    as around the daily fits of a service request.
+
+    :param int processes: The number of worker processes. Default is the number of cores.
+
+    :return: The worker pool.
+    :rtype: Pool
+  """
+  try:
+    yield pool(processes)
+  finally:
+    shutdown()
+
+
+atexit.register(shutdown)
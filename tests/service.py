@@ -0,0 +1,28 @@
+"""
+  The modules of the models copy deployed with the update
+  service, loaded by their path, since the copy is also
+  imported as :code:`models`.
+"""
+
+import os
+import importlib.util
+
+# The models copy of the update service
+PACKAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+  "app", "services", "update-countries", "models")
+
+
+def load(name):
+  """
+    The function that loads a standalone module of the service copy.
+
+    :param string name: The module name, as :code:`"peaks"`.
+
+    :return: The loaded module.
+    :rtype: module
+  """
+  spec = importlib.util.spec_from_file_location(
+    "service_models_" + name, os.path.join(PACKAGE, name + ".py"))
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module
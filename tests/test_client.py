@@ -0,0 +1,97 @@
+import os
+import json
+
+import pytest
+
+from ingestion import client as ic
+from ingestion import fixture_server as fs
+
+
+COUNTRIES = ("BR", "IT", "DE")
+
+
+def _write(fixture_dir, country, cases):
+  with open(fixture_dir / (country + ".json"), "w") as f:
+    json.dump({"data": {"code": country, "timeline": [{"confirmed": cases}]}}, f)
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+  fixture_dir = tmp_path / "fixtures"
+  fixture_dir.mkdir()
+  for k, country in enumerate(COUNTRIES):
+    _write(fixture_dir, country, k)
+  return fixture_dir
+
+
+@pytest.fixture
+def server(fixtures):
+  server, url = fs.serve(str(fixtures))
+  yield server, url
+  server.shutdown()
+  server.server_close()
+
+
+def test_revalidates_with_etag(server, fixtures, tmp_path):
+  server, url = server
+  served = server.RequestHandlerClass.served
+  client = ic.Client(base_url=url, cache_dir=str(tmp_path / "cache"), same_day=False)
+  first = client.country("BR")
+  # The unchanged country answers 304, without a body
+  assert client.country("BR") == first
+  assert served == ["BR"]
+  # The changed one is downloaded again
+  _write(fixtures, "BR", 10)
+  assert client.country("BR")["data"]["timeline"][0]["confirmed"] == 10
+  assert served == ["BR", "BR"]
+
+
+def test_same_day_cache(server, tmp_path):
+  server, url = server
+  cache_dir = str(tmp_path / "cache")
+  ic.Client(base_url=url, cache_dir=cache_dir).country("IT")
+  # A new client reads the same day response from the disk cache
+  ic.Client(base_url=url, cache_dir=cache_dir).country("IT")
+  assert server.RequestHandlerClass.served == ["IT"]
+
+
+def test_countries_concurrently(server, tmp_path):
+  server, url = server
+  client = ic.Client(base_url=url, cache_dir=str(tmp_path / "cache"), max_workers=3)
+  data = client.countries(COUNTRIES)
+  assert list(data) == list(COUNTRIES)
+  assert [data[c]["data"]["code"] for c in COUNTRIES] == list(COUNTRIES)
+  assert sorted(server.RequestHandlerClass.served) == sorted(COUNTRIES)
+
+
+def test_countries_keep_the_others_on_a_failure(server, tmp_path, capsys):
+  server, url = server
+  client = ic.Client(base_url=url, cache_dir=str(tmp_path / "cache"), retries=0)
+  # The unknown country answers 404
+  data = client.countries(COUNTRIES + ("XX",))
+  assert list(data) == list(COUNTRIES)
+  assert "Country XX failed" in capsys.readouterr().out
+
+
+def test_retries_server_errors(fixtures, tmp_path):
+  server, url = fs.serve(str(fixtures), failures=2)
+  try:
+    client = ic.Client(base_url=url, cache_dir=None, retries=2)
+    assert client.country("DE")["data"]["code"] == "DE"
+    assert server.RequestHandlerClass.failed == ["DE", "DE"]
+  finally:
+    server.shutdown()
+    server.server_close()
+
+
+def test_service_copy_matches_the_package():
+  # The update service deploys its own copy, as it
+  # does with the models package, that must not drift
+  root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  package = os.path.join(root, "ingestion")
+  copy = os.path.join(root, "app", "services", "update-countries", "ingestion")
+  names = sorted(n for n in os.listdir(package) if n.endswith(".py"))
+  assert sorted(n for n in os.listdir(copy) if n.endswith(".py")) == names
+  for name in names:
+    with open(os.path.join(package, name)) as f, open(os.path.join(copy, name)) as g:
+      assert f.read() == g.read(), name
@@ -0,0 +1,15 @@
+import numpy as np
+
+from models import mm
+
+
+def test_cost_follows_data_changed_in_place():
+  memo = mm.Memo()
+  data = np.arange(5.0)
+  cost = lambda pars, data: float(np.sum(data) * pars[0])
+  assert memo.cost(cost, [2.0], (data,)) == 20.0
+  assert memo.cost(cost, [2.0], (data,)) == 20.0
+  assert memo.info().hits == 1
+  # The same array, changed in place, is a new key
+  data[:] = 1.0
+  assert memo.cost(cost, [2.0], (data,)) == 10.0
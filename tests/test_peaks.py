@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from models import pk
+from tests import service
+
+# The root module and the update service copy
+MODULES = [pk, service.load("peaks")]
+
+
+def _baseline(forecast):
+  # The peak of the update service before the vectorized
+  # analysis, as in the peak_est rows already uploaded
+  dI = np.gradient(forecast)
+  signal = np.array([di >= 0 for di in dI[::-1]])
+  return len(forecast) - np.argmax(signal)
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_peak_analysis(module):
+  forecasts = np.array([[1,2,3,2,1],[5,4,3,2,1],[1,2,3,4,5]], dtype=float)
+  peaks = module.peak_analysis(forecasts)
+  # The day after the last growing one, and the
+  # horizon for a forecast that never grows or
+  # one still growing at the end
+  assert list(peaks.day) == [3, 5, 5]
+  # The height at the last growing day
+  assert list(peaks.height) == [3, 5, 5]
+  assert list(peaks.height) == list(forecasts.max(axis=1))
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_peak_days_keep_the_uploaded_convention(module):
+  rng = np.random.default_rng(0)
+  forecasts = np.cumsum(rng.normal(size=(200, 60)), axis=1)
+  forecasts[:10] = -np.arange(60.0)
+  expected = [_baseline(forecast) for forecast in forecasts]
+  assert list(module.peak_days(forecasts)) == expected
+  assert list(module.peak_analysis(forecasts).day) == expected
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from models import ss, tr, wk
+from tests import service
+
+# The root module and the update service copy
+MODULES = [tr, service.load("trace")]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_trace_keeps_the_last_costs(module):
+  trace = module.Trace(size=4, history_size=4, initial=10.0)
+  assert trace.last == 10.0
+  trace.extend([5.0, 7.0, 3.0])
+  trace.append(4.0)
+  trace.extend([6.0, 2.0])
+  assert len(trace) == 6
+  assert list(trace.recent()) == [3.0, 4.0, 6.0, 2.0]
+  assert trace.last == 2.0 and trace.best == 2.0
+  # The history merges the blocks two by two
+  evaluations, bests = trace.history()
+  assert list(evaluations) == [2, 4, 6]
+  assert list(bests) == [5.0, 3.0, 2.0]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_trace_convergence(module):
+  trace = module.Trace(size=8, history_size=0)
+  assert not trace.converged(window=3)
+  trace.extend([8.0, 4.0, 2.0, 1.0])
+  assert not trace.converged(window=3)
+  trace.extend([1.0, 1.0, 1.0])
+  assert trace.converged(window=3)
+  with pytest.raises(ValueError):
+    trace.improvement(8)
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_callback_records_the_cost_of_the_best(module):
+  trace = module.Trace(size=8, history_size=0)
+  # The objective of a search on workers, that
+  # records its cost on the main process trace
+  cost = lambda pars, scale: trace.append(scale * float(np.sum(pars)))
+  stop = trace.callback(tol=1e-6, window=2, cost=cost, args=(2.0,))
+  assert not stop(np.array([1.0, 1.0]), convergence=0.1)
+  assert trace.last == 4.0
+  assert not stop(np.array([1.0, 1.0]))
+  assert stop(np.array([1.0, 1.0]))
+  assert len(trace) == 3
+
+
+def test_fit_on_workers_traces_each_generation():
+  N, t = 1e6, np.arange(60.0)
+  model = ss.SIR(pop=N, focus=["S", "I", "R"], verbose=False, workers=2)
+  S, I, R = [np.array(x) for x in model.simulate([0.999 * N, 0.001 * N, 0.0], t, [2.5, 10.0])]
+  try:
+    model.fit({"S": S, "I": I, "R": R}, t, search_pop=False, search_tol=1e-3)
+  finally:
+    wk.shutdown()
+  # The workers trace on their own copies, so the
+  # main process records the best of each generation
+  assert len(model._iter_error) >= model.result.nit
+  assert model._iter_error.best < 1e-6
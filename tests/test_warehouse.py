@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from ingestion import warehouse as wh
+
+
+LOG = "countries.model_log"
+DATA = "countries.data"
+PARAMETERS = "countries.parameters"
+
+
+class Recorder:
+  """
+    The backend wrapper that records the order of the writes.
+  """
+
+  def __init__(self, backend):
+    self.backend = backend
+    self.writes = []
+
+  def read(self, table):
+    return self.backend.read(table)
+
+  def write(self, table, df, if_exists="append"):
+    self.backend.write(table, df, if_exists)
+    self.writes.append((table, if_exists))
+
+
+@pytest.fixture
+def backend():
+  backend = wh.connect("sqlite://:memory:")
+  backend.write(LOG, pd.DataFrame(dict(country=["BR"], last_day=[10])))
+  backend.write(DATA, pd.DataFrame(dict(country=["BR"], day=[10])))
+  return Recorder(backend)
+
+
+def test_flush_appends_then_replaces_log(backend):
+  writer = wh.Writer(backend)
+  writer.replace(LOG, pd.DataFrame(dict(country=["BR"], last_day=[12])))
+  writer.append(DATA, pd.DataFrame(dict(country=["BR"], day=[11])))
+  writer.append(PARAMETERS, pd.DataFrame(dict(country=["BR"], Ro=[2.5])))
+  writer.append(DATA, pd.DataFrame(dict(country=["BR"], day=[12])))
+  writer.flush()
+  # One batch for each appended table, and the log last
+  assert backend.writes == [(DATA, "append"), (PARAMETERS, "append"), (LOG, "replace")]
+  assert list(backend.read(DATA)["day"]) == [10, 11, 12]
+  assert list(backend.read(LOG)["last_day"]) == [12]
+
+
+def test_failed_append_keeps_log(backend):
+  writer = wh.Writer(backend)
+  writer.append(PARAMETERS, pd.DataFrame(dict(country=["BR"], Ro=[2.5])))
+  # The data table has no such column, so its append fails
+  writer.append(DATA, pd.DataFrame(dict(country=["BR"], missing=[11])))
+  writer.replace(LOG, pd.DataFrame(dict(country=["BR"], last_day=[11])))
+  with pytest.raises(pd.errors.DatabaseError):
+    writer.flush()
+  # The log is not advanced, the written table left the
+  # buffers, and the failed one and the log are kept
+  assert list(backend.read(LOG)["last_day"]) == [10]
+  assert list(backend.read(DATA)["day"]) == [10]
+  assert list(backend.read(PARAMETERS)["Ro"]) == [2.5]
+  assert list(writer._appends) == [DATA]
+  assert list(writer._replaces) == [LOG]
+
+
+def test_parquet_backend(tmp_path):
+  pytest.importorskip("pyarrow")
+  writer = wh.Writer(wh.connect("parquet://" + str(tmp_path)))
+  writer.append(DATA, pd.DataFrame(dict(country=["BR"], day=[11])))
+  writer.replace(LOG, pd.DataFrame(dict(country=["BR"], last_day=[11])))
+  writer.flush()
+  writer.append(DATA, pd.DataFrame(dict(country=["BR"], day=[12])))
+  writer.replace(LOG, pd.DataFrame(dict(country=["BR"], last_day=[12])))
+  writer.flush()
+  assert list(writer.read(DATA)["day"]) == [11, 12]
+  assert list(writer.read(LOG)["last_day"]) == [12]
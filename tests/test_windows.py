@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from models import wd
+
+
+def _events(cases, **kwargs):
+  detector = wd.BreakDetector(**kwargs)
+  events = detector.extend(cases) + detector.close()
+  opens = [point for kind, point in events if kind == "open"]
+  closes = [point for kind, point in events if kind == "close"]
+  return opens, closes
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_streaming_detector_matches_the_batch_breaks(seed):
+  pytest.importorskip("PyAstronomy")
+  rng = np.random.default_rng(seed)
+  cases = np.abs(np.cumsum(rng.normal(size=200))) * 10
+  cases[:rng.integers(0, 20)] = 0
+  start, end = wd.epidemy_breaks(cases, threshold=2.0)
+  assert _events(cases, threshold=2.0) == (list(start), list(end))
@@ -0,0 +1,28 @@
+import os
+import sys
+import subprocess
+
+# The script that attaches a shared dataset on the
+# workers of a new pool, before the tracker started
+SCRIPT = """
+import numpy as np
+from models import wk
+def total(handle):
+  return float(np.sum(wk.attach(handle)[0]))
+if __name__ == "__main__":
+  pool = wk.pool(2)
+  with wk.SharedDataset((np.arange(4.0), 1.0)) as shared:
+    print(pool.map(total, [shared.handle] * 4))
+  wk.shutdown()
+"""
+
+
+def test_attached_blocks_are_not_reported_leaked(tmp_path):
+  root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  script = tmp_path / "attach.py"
+  script.write_text(SCRIPT)
+  run = subprocess.run([sys.executable, str(script)], cwd=root, capture_output=True, text=True,
+    env=dict(os.environ, PYTHONPATH=root))
+  assert run.returncode == 0, run.stderr
+  assert run.stdout.strip() == "[6.0, 6.0, 6.0, 6.0]"
+  assert "resource_tracker" not in run.stderr